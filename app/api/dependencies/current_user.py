@@ -1,31 +1,102 @@
 from fastapi import Header, HTTPException, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from uuid import UUID
 import logging
 
 from app.core.db.database import get_db
+from app.core.rbac.permission_index import decode_mask, encode_mask, get_permission_index
 from app.models.users import User
+from app.models.roles import Role
+from app.models.user_roles import UserRole
 from app.core.logging.route_logger import get_route_logger
-from app.core.redis.redis_config import get_redis, AsyncRedisClient
+from app.core.logging.context import user_id_ctx, user_role_ctx
+from app.core.redis.redis_config import get_redis, AsyncRedisClient, RedisBatch
 from app.models.user_session import UserSession
 
 
 # ✅ Logging
 logger = get_route_logger("auth.dependencies")
 
+# ✅ Principal cache (compact auth record per user)
+PRINCIPAL_TTL = 300
+
+
+def principal_cache_key(user_id: str | UUID) -> str:
+    return f"principal:{user_id}"
+
+
+def principal_namespace(user_id: str | UUID) -> str:
+    # Generation bumped by every invalidation (see set_json_if_generation)
+    return f"principal:{user_id}"
+
+
+async def load_principal(db: AsyncSession, user_id: str | UUID) -> dict | None:
+    """
+    Build the principal record from PostgreSQL (single query).
+    Permissions are derived from roles via the RBAC index.
+    """
+    result = await db.execute(
+        select(User.id, User.is_active, Role.name)
+        .outerjoin(UserRole, UserRole.user_id == User.id)
+        .outerjoin(Role, Role.id == UserRole.role_id)
+        .where(User.id == user_id)
+    )
+    rows = result.all()
+
+    if not rows:
+        return None
+
+    uid, is_active, _ = rows[0]
+
+    return {
+        "user_id": str(uid),
+        "is_active": bool(is_active),
+        "roles": sorted(row[2] for row in rows if row[2] is not None),
+    }
+
+
+def queue_principal_invalidation(batch: RedisBatch, user_id: str | UUID) -> RedisBatch:
+    """
+    Drop the cached principal and bump its generation, so a request that
+    read the DB before this change cannot cache its stale copy afterwards.
+    """
+    batch.delete(principal_cache_key(user_id))
+    batch.bump_generation(principal_namespace(user_id))
+    return batch
+
+
+async def invalidate_principal(redis: AsyncRedisClient, user_id: str | UUID) -> None:
+    """
+    Call after any change to a user's activation state, profile or roles.
+    """
+    async with redis.pipeline() as batch:
+        queue_principal_invalidation(batch, user_id)
+
 # ✅ User Session's-Auth dependency 
 async def get_current_user(
     session_key: str | None = Header(default=None),
     db: AsyncSession = Depends(get_db),
     redis: AsyncRedisClient = Depends(get_redis),
 ):
+    return await resolve_principal(session_key, db, redis)
+
+
+async def resolve_principal(
+    session_key: str | None,
+    db: AsyncSession,
+    redis: AsyncRedisClient,
+) -> dict:
     """
     Resolve authenticated user from session_key.
+    Shared by HTTP routes (get_current_user) and WebSockets.
 
     Flow:
     1️⃣ Redis Session validation
     2️⃣ PostgreSQL fallback
-    3️⃣ Load User
+    3️⃣ Load principal (Redis first, PostgreSQL on miss)
+
+    A warm request (session + principal cached) never touches PostgreSQL.
     """
 
     if not session_key:
@@ -65,26 +136,52 @@ async def get_current_user(
             ex=86400,
         )
 
-    # Loading User
-    user_result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
+    # Loading principal (cache-first)
+    principal = await redis.get_json(principal_cache_key(user_id))
+
+    if principal is None:
+        # Generation read BEFORE the DB: an invalidation after this point
+        # makes the write-back below a no-op
+        generation = await redis.get_generation(principal_namespace(user_id))
+        principal = await load_principal(db, user_id)
+
+        if not principal:
+            raise HTTPException(401, "User no longer exists")
+
+        principal["generation"] = generation
+
+    # ✅ Effective permission mask, recomputed only when RBAC changes
+    index = await get_permission_index(redis, db)
+
+    if principal.get("rbac_version") != index.version:
+        principal = {
+            **principal,
+            "perm_mask": encode_mask(index.mask_for_roles(principal["roles"])),
+            "rbac_version": index.version,
+        }
+        await redis.set_json_if_generation(
+            principal_cache_key(user_id),
+            principal,
+            namespace=principal_namespace(user_id),
+            generation=principal.get("generation", 0),
+            ex=PRINCIPAL_TTL,
+        )
 
-    user = user_result.scalar_one_or_none()
+    # Cached as 32-bit words (JSON-safe); routes get the int bitset
+    principal = {**principal, "perm_mask": decode_mask(principal["perm_mask"])}
 
-    if not user:
-        raise HTTPException(401, "User no longer exists")
-    
     # ✅ Blocking Inactive Users
-    if not user.is_active:
+    if not principal["is_active"]:
         raise HTTPException(403, "Account deactivated")
 
+    # ✅ Enrich request logs (read by RequestLoggingMiddleware)
+    user_id_ctx.set(principal["user_id"])
+    user_role_ctx.set(",".join(principal["roles"]) or None)
+
     logger.debug(
-        "Authenticated user=%s admin=%s",
-        user.id,
+        "Authenticated user=%s roles=%s",
+        principal["user_id"],
+        principal["roles"],
     )
 
-    return {
-        "user_id": str(user.id),
-        "is_active": user.is_active,
-    }
+    return principal
@@ -1,39 +1,27 @@
 from fastapi import Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from sqlalchemy import select
 
 from app.core.db.database import get_db
+from app.core.redis.redis_config import AsyncRedisClient, get_redis
+from app.core.rbac.permission_index import get_permission_index
 from app.api.dependencies.current_user import get_current_user
-from app.models.users import User
-from app.models.roles import Role
 
 
 def require_permission(permission_name: str):
     async def checker(
         current_user: dict = Depends(get_current_user),
         db: AsyncSession = Depends(get_db),
+        redis: AsyncRedisClient = Depends(get_redis),
     ):
-        user_id = current_user["user_id"]
+        # Compiled RBAC index: usually an in-process (L1) hit, no DB access
+        index = await get_permission_index(redis, db)
 
-        # Eager loading roles and nested permissions to avoid lazy-loading(MissingGreenLet)
-        result = await db.execute(
-            select(User)
-            .options(
-                selectinload(User.roles).selectinload(Role.permissions)
-            )
-            .where(User.id == user_id)
-        )
-        user = result.scalar_one()
-
-        # Now Safe: roles + permissions are already loaded
-        permissions = {
-            perm.name
-            for role in user.roles
-            for perm in role.permissions
-        }
+        mask = current_user["perm_mask"]
+        if current_user["rbac_version"] != index.version:
+            # Index changed since the principal was resolved
+            mask = index.mask_for_roles(current_user["roles"])
 
-        if permission_name not in permissions:
+        if not mask & index.bit(permission_name):
             raise HTTPException(
                 status_code=403,
                 detail="Insufficient permissions",
@@ -1,21 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from typing import Literal
 from uuid import UUID
 
 from app.core.db.database import get_db
 from app.core.redis.redis_config import AsyncRedisClient, get_redis
 from app.core.logging.route_logger import get_route_logger
-from app.api.dependencies.current_user import get_current_user
+from app.api.dependencies.current_user import get_current_user, queue_principal_invalidation
 from app.api.dependencies.require_admin import require_admin
 from app.api.dependencies.require_permissions import require_permission
 
 from app.models.users import User
-from app.schemas.user import UserResponse, UserRead
+from app.schemas.user import UserResponse, UserRead, UserBulkAction
 from app.services.helpers.crud_helper import CRUDHelper
-from app.services.helpers.redis_helpers import fetch_from_cache_or_db
-from app.services.helpers.pagination import paginate_query
-from app.services.helpers.sorting import apply_sorting
+from app.services.helpers.redis_helpers import fetch_from_cache_or_db, versioned_key
+from app.services.helpers.pagination import paginate_keyset
 
 # ✅ Route Logger (standardized)
 logger = get_route_logger("admin.routes")
@@ -29,6 +29,7 @@ router = APIRouter(
 
 # ✅ Set cache expiry periods
 ADMIN_USERS_LIST_TTL = 120
+ADMIN_USERS_LIST_STALE_TTL = 300  # served stale while refreshing in background
 USER_CACHE_TTL = 300
 
 
@@ -43,6 +44,8 @@ async def list_users_admin(
     limit: int = Query(20, le=100),
     sort_by: str = Query("created_at"),
     order: str = Query("desc"),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool | None = Query(None, description="Count all rows (defaults to true without a cursor)"),
     db: AsyncSession = Depends(get_db),
     redis: AsyncRedisClient = Depends(get_redis),
     current_user: dict = Depends(get_current_user),
@@ -69,19 +72,28 @@ async def list_users_admin(
     )
 
     # ✅ Secure cache key scoped by admin identity
-    cache_key = f"admin:{admin_id}:users:list:{page}:{limit}:{sort_by}:{order}"
+    cache_key = await versioned_key(
+        redis,
+        "users:list",
+        f"admin:{admin_id}:{page}:{limit}:{sort_by}:{order}:{cursor}:{include_total}",
+    )
 
-    async def fetch():
+    async def fetch(db: AsyncSession = db):
         # 1) Build query
         query = select(User)
-        query = apply_sorting(query, User, sort_by, order)
 
         # 2) Paginate from DB
-        users, total = await paginate_query(
+        users, total, next_cursor = await paginate_keyset(
             session=db,
             query=query,
+            model=User,
+            sort_by=sort_by,
+            order=order,
+            default_sort="created_at",
             page=page,
             limit=limit,
+            cursor=cursor,
+            with_total=include_total,
         )
 
         # 3) Return JSON-serializable structure for Redis
@@ -93,6 +105,7 @@ async def list_users_admin(
             "total": total,
             "page": page,
             "limit": limit,
+            "next_cursor": next_cursor,
         }
 
     # ✅ Cache-first fetch
@@ -101,6 +114,7 @@ async def list_users_admin(
         redis_key=cache_key,
         db_fetch_callable=fetch,
         ttl=ADMIN_USERS_LIST_TTL,
+        stale_ttl=ADMIN_USERS_LIST_STALE_TTL,
     )
 
     logger.debug(
@@ -148,26 +162,61 @@ async def activate_user(
     # ✅ DB update (source of truth)
     user = await CRUDHelper.update(db, user, {"is_active": True})
 
-    # ✅ Write-through cache: single-user view
+    # ✅ Write-through cache (one round-trip):
+    # single-user view, admin-scoped view, drop the auth principal (carries is_active),
+    # and retire cached list pages (rows carry is_active / updated_at)
     user_payload = UserRead.model_validate(user).model_dump(mode="json")
 
-    await redis.set_json(
-        f"user:{user_id}",
-        user_payload,
-        ex=USER_CACHE_TTL,
-    )
-
-    # ✅ Optional: admin-scoped single-user cache (useful if admin routes read users)
-    await redis.set_json(
-        f"admin:user:{user_id}",
-        user_payload,
-        ex=USER_CACHE_TTL,
-    )
+    async with redis.pipeline() as batch:
+        batch.set_json(f"user:{user_id}", user_payload, ex=USER_CACHE_TTL)
+        batch.set_json(f"admin:user:{user_id}", user_payload, ex=USER_CACHE_TTL)
+        queue_principal_invalidation(batch, user_id)
+        batch.bump_generation("users:list")
 
     logger.info("User activated successfully | user=%s updated_by=%s", user_id, actor_id)
 
     return {"message": "User activated"}
 
+# ✅ BULK ACTIVATE / DEACTIVATE USERS (one UPDATE ... WHERE id = ANY(:ids))
+@router.post(
+    "/users/bulk/{action}",
+    dependencies=[Depends(require_permission("users.activate"))],
+)
+async def bulk_set_user_active(
+    action: Literal["activate", "deactivate"],
+    payload: UserBulkAction,
+    db: AsyncSession = Depends(get_db),
+    redis: AsyncRedisClient = Depends(get_redis),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Activate or deactivate many users at once.
+
+    - `action`: "activate" | "deactivate" (anything else -> 422)
+    - One UPDATE for all ids, one commit
+    - Cached user views and auth principals dropped in one pipeline
+    """
+    actor_id = current_user["user_id"]
+    is_active = action == "activate"
+    user_ids = list(dict.fromkeys(payload.user_ids))
+
+    logger.warning(
+        "Admin %s bulk %s | users=%s", actor_id, action, len(user_ids)
+    )
+
+    updated = await CRUDHelper.update_many(db, User, user_ids, {"is_active": is_active})
+
+    async with redis.pipeline() as batch:
+        for user_id in user_ids:
+            batch.delete(f"user:{user_id}", f"admin:user:{user_id}")
+            queue_principal_invalidation(batch, user_id)
+        batch.bump_generation("users:list")
+
+    logger.info("Bulk %s done | updated=%s by=%s", action, updated, actor_id)
+
+    return {"message": f"Users {action}d", "updated": updated}
+
+
 # ✅ PROMOTE USER TO ADMIN (Write-through cache)
 @router.patch(
     "/users/{user_id}/promote",
@@ -210,27 +259,17 @@ async def promote_user(
     # 🔁 Refresh user (optional but good if schema includes roles/flags)
     user = await CRUDHelper.get_by_id(db, User, user_id)
 
-    # ✅ Write-through cache: single-user view
+    # ✅ Write-through cache (one round-trip); principal carries roles -> drop it,
+    # list pages carry updated_at -> bump their generation
     user_payload = UserRead.model_validate(user).model_dump(mode="json")
 
-    await redis.set_json(
-        f"user:{user_id}",
-        user_payload,
-        ex=USER_CACHE_TTL,
-    )
-
-    await redis.set_json(
-        f"admin:user:{user_id}",
-        user_payload,
-        ex=USER_CACHE_TTL,
-    )
-
-    await redis.set_json(
-        f"user:{user_id}:roles",
-        {"roles": ["admin"]},  # minimal write-through; can be expanded to actual DB fetch
-        ex=USER_CACHE_TTL,
-    )
-
+    async with redis.pipeline() as batch:
+        batch.set_json(f"user:{user_id}", user_payload, ex=USER_CACHE_TTL)
+        batch.set_json(f"admin:user:{user_id}", user_payload, ex=USER_CACHE_TTL)
+        # minimal write-through; can be expanded to actual DB fetch
+        batch.set_json(f"user:{user_id}:roles", {"roles": ["admin"]}, ex=USER_CACHE_TTL)
+        queue_principal_invalidation(batch, user_id)
+        batch.bump_generation("users:list")
 
     logger.info("User promoted to admin | user=%s updated_by=%s", user_id, actor_id)
 
@@ -0,0 +1,108 @@
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
+from uuid import UUID
+import asyncio
+
+from app.api.dependencies.current_user import resolve_principal
+from app.core.db.database import AsyncSessionLocal
+from app.core.redis.redis_config import redis_client
+from app.core.redis.pubsub_hub import pubsub_hub, session_channel
+from app.core.logging.route_logger import get_route_logger
+from app.models.session import ConversationSession as SessionModel
+from app.services.helpers.crud_helper import CRUDHelper
+
+# ✅ Logger
+logger = get_route_logger("chat.websocket")
+
+# ✅ Router
+router = APIRouter(
+    prefix="/api/v1/ws",
+    tags=["Chat WebSocket"]
+)
+
+# Application close codes (4000-4999 range)
+WS_CLOSE_UNAUTHORIZED = 4401
+WS_CLOSE_FORBIDDEN = 4403
+
+
+async def _authorize(websocket: WebSocket, session_id: UUID) -> dict | None:
+    """
+    Same session_key auth as get_current_user, plus session ownership.
+
+    Uses a short-lived DB session so no connection is held for the
+    lifetime of the socket. Returns the principal, or None after closing.
+
+    The handshake is accepted first: a close before accept() is sent as
+    an HTTP 403 and the client never sees the 4401/4403 close code.
+    """
+    await websocket.accept()
+
+    # Browsers cannot set headers on WebSocket handshakes -> query fallback
+    session_key = (
+        websocket.headers.get("session_key")
+        or websocket.query_params.get("session_key")
+    )
+
+    async with AsyncSessionLocal() as db:
+        try:
+            principal = await resolve_principal(session_key, db, redis_client)
+        except HTTPException as exc:
+            await websocket.close(code=WS_CLOSE_UNAUTHORIZED, reason=exc.detail)
+            return None
+
+        session = await CRUDHelper.get_by_id(db, SessionModel, session_id)
+
+    if not session or str(session.user_id) != principal["user_id"]:
+        await websocket.close(code=WS_CLOSE_FORBIDDEN, reason="Invalid session")
+        return None
+
+    return principal
+
+
+# ✅ Live session events (replaces polling GET /message/session/{id})
+@router.websocket("/session/{session_id}")
+async def session_events(websocket: WebSocket, session_id: UUID):
+    """
+    Push message events for a session as JSON frames:
+
+        {"type": "message.created", "message": {...}}
+        {"type": "message.updated", "message": {...}}
+        {"type": "message.deleted", "message_id": "..."}
+
+    Events are published through Redis, so writes on any worker reach
+    sockets on every worker. Client frames: "ping" -> "pong".
+    """
+    principal = await _authorize(websocket, session_id)
+    if principal is None:
+        return
+
+    logger.info("WebSocket connected | user=%s session=%s", principal["user_id"], session_id)
+
+    async with pubsub_hub.listen(session_channel(session_id)) as queue:
+
+        async def push_events():
+            while True:
+                event = await queue.get()
+                await websocket.send_json(event)
+
+        async def read_client():
+            while True:
+                text = await websocket.receive_text()
+                if text == "ping":
+                    await websocket.send_text("pong")
+
+        tasks = [
+            asyncio.create_task(push_events()),
+            asyncio.create_task(read_client()),
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                exc = task.exception()
+                if exc and not isinstance(exc, WebSocketDisconnect):
+                    logger.warning("WebSocket closed with error | session=%s error=%s", session_id, exc)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    logger.info("WebSocket disconnected | user=%s session=%s", principal["user_id"], session_id)
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
+from sqlalchemy.orm import defer, with_expression
 from uuid import UUID
+from datetime import datetime, timedelta, timezone
+import base64
+import binascii
 import json
 import logging
 
 from app.api.dependencies.current_user import get_current_user
-from app.core.db.database import get_db
+from app.core.config import get_settings
+from app.core.db.database import get_db, AsyncSessionLocal
 from app.core.redis.redis_config import AsyncRedisClient, get_redis
 from app.models.message import ChatMessage
 from app.models.session import ConversationSession as SessionModel
@@ -14,12 +20,24 @@ from app.schemas.message import (
     ChatMessageCreate, 
     ChatMessageResponse, 
     ChatMessageRead,
+    ChatMessagePreview,
+    ChatMessageBulkCreate,
+    ChatMessageBulkResponse,
+    ChatReplyRequest,
 )
 from app.core.logging.route_logger import get_route_logger
 from app.services.helpers.crud_helper import CRUDHelper
-from app.services.helpers.redis_helpers import fetch_from_cache_or_db
-from app.services.helpers.pagination import paginate_query
-from app.services.helpers.sorting import apply_sorting
+from app.services.helpers.redis_helpers import fetch_from_cache_or_db, versioned_key
+from app.services.helpers.pagination import paginate_keyset, resolve_sort_column
+from app.services.helpers.projection import parse_fields, load_only_columns
+from app.services.helpers.message_events import queue_messages_created, MESSAGE_CACHE_TTL
+from app.core.redis.pubsub_hub import session_channel
+from app.core.storage.blob_store import BlobStore, BlobTooLargeError, get_blob_store
+from app.services.llm.providers import LLMProvider, get_llm_provider
+from app.services.llm.pipeline import build_prompt, stream_reply, sse_event
+from app.services.llm.context_cache import queue_context_invalidate
+
+settings = get_settings()
 
 # ✅ Logger
 logger = get_route_logger("messages.routes")
@@ -31,8 +49,16 @@ router = APIRouter(
 )
 
 # Redis Cache Configuration
-MESSAGE_CACHE_TTL = 60 * 5 
 SESSION_MESSAGES_TTL = 60 * 2  
+SESSION_MESSAGES_STALE_TTL = 60 * 5  # served stale while refreshing in background
+DEFAULT_AUDIO_CONTENT_TYPE = "application/octet-stream"
+
+# Streaming export: rows fetched per server-side cursor round-trip
+EXPORT_BATCH_SIZE = 500
+
+# Projection (`fields=`) for message lists
+MESSAGE_PREVIEW_CHARS = 120
+MESSAGE_LIST_FIELDS = set(ChatMessagePreview.model_fields)
 
 
 # ✅ Create Message Route
@@ -41,6 +67,7 @@ async def create_message(
     message_data: ChatMessageCreate,
     db: AsyncSession = Depends(get_db),
     redis: AsyncRedisClient = Depends(get_redis),
+    blobs: BlobStore = Depends(get_blob_store),
     current_user: dict = Depends(get_current_user),
 ):
     # Validate User
@@ -62,32 +89,44 @@ async def create_message(
 
     # ✅ Force correct user_id
     message_payload = {
-        **message_data.model_dump(),
+        **message_data.model_dump(exclude={"audio_data"}),
         "user_id": user_id,
     }
 
+    # ✅ Offload inline audio to the blob store; the row keeps only a reference
+    if message_data.audio_data:
+        try:
+            audio_bytes = base64.b64decode(message_data.audio_data, validate=True)
+        except (binascii.Error, ValueError):
+            raise HTTPException(422, "audio_data is not valid base64")
+
+        if len(audio_bytes) > settings.BLOB_MAX_BYTES:
+            raise HTTPException(413, "Audio too large")
+
+        digest, size = await blobs.put_bytes(audio_bytes)
+        message_payload.update(
+            audio_blob_hash=digest,
+            audio_size=size,
+            audio_content_type=message_data.audio_content_type or DEFAULT_AUDIO_CONTENT_TYPE,
+        )
+
     message = await CRUDHelper.create(
         db,
         ChatMessage,
         message_payload,
     )
 
-    # Cache single message
-    await redis.set_json(
-        f"message:{message.id}",
-        ChatMessageResponse.model_validate(message).model_dump(mode="json"),
-        ex=MESSAGE_CACHE_TTL,
-    )
-
-    # Write-Through Cache
-    await redis.set_json(
-        f"message:{user_id}:{message.id}",
-        ChatMessageResponse.model_validate(message).model_dump(mode="json"),
-        ex=MESSAGE_CACHE_TTL,
-    )
+    message_json = ChatMessageResponse.model_validate(message).model_dump(mode="json")
 
-    # ✅ Invalidate paginated session caches (pattern-safe)
-    await redis.delete_pattern(f"session:{message.session_id}:messages*")
+    # Cache single message + Write-Through + list invalidation
+    # + WebSocket fan-out (one round-trip)
+    async with redis.pipeline() as batch:
+        queue_messages_created(
+            batch,
+            user_id=user_id,
+            session_id=message.session_id,
+            items=[message_json],
+        )
 
     logger.info("Message created | id=%s", message.id)
 
@@ -97,6 +136,71 @@ async def create_message(
     )
     
 
+# ✅ Bulk Create Messages (history import / turn pairs)
+@router.post("/bulk", response_model=ChatMessageBulkResponse, status_code=status.HTTP_201_CREATED)
+async def create_messages_bulk(
+    payload: ChatMessageBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    redis: AsyncRedisClient = Depends(get_redis),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Insert N messages into one session.
+
+    - Ownership checked once
+    - One multi-row INSERT ... RETURNING, one commit
+    - All cache writes in one pipeline
+    - Order preserved: rows get strictly increasing created_at
+    """
+    user_id = current_user["user_id"]
+
+    logger.info(
+        "Bulk creating messages | user=%s session=%s count=%s",
+        user_id,
+        payload.session_id,
+        len(payload.messages),
+    )
+
+    # ✅ Validate session ownership (once)
+    session = await CRUDHelper.get_by_id(db, SessionModel, payload.session_id)
+
+    if not session or str(session.user_id) != user_id:
+        raise HTTPException(403, "Invalid session")
+
+    # One transaction shares one now(); spread by 1µs so (created_at, id)
+    # ordering matches the request
+    base_time = datetime.now(timezone.utc)
+    rows = [
+        {
+            **item.model_dump(),
+            "user_id": user_id,
+            "session_id": payload.session_id,
+            "created_at": base_time + timedelta(microseconds=i),
+        }
+        for i, item in enumerate(payload.messages)
+    ]
+
+    messages = await CRUDHelper.bulk_create(db, ChatMessage, rows)
+
+    items = [
+        ChatMessageResponse.model_validate(m).model_dump(mode="json")
+        for m in messages
+    ]
+
+    # Write-through + list invalidation + fan-out (one round-trip)
+    async with redis.pipeline() as batch:
+        queue_messages_created(
+            batch,
+            user_id=user_id,
+            session_id=payload.session_id,
+            items=items,
+        )
+
+    logger.info("Bulk messages created | session=%s count=%s", payload.session_id, len(items))
+
+    return {"items": items, "count": len(items)}
+
+
 # ✅ FETCHING MESSAGE BY ID
 @router.get("/{message_id}", response_model=ChatMessageResponse, status_code=status.HTTP_200_OK)
 async def get_message(
@@ -107,7 +211,12 @@ async def get_message(
 ):
     user_id = current_user["user_id"]
     async def fetch():
-        msg = await CRUDHelper.get_by_id(db, ChatMessage, message_id)
+        # Legacy inline audio is not part of the response; never load it
+        msg = await db.scalar(
+            select(ChatMessage)
+            .where(ChatMessage.id == message_id)
+            .options(defer(ChatMessage.audio_data))
+        )
         if not msg:
             return None
         return ChatMessageResponse.model_validate(msg).model_dump(mode="json")
@@ -136,6 +245,9 @@ async def list_session_messages(
     limit: int = Query(20, ge=1, le=100),
     sort_by: str = Query("created_at"),
     order: str = Query("asc"),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool | None = Query(None, description="Count all rows (defaults to true without a cursor)"),
+    fields: str | None = Query(None, description="Comma-separated fields to return, e.g. 'id,role,created_at,content_preview'"),
     db: AsyncSession = Depends(get_db),
     redis: AsyncRedisClient = Depends(get_redis),
     current_user: dict = Depends(get_current_user),
@@ -143,12 +255,21 @@ async def list_session_messages(
     """
     Paginated + sorted messages.
 
+    Pagination:
+    - `page` for offset paging (counts total by default)
+    - `cursor` (from `next_cursor`) for keyset paging: constant cost per page
+
+    Projection:
+    - `fields` loads only the listed columns (items always include `id`)
+    - `content_preview` is `content` truncated in SQL
+
     Response:
     {
         items: [...],
-        total: int,
+        total: int | None,
         page: int,
-        limit: int
+        limit: int,
+        next_cursor: str | None
     }
     """
     user_id = current_user["user_id"]
@@ -159,31 +280,70 @@ async def list_session_messages(
     if not session or str(session.user_id) != user_id:
         raise HTTPException(403, "Invalid session")
 
-    cache_key = f"session:{user_id}:{session_id}:messages:{page}:{limit}:{sort_by}:{order}"
+    selected = parse_fields(fields, MESSAGE_LIST_FIELDS)
 
-    async def fetch():
+    cache_key = await versioned_key(
+        redis,
+        f"session:{session_id}:messages",
+        f"{user_id}:{page}:{limit}:{sort_by}:{order}:{cursor}:{include_total}"
+        f":{','.join(selected) if selected else '*'}",
+    )
+
+    async def fetch(db: AsyncSession = db):
         query = select(ChatMessage).where(
             ChatMessage.session_id == session_id
         )
 
-        # Apply safe sorting
-        query = apply_sorting(query, ChatMessage, sort_by, order)
-
-        messages, total = await paginate_query(
+        if selected:
+            # The sort column is needed to build next_cursor
+            sort_key, _ = resolve_sort_column(ChatMessage, sort_by, "created_at")
+            query = query.options(
+                load_only_columns(ChatMessage, [*selected, sort_key])
+            )
+            if "content_preview" in selected:
+                query = query.options(
+                    with_expression(
+                        ChatMessage.content_preview,
+                        func.substr(ChatMessage.content, 1, MESSAGE_PREVIEW_CHARS),
+                    )
+                )
+        else:
+            # Legacy inline audio is never part of the list payload
+            query = query.options(defer(ChatMessage.audio_data))
+
+        messages, total, next_cursor = await paginate_keyset(
             session=db,
             query=query,
+            model=ChatMessage,
+            sort_by=sort_by,
+            order=order,
+            default_sort="created_at",
             page=page,
             limit=limit,
+            cursor=cursor,
+            with_total=include_total,
         )
 
-        return {
-            "items": [
+        if selected:
+            items = [
+                ChatMessagePreview(
+                    id=m.id,
+                    **{name: getattr(m, name) for name in selected if name != "id"},
+                ).model_dump(mode="json", exclude_unset=True)
+                for m in messages
+            ]
+        else:
+            items = [
                 ChatMessageResponse.model_validate(m).model_dump(mode="json")
                 for m in messages
-            ],
+            ]
+
+        return {
+            "items": items,
             "total": total,
             "page": page,
             "limit": limit,
+            "next_cursor": next_cursor,
         }
 
     data, source = await fetch_from_cache_or_db(
@@ -191,6 +351,7 @@ async def list_session_messages(
         redis_key=cache_key,
         db_fetch_callable=fetch,
         ttl=SESSION_MESSAGES_TTL,
+        stale_ttl=SESSION_MESSAGES_STALE_TTL,
     )
 
     return {
@@ -199,6 +360,160 @@ async def list_session_messages(
     }
 
 
+# ==================================================
+# ✅ GENERATE ASSISTANT REPLY (SSE token stream)
+# ==================================================
+@router.post("/session/{session_id}/reply")
+async def generate_reply(
+    session_id: UUID,
+    payload: ChatReplyRequest,
+    db: AsyncSession = Depends(get_db),
+    redis: AsyncRedisClient = Depends(get_redis),
+    provider: LLMProvider = Depends(get_llm_provider),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Stream the assistant's next turn as Server-Sent Events.
+
+    - `event: token` frames as tokens arrive
+    - `event: done` with the persisted assistant message
+    - `event: error` if the provider fails
+
+    With `content`, the user turn is stored first (one call per turn).
+    WebSocket subscribers receive both messages as `message.created`.
+    """
+    user_id = current_user["user_id"]
+
+    # ✅ Validate session ownership
+    session = await CRUDHelper.get_by_id(db, SessionModel, session_id)
+
+    if not session or str(session.user_id) != user_id:
+        raise HTTPException(403, "Invalid session")
+
+    if payload.content:
+        user_message = await CRUDHelper.create(
+            db,
+            ChatMessage,
+            {
+                "user_id": user_id,
+                "session_id": session_id,
+                "role": "user",
+                "content": payload.content,
+                "source": "text",
+            },
+        )
+        async with redis.pipeline() as batch:
+            queue_messages_created(
+                batch,
+                user_id=user_id,
+                session_id=session_id,
+                items=[ChatMessageResponse.model_validate(user_message).model_dump(mode="json")],
+            )
+
+    prompt, prompt_tokens = await build_prompt(db, redis, session, user_id)
+
+    logger.info(
+        "Generating reply | session=%s provider=%s model=%s prompt_messages=%s prompt_tokens~%s",
+        session_id, provider.name, session.model_used, len(prompt), prompt_tokens,
+    )
+
+    async def events():
+        async for event in stream_reply(
+            provider=provider,
+            prompt=prompt,
+            model=session.model_used,
+            user_id=user_id,
+            session_id=session_id,
+            redis=redis,
+        ):
+            yield sse_event(event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ==================================================
+# ✅ EXPORT SESSION MESSAGES (streamed)
+# ==================================================
+@router.get("/session/{session_id}/export")
+async def export_session_messages(
+    session_id: UUID,
+    format: str = Query("ndjson", pattern="^(ndjson|json)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Stream a session's full history, oldest first.
+
+    - `ndjson`: one message per line
+    - `json`: a single JSON array
+
+    Rows come from a server-side cursor (EXPORT_BATCH_SIZE per fetch),
+    so memory stays constant regardless of session size. No COUNT,
+    no cache: this is a one-off bulk read.
+    """
+    user_id = current_user["user_id"]
+
+    # ✅ Validate session ownership
+    session = await CRUDHelper.get_by_id(db, SessionModel, session_id)
+
+    if not session or str(session.user_id) != user_id:
+        raise HTTPException(403, "Invalid session")
+
+    query = (
+        select(ChatMessage)
+        .options(defer(ChatMessage.audio_data))
+        .where(ChatMessage.session_id == session_id)
+        .order_by(ChatMessage.created_at, ChatMessage.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    as_array = format == "json"
+
+    async def stream_rows():
+        # Own DB session: the response body outlives the request dependency
+        async with AsyncSessionLocal() as export_db:
+            result = await export_db.stream(query)
+
+            if as_array:
+                yield b"["
+
+            first = True
+            count = 0
+            async for batch in result.scalars().partitions():
+                lines = [
+                    ChatMessageResponse.model_validate(m).model_dump_json()
+                    for m in batch
+                ]
+                count += len(lines)
+
+                if as_array:
+                    chunk = ",".join(lines)
+                    yield (chunk if first else "," + chunk).encode()
+                else:
+                    yield ("\n".join(lines) + "\n").encode()
+                first = False
+
+            if as_array:
+                yield b"]"
+
+            logger.info("Session export finished | session=%s messages=%s", session_id, count)
+
+    logger.info("Session export started | session=%s format=%s", session_id, format)
+
+    extension = "json" if as_array else "ndjson"
+    return StreamingResponse(
+        stream_rows(),
+        media_type="application/json" if as_array else "application/x-ndjson",
+        headers={
+            "Content-Disposition": f'attachment; filename="session-{session_id}.{extension}"'
+        },
+    )
+
+
 # ==================================================
 # ✅ DELETE MESSAGE
 # ==================================================
@@ -218,8 +533,129 @@ async def delete_message(
 
     await CRUDHelper.delete(db, message)
 
-    # Invalidating all paginated session caches
-    await redis.delete(f"message:{user_id}:{message_id}")
-    await redis.delete(f"session:{message.session_id}:messages")
+    # Invalidating all paginated session caches (O(1) generation bump)
+    async with redis.pipeline() as batch:
+        batch.delete(f"message:{message_id}", f"message:{user_id}:{message_id}")
+        batch.bump_generation(f"session:{message.session_id}:messages")
+        queue_context_invalidate(batch, message.session_id)
+        batch.publish_json(
+            session_channel(message.session_id),
+            {"type": "message.deleted", "message_id": str(message_id)},
+        )
 
     logger.info("Message deleted | id=%s", message_id)
+
+
+# ==================================================
+# ✅ UPLOAD MESSAGE AUDIO (streamed)
+# ==================================================
+@router.post("/{message_id}/audio", response_model=ChatMessageResponse)
+async def upload_message_audio(
+    message_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    redis: AsyncRedisClient = Depends(get_redis),
+    blobs: BlobStore = Depends(get_blob_store),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Attach audio to a message.
+
+    The raw request body is the audio; it is streamed into the blob store
+    chunk by chunk (never buffered whole). `Content-Type` is recorded.
+    """
+    user_id = current_user["user_id"]
+
+    message = await CRUDHelper.get_by_id(db, ChatMessage, message_id)
+
+    if not message or str(message.user_id) != user_id:
+        raise HTTPException(404, "Message not found")
+
+    try:
+        digest, size = await blobs.put_stream(
+            request.stream(),
+            max_bytes=settings.BLOB_MAX_BYTES,
+        )
+    except BlobTooLargeError:
+        raise HTTPException(413, "Audio too large")
+
+    if size == 0:
+        raise HTTPException(422, "Empty audio upload")
+
+    message = await CRUDHelper.update(
+        db,
+        message,
+        {
+            "audio_blob_hash": digest,
+            "audio_size": size,
+            "audio_content_type": request.headers.get("content-type") or DEFAULT_AUDIO_CONTENT_TYPE,
+            "audio_data": None,
+            "source": "audio",
+        },
+    )
+
+    message_json = ChatMessageResponse.model_validate(message).model_dump(mode="json")
+
+    async with redis.pipeline() as batch:
+        batch.delete(f"message:{message_id}", f"message:{user_id}:{message_id}")
+        batch.bump_generation(f"session:{message.session_id}:messages")
+        batch.publish_json(
+            session_channel(message.session_id),
+            {"type": "message.updated", "message": message_json},
+        )
+
+    logger.info("Message audio stored | id=%s sha256=%s size=%s", message_id, digest, size)
+
+    return message_json
+
+
+# ==================================================
+# ✅ DOWNLOAD MESSAGE AUDIO (streamed)
+# ==================================================
+@router.get("/{message_id}/audio")
+async def get_message_audio(
+    message_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    blobs: BlobStore = Depends(get_blob_store),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Stream a message's audio bytes.
+
+    Falls back to legacy inline base64 `audio_data` for rows written
+    before blob storage.
+    """
+    user_id = current_user["user_id"]
+
+    message = await CRUDHelper.get_by_id(db, ChatMessage, message_id)
+
+    if not message or str(message.user_id) != user_id:
+        raise HTTPException(404, "Message not found")
+
+    content_type = message.audio_content_type or DEFAULT_AUDIO_CONTENT_TYPE
+
+    if message.audio_blob_hash:
+        if not await blobs.exists(message.audio_blob_hash):
+            logger.error("Blob missing | id=%s sha256=%s", message_id, message.audio_blob_hash)
+            raise HTTPException(404, "Audio not found")
+
+        headers = {"ETag": f'"{message.audio_blob_hash}"'}
+        if message.audio_size is not None:
+            headers["Content-Length"] = str(message.audio_size)
+
+        return StreamingResponse(
+            blobs.open_stream(message.audio_blob_hash),
+            media_type=content_type,
+            headers=headers,
+        )
+
+    if message.audio_data:
+        # Legacy MVP row
+        audio_bytes = base64.b64decode(message.audio_data)
+
+        async def legacy_stream():
+            yield audio_bytes
+
+        return StreamingResponse(legacy_stream(), media_type=content_type)
+
+    raise HTTPException(404, "Message has no audio")
@@ -16,9 +16,8 @@ from app.schemas.session import (
 )
 from app.core.logging.route_logger import get_route_logger
 from app.services.helpers.crud_helper import CRUDHelper
-from app.services.helpers.redis_helpers import fetch_from_cache_or_db
-from app.services.helpers.pagination import paginate_query
-from app.services.helpers.sorting import apply_sorting
+from app.services.helpers.redis_helpers import fetch_from_cache_or_db, versioned_key
+from app.services.helpers.pagination import paginate_keyset
 
 
 
@@ -35,6 +34,7 @@ router = APIRouter(
 # == ✅ Redis TTL for Caching ==
 SESSION_TTL = 24 * 3600
 SESSION_LIST_TTL = 300
+SESSION_LIST_STALE_TTL = 600  # served stale while refreshing in background
 
 
 # ✅ === CREATE SESSION ===
@@ -68,6 +68,9 @@ async def create_Session(
         ex=SESSION_TTL,
     )
 
+    # ✅ Session lists for this user are now outdated
+    await redis.bump_generation(f"user:{user_id}:sessions")
+
     logger.info("Session created + cached | id=%s", session.id)
 
     return SessionResponse(
@@ -131,6 +134,8 @@ async def list_user_sessions(
     limit: int = Query(20, le=100),
     sort_by: str = Query("started_at"),
     order: str = Query("desc"),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool | None = Query(None, description="Count all rows (defaults to true without a cursor)"),
     db: AsyncSession = Depends(get_db),
     redis: AsyncRedisClient = Depends(get_redis),
     current_user: dict = Depends(get_current_user),
@@ -145,20 +150,28 @@ async def list_user_sessions(
     """
     # Validate user:
     user_id = current_user["user_id"]
-    cache_key = f"user:{user_id}:sessions:{page}:{limit}:{sort_by}:{order}"
+    cache_key = await versioned_key(
+        redis,
+        f"user:{user_id}:sessions",
+        f"{page}:{limit}:{sort_by}:{order}:{cursor}:{include_total}",
+    )
 
-    async def fetch():
+    async def fetch(db: AsyncSession = db):
         query = select(SessionModel).where(
             SessionModel.user_id == user_id
         )
 
-        query = apply_sorting(query, SessionModel, sort_by, order)
-
-        sessions, total = await paginate_query(
+        sessions, total, next_cursor = await paginate_keyset(
             session=db,
             query=query,
+            model=SessionModel,
+            sort_by=sort_by,
+            order=order,
+            default_sort="started_at",
             page=page,
             limit=limit,
+            cursor=cursor,
+            with_total=include_total,
         )
 
         return {
@@ -169,6 +182,7 @@ async def list_user_sessions(
             "total": total,
             "page": page,
             "limit": limit,
+            "next_cursor": next_cursor,
         }
 
     data, source = await fetch_from_cache_or_db(
@@ -176,6 +190,7 @@ async def list_user_sessions(
         redis_key=cache_key,
         db_fetch_callable=fetch,
         ttl=SESSION_LIST_TTL,
+        stale_ttl=SESSION_LIST_STALE_TTL,
     )
 
     return {**data, "source": source}
@@ -213,6 +228,7 @@ async def update_session(
         SessionResponse.model_validate(session).model_dump(mode="json"),
         ex=SESSION_TTL,
     )
+    await redis.bump_generation(f"user:{user_id}:sessions")
 
     logger.info("Session metadata updated & cache refreshed | id=%s", session_id)
 
@@ -242,6 +258,14 @@ async def delete_session(
 
     await CRUDHelper.delete(db, session)
 
-    await redis.delete(f"session:{user_id}:{session_id}")
+    async with redis.pipeline() as batch:
+        batch.delete(f"session:{user_id}:{session_id}", f"session:{session_id}")
+
+    # ✅ Drop session lists + everything cached for the session's messages
+    await redis.bump_generation(
+        f"user:{user_id}:sessions",
+        f"session:{session_id}:messages",
+    )
+    await redis.invalidate_tags(f"session:{session_id}:message-items")
 
     logger.info("Session deleted | id=%s", session_id)
\ No newline at end of file
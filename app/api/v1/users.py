@@ -5,7 +5,7 @@ from uuid import UUID
 import json
 import logging
 
-from app.api.dependencies.current_user import get_current_user
+from app.api.dependencies.current_user import get_current_user, invalidate_principal
 from app.core.logging.logging_config import setup_logging
 from app.core.db.database import get_db
 from app.core.redis.redis_config import AsyncRedisClient, get_redis
@@ -14,9 +14,8 @@ from app.schemas.user import UserCreate, UserResponse, UserRead, UserUpdate
 from app.core.logging.route_logger import get_route_logger
 
 from app.services.helpers.crud_helper import CRUDHelper
-from app.services.helpers.redis_helpers import fetch_from_cache_or_db
-from app.services.helpers.pagination import paginate_query
-from app.services.helpers.sorting import apply_sorting
+from app.services.helpers.redis_helpers import fetch_from_cache_or_db, versioned_key
+from app.services.helpers.pagination import paginate_keyset
 
 
 # ✅ Logging setup
@@ -31,6 +30,8 @@ router = APIRouter(
 # Redis TTL for caching
 USER_CACHE_TTL = 300  # -> 5 minutes
 USERS_LIST_TTL = 120 
+USERS_LIST_STALE_TTL = 300  # served stale while refreshing in background
+USERS_LIST_LOCK_TTL = 2  # shared key -> coalesce rebuilds across workers
 
 
 # ✅ === CREATE USER ===
@@ -50,7 +51,8 @@ async def create_user(
             (User.username == payload.username) |
             (User.email == payload.email)
         ],
-        limit=1
+        limit=1,
+        fields=["id"],
     )
 
     if existing:
@@ -73,6 +75,7 @@ async def create_user(
         user_data,
         ex=USER_CACHE_TTL,
     )
+    await redis.bump_generation("users:list")
 
     logger.info("User created + cached success!| id=%s", user.id)
 
@@ -128,21 +131,31 @@ async def list_users(
     limit: int = Query(20, ge=1, le=100),
     sort_by: str = Query("created_at"),
     order: str = Query("desc"),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool | None = Query(None, description="Count all rows (defaults to true without a cursor)"),
     db: AsyncSession = Depends(get_db),
     redis: AsyncRedisClient = Depends(get_redis),
 ):
-    cache_key = f"users:list:{page}:{limit}:{sort_by}:{order}"
+    cache_key = await versioned_key(
+        redis,
+        "users:list",
+        f"{page}:{limit}:{sort_by}:{order}:{cursor}:{include_total}",
+    )
 
-    async def fetch():
+    async def fetch(db: AsyncSession = db):
         query = select(User)
 
-        query = apply_sorting(query, User, sort_by, order)
-
-        users, total = await paginate_query(
+        users, total, next_cursor = await paginate_keyset(
             session=db,
             query=query,
+            model=User,
+            sort_by=sort_by,
+            order=order,
+            default_sort="created_at",
             page=page,
             limit=limit,
+            cursor=cursor,
+            with_total=include_total,
         )
 
         return {
@@ -153,6 +166,7 @@ async def list_users(
             "total": total,
             "page": page,
             "limit": limit,
+            "next_cursor": next_cursor,
         }
 
     data, source = await fetch_from_cache_or_db(
@@ -160,6 +174,8 @@ async def list_users(
         redis_key=cache_key,
         db_fetch_callable=fetch,
         ttl=USERS_LIST_TTL,
+        stale_ttl=USERS_LIST_STALE_TTL,
+        lock_ttl=USERS_LIST_LOCK_TTL,
     )
 
     return {**data, "source": source}
@@ -195,6 +211,8 @@ async def update_user(
         user_data,
         ex=USER_CACHE_TTL,
     )
+    await invalidate_principal(redis, user_id)
+    await redis.bump_generation("users:list")
 
     logger.info("User updated + cache refreshed | id=%s", user_id)
 
@@ -219,7 +237,7 @@ async def delete_user(
 
     logger.info("Delete requested for user %s", user_id)
     
-    user = CRUDHelper.get_by_id(db, User, user_id)
+    user = await CRUDHelper.get_by_id(db, User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -230,6 +248,7 @@ async def delete_user(
 
     # Invalidate cache
     await redis.delete(f"user:{user_id}")
-    await redis.delete("users:list")
+    await redis.bump_generation("users:list", f"user:{user_id}:sessions")
+    await invalidate_principal(redis, user_id)
 
     logger.info(f"🗑️ User {user_id} deleted! ")
@@ -9,6 +9,10 @@ celery = Celery(
     "ineuro",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
+    include=[
+        "app.tasks.user_tasks",
+        "app.tasks.memory_tasks",
+    ],
 )
 
 # ✅ Celery Configuration
@@ -23,4 +27,8 @@ celery.conf.beat_schedule = {
         "task": "app.tasks.user_tasks.deactivate_stale_users",
         "schedule": crontab(hour=3, minute=0),
     },
+    "summarize-user-memories": {
+        "task": "app.tasks.memory_tasks.summarize_user_memories",
+        "schedule": crontab(minute="*/15"),
+    },
 }
\ No newline at end of file
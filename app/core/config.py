@@ -19,6 +19,58 @@ class Settings(BaseSettings):
     REDIS_URL: str = Field(..., env="REDIS_URL")
     REDIS_HMAC_SECRET: str = Field(..., env="REDIS_HMAC_SECRET")
 
+    # In-process L1 cache in front of Redis
+    REDIS_L1_ENABLED: bool = Field(True, env="REDIS_L1_ENABLED")
+    REDIS_L1_MAX_ITEMS: int = Field(10_000, env="REDIS_L1_MAX_ITEMS")
+    REDIS_L1_TTL_SECONDS: float = Field(5.0, env="REDIS_L1_TTL_SECONDS")
+    REDIS_L1_INVALIDATION_CHANNEL: str = Field(
+        "cache:l1:invalidate", env="REDIS_L1_INVALIDATION_CHANNEL"
+    )
+
+    # Cached payload codec: "json" (orjson if installed) or "msgpack";
+    # bodies above the threshold (bytes) are compressed with zstd or zlib
+    REDIS_CODEC: str = Field("json", env="REDIS_CODEC")
+    REDIS_COMPRESSION: str = Field("zstd", env="REDIS_COMPRESSION")
+    REDIS_COMPRESSION_THRESHOLD: int = Field(1024, env="REDIS_COMPRESSION_THRESHOLD")
+
+    # Blob storage (message audio)
+    BLOB_STORAGE_DIR: str = Field("blobs", env="BLOB_STORAGE_DIR")
+    BLOB_CHUNK_SIZE: int = Field(64 * 1024, env="BLOB_CHUNK_SIZE")
+    BLOB_MAX_BYTES: int = Field(25 * 1024 * 1024, env="BLOB_MAX_BYTES")
+
+    # LLM generation
+    LLM_PROVIDER: str = Field("fake", env="LLM_PROVIDER")
+    LLM_CONTEXT_MESSAGES: int = Field(20, env="LLM_CONTEXT_MESSAGES")
+    LLM_CONTEXT_TOKEN_BUDGET: int = Field(4000, env="LLM_CONTEXT_TOKEN_BUDGET")
+    LLM_FAKE_FIRST_TOKEN_MS: int = Field(50, env="LLM_FAKE_FIRST_TOKEN_MS")
+    LLM_FAKE_TOKEN_MS: int = Field(10, env="LLM_FAKE_TOKEN_MS")
+
+    # UserMemory summarization (Celery)
+    MEMORY_SUMMARIZER: str = Field("stub", env="MEMORY_SUMMARIZER")
+    MEMORY_MIN_NEW_MESSAGES: int = Field(10, env="MEMORY_MIN_NEW_MESSAGES")
+    MEMORY_USERS_PER_RUN: int = Field(500, env="MEMORY_USERS_PER_RUN")
+    MEMORY_COMMIT_EVERY: int = Field(50, env="MEMORY_COMMIT_EVERY")
+    MEMORY_MAX_MESSAGES_PER_USER: int = Field(200, env="MEMORY_MAX_MESSAGES_PER_USER")
+    # Messages younger than this are left for a later run (late commits)
+    MEMORY_SETTLE_SECONDS: int = Field(300, env="MEMORY_SETTLE_SECONDS")
+
+    # Log sampling (see app/core/logging/sampling.py)
+    LOG_SAMPLING_ENABLED: bool = Field(True, env="LOG_SAMPLING_ENABLED")
+    LOG_SAMPLE_RATES: dict[str, float] = Field(
+        default_factory=lambda: {"cache.helpers": 0.1},
+        env="LOG_SAMPLE_RATES",
+    )
+    LOG_RATE_LIMITS: dict[str, float] = Field(
+        default_factory=lambda: {"cache.helpers": 100.0},
+        env="LOG_RATE_LIMITS",
+    )
+    LOG_RATE_LIMIT_BURST: int = Field(20, env="LOG_RATE_LIMIT_BURST")
+    LOG_SAMPLING_SUMMARY_SECONDS: float = Field(60.0, env="LOG_SAMPLING_SUMMARY_SECONDS")
+
+    # Metrics (/metrics, aggregated across workers via Redis)
+    METRICS_PUSH_INTERVAL: float = Field(10.0, env="METRICS_PUSH_INTERVAL")
+    METRICS_WORKER_TTL: float = Field(30.0, env="METRICS_WORKER_TTL")
+
     # CELERY SETTINGS 
     CELERY_BROKER_URL: str = Field(..., env="CELERY_BROKER_URL")
     CELERY_RESULT_BACKEND: str = Field(..., env="CELERY_RESULT_BACKEND")
@@ -1,12 +1,24 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 import logging
 import os
+import time
 
 from app.core.config import get_settings
+from app.core.metrics.registry import db_query_duration
 
 logger = logging.getLogger(__name__)
-Base = declarative_base()
+
+
+class _EagerDefaults:
+    # Server-generated columns (server_default, onupdate=func.now()) come
+    # back via INSERT/UPDATE ... RETURNING in the same statement,
+    # so writes never need a follow-up SELECT (db.refresh)
+    __mapper_args__ = {"eager_defaults": True}
+
+
+Base = declarative_base(cls=_EagerDefaults)
 settings = get_settings()
 
 
@@ -20,6 +32,24 @@ async_engine = create_async_engine(
 )
 
 
+# ✅ Statement timing (db_query_duration_seconds, label = SQL verb)
+_DB_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+@event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+def _observe_query_time(conn, cursor, statement, parameters, context, executemany):
+    verb = statement.split(None, 1)[0].upper() if statement else ""
+    db_query_duration.observe(
+        time.perf_counter() - context._query_start,
+        verb if verb in _DB_OPERATIONS else "OTHER",
+    )
+
+
 AsyncSessionLocal = async_sessionmaker(
     bind=async_engine,
     class_=AsyncSession,
@@ -1,3 +1,4 @@
+import logging
 from contextvars import ContextVar
 from typing import Optional
 
@@ -21,7 +22,23 @@ def set_request_context(
 def get_logging_context()-> dict:
     return {
         "request_id": request_id_ctx.get(),
-        "user_id": user_id_ctx(),
+        "user_id": user_id_ctx.get(),
         "user_email": user_email_ctx.get(),
         "user_role": user_role_ctx.get(),
-    }
\ No newline at end of file
+    }
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Copies the request context onto each record.
+
+    Attach to the (queue) handler so the context vars are read in the
+    caller's task, before the record crosses to the writer thread.
+    Values passed explicitly via `extra=` win.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in get_logging_context().items():
+            if value is not None and not hasattr(record, key):
+                setattr(record, key, value)
+        return True
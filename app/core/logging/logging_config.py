@@ -1,13 +1,36 @@
+import atexit
 import logging
 import os
 import json
 import glob
+import queue
+import socket
+import time
 from logging.handlers import TimedRotatingFileHandler
 from datetime import datetime, timezone, timedelta
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+from app.core.config import get_settings
+from app.core.logging.context import RequestContextFilter
+from app.core.logging.queue_logging import BatchingQueueListener, DroppingQueueHandler
+from app.core.logging.sampling import LogSamplingFilter
+
 LOG_DIR = "logs"
 LOG_FILE = "Chat_api.log"
 LOG_RETENTION_DAYS = 5
+LOG_SERVICE_NAME = "chat-api"
+
+# Queue pipeline: records beyond LOG_QUEUE_SIZE are dropped (and counted)
+LOG_QUEUE_SIZE = 10_000
+LOG_BATCH_SIZE = 256
+LOG_FLUSH_INTERVAL = 0.5  # seconds
+
+_listener: BatchingQueueListener | None = None
+_queue_handler: DroppingQueueHandler | None = None
 
 
 # ✅ == Verify the logs directory exists ==
@@ -15,16 +38,57 @@ os.makedirs(LOG_DIR, exist_ok=True)
 
 
 # ✅ == JSON Log Formatter ==
+# Attributes every LogRecord has; anything else came from `extra=`
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None))
+) | {"message", "asctime", "taskName"}
+
+
+def _json_default(value):
+    # UUIDs, datetimes, Decimals, ... from `extra=`
+    return str(value)
+
+
+if orjson is not None:
+    def _dumps(value: dict) -> str:
+        return orjson.dumps(value, default=_json_default).decode()
+else:
+    def _dumps(value: dict) -> str:
+        return json.dumps(value, ensure_ascii=False, default=_json_default)
+
+
 class JSONFormatter(logging.Formatter):
 
     """
     Structured JSON formatter for logs.
     Designed for ELK/LOKI/OpenSearch compatibility
+
+    - Timestamp from `record.created` (the time of the call, not of the
+      write), with the per-second prefix cached
+    - `static_fields` are serialized once and spliced into every line
+    - `extra={...}` fields and the request context (RequestContextFilter)
+      are included as top-level keys
+    - orjson when installed, stdlib json otherwise
     """
 
+    def __init__(self, static_fields: dict | None = None):
+        super().__init__()
+        # '"service":"chat-api",' -> spliced after the opening brace
+        static = _dumps(static_fields or {})[1:-1]
+        self._static = static + "," if static else ""
+        self._ts_second = None
+        self._ts_prefix = ""
+
+    def _timestamp(self, created: float) -> str:
+        second = int(created)
+        if second != self._ts_second:
+            self._ts_second = second
+            self._ts_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._ts_prefix}.{int((created - second) * 1_000_000):06d}+00:00"
+
     def format(self, record: logging.LogRecord) -> str:
         log_record = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -33,11 +97,19 @@ class JSONFormatter(logging.Formatter):
             "funcName": record.funcName,
         }
 
+        # Extra fields + request context
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in log_record:
+                log_record[key] = value
+
         # Adding exceptional details if present
         if record.exc_info:
             log_record["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # Already rendered by DroppingQueueHandler.prepare
+            log_record["exception"] = record.exc_text
 
-        return json.dumps(log_record, ensure_ascii=False)
+        return "{" + self._static + _dumps(log_record)[1:]
 
 
 # ===✅ Log Cleanup ===
@@ -72,7 +144,10 @@ def setup_logging():
     - Console logging
     - Daily rotation at UTC midnight
     - Guaranteed 5-day retention
+    - Root only enqueues; a background thread writes in batches
+    - Hot INFO lines sampled / rate-limited per settings (LOG_SAMPLE_*)
     """
+    settings = get_settings()
 
    # 🔥 Ensure cleanup ALWAYS happens on startup
     cleanup_old_logs(LOG_DIR, LOG_RETENTION_DAYS)
@@ -96,7 +171,11 @@ def setup_logging():
     )
 
     file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(JSONFormatter())
+    file_handler.setFormatter(
+        JSONFormatter(
+            static_fields={"service": LOG_SERVICE_NAME, "host": socket.gethostname()}
+        )
+    )
 
     # == Console Handler ==
     console_handler = logging.StreamHandler()
@@ -108,8 +187,60 @@ def setup_logging():
         )
     )
 
-    # == Attach Handlers ==
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    # == Queue pipeline (no file I/O on the caller's thread) ==
+    global _listener, _queue_handler
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _queue_handler = DroppingQueueHandler(log_queue)
+    # Context vars must be read here, not on the writer thread
+    _queue_handler.addFilter(RequestContextFilter())
+
+    # Sampling first: suppressed records skip the context copy too
+    record_sources = []
+    if settings.LOG_SAMPLING_ENABLED:
+        sampling_filter = LogSamplingFilter(
+            sample_rates=settings.LOG_SAMPLE_RATES,
+            rate_limits=settings.LOG_RATE_LIMITS,
+            burst=settings.LOG_RATE_LIMIT_BURST,
+            summary_interval=settings.LOG_SAMPLING_SUMMARY_SECONDS,
+        )
+        if sampling_filter.active:
+            _queue_handler.filters.insert(0, sampling_filter)
+            # Suppression summaries are written by the listener's tick
+            record_sources.append(sampling_filter.flush_summary)
+
+    _listener = BatchingQueueListener(
+        log_queue,
+        file_handler,
+        console_handler,
+        queue_handler=_queue_handler,
+        batch_size=LOG_BATCH_SIZE,
+        flush_interval=LOG_FLUSH_INTERVAL,
+        record_sources=record_sources,
+    )
+    _listener.start()
+    atexit.register(stop_logging)
+
+    # == Attach Handler ==
+    root_logger.addHandler(_queue_handler)
 
     logging.info("✅ Logging system initialized.")
+
+
+def stop_logging() -> None:
+    """
+    Flush queued records (and pending suppression summaries) and stop
+    the writer thread. Safe to call more than once (lifespan shutdown + atexit).
+
+    Late records (after shutdown) are written synchronously.
+    """
+    global _listener
+    if _listener is None:
+        return
+
+    _listener.stop()
+
+    root_logger = logging.getLogger()
+    root_logger.removeHandler(_queue_handler)
+    for handler in _listener.handlers:
+        root_logger.addHandler(handler)
+    _listener = None
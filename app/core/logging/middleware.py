@@ -1,87 +1,98 @@
 import uuid
 import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from jose import jwt, JWTError
 
-from app.core.logging.context import set_request_context
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging.context import set_request_context, user_id_ctx
 from app.core.logging.route_logger import get_route_logger
+from app.core.metrics.registry import http_request_duration, http_requests_in_flight
 
 
 logger = get_route_logger("http")
 
-# JWT Configuration
-JWT_SELECT = "CHANGE_LATER"
-JWT_ALGORITHM = "Hs256"
+
+def _route_label(scope: Scope) -> str:
+    """Route template (bounded label set); unmatched paths share one label."""
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+
+
+def _header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
 
 # Logging requests and responses in JSON format
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request:Request, call_next):
-
-        # 1️⃣ Generating request correlation ID
-        request_id = str(uuid.uuid4())
-        start_time = time.time()
-
-        # 2️⃣ Initializing user context placeholders
-        user_id = None
-        user_email = None
-        user_role = None
-
-         # 3️⃣ Attempting JWT extraction -> this does not enforce authentication
-        # ↪ It only enriches logs if token exists
-        auth_header = request.headers.get("Authorization")
-
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split("")[1]
-
-            try:
-                payload = jwt.decode(
-                    token,
-                    JWT_SELECT,
-                    algorithms=[JWT_ALGORITHM],
-                    options={"verify_aud":False}
-                )
-
-                user_id = payload.get("sub")
-                user_email = payload.get("email")
-                user_role = payload.get("role")
-            except JWTError:
-                # NOTE: Logging must NEVER break the request flow
-                pass
-
-        # 4️⃣ Storing context for entire request lifecycle:
-        # This request is available everywhere including services, repositories, background jobs, etc
-
-        set_request_context(
-            request_id=request_id,
-            user_id=user_id,
-            user_email=user_email,
-            user_role=user_role
-        )
-
-        # 5️⃣ Continue with request processing
-        response = await call_next(request)
-
-        # 6️⃣ Measuring latency
-        process_time = round(time.time() - start_time, 4)
-
-         # 7️⃣ Attaching request_id to response
-        response.headers["X-Request-ID"] = request_id
-
-        # 8️⃣ Log HTTP summary
-        logger.info(
-            "HTTP request processed",
-            extra = {
-                "event": "http_request",
-                "method": request.method,
-                "path": request.url.path,
-                "query_params": str(request.query_params),
-                "client_ip": request.client.host if request.client else None,
-                "status_code": response.status_code,
-                "latency_seconds": process_time,
-                "user_agent": request.headers.get("user-agent"),
-            },
-        )
-
-
-        return response
+class RequestLoggingMiddleware:
+    """
+    Pure ASGI request logger.
+
+    - No extra task or body re-streaming per request (unlike
+      BaseHTTPMiddleware), so StreamingResponse/SSE pass straight through
+    - Status and latency are captured on `http.response.start`;
+      `duration_seconds` also covers streamed bodies
+    - Context vars are set in the request's own task, so anything the
+      handler sets (e.g. user_id after auth) is visible here afterwards
+    - Feeds http_request_duration_seconds / http_requests_in_flight
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # 1️⃣ Correlation ID (reuse the caller's if provided)
+        request_id = _header(scope, b"x-request-id") or uuid.uuid4().hex
+        start = time.perf_counter()
+
+        # 2️⃣ Context for the whole request lifecycle (user filled in by auth)
+        set_request_context(request_id=request_id)
+
+        status_code = 500
+        latency = None
+        method = scope["method"]
+        http_requests_in_flight.inc(method)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, latency
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                latency = time.perf_counter() - start
+                # 3️⃣ Attaching request_id to response
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            client = scope.get("client")
+
+            http_requests_in_flight.dec(method)
+            http_request_duration.observe(
+                latency if latency is not None else duration,
+                method, _route_label(scope), status_code,
+            )
+
+            # 4️⃣ Log HTTP summary
+            logger.info(
+                "HTTP request processed",
+                extra={
+                    "event": "http_request",
+                    "method": method,
+                    "path": scope["path"],
+                    "query_params": scope["query_string"].decode("latin-1"),
+                    "client_ip": client[0] if client else None,
+                    "status_code": status_code,
+                    "latency_seconds": round(latency if latency is not None else duration, 4),
+                    "duration_seconds": round(duration, 4),
+                    "user_id": user_id_ctx.get(),
+                    "user_agent": _header(scope, b"user-agent"),
+                },
+            )
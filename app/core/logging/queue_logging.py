@@ -0,0 +1,224 @@
+"""
+Queued Logging
+--------------
+
+Keeps log I/O off the event loop.
+
+- `DroppingQueueHandler` (on root): enqueues records, never blocks.
+  When the queue is full the new record is dropped and counted;
+  ERROR and above evict the oldest queued record instead
+- `BatchingQueueListener` (background thread): drains the queue in
+  batches (size or interval, whichever comes first) and writes each
+  batch to every stream/file handler with ONE write + ONE flush
+- Dropped records are reported periodically as a WARNING and counted
+  in log_records_dropped_total (/metrics)
+- A record that fails to format is reported via handleError and
+  skipped; the rest of its batch is still written
+- `record_sources` (e.g. LogSamplingFilter.flush_summary) are polled on
+  every tick, idle or not, and once more with force=True on stop
+"""
+
+import copy
+import logging
+import queue
+import threading
+import time
+from logging.handlers import BaseRotatingHandler, QueueHandler
+from typing import Callable, Iterable
+
+from app.core.metrics.registry import log_records_dropped
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Non-blocking QueueHandler with a bounded queue and a drop counter.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def _count_drop(self) -> None:
+        with self._dropped_lock:
+            self._dropped += 1
+            log_records_dropped.inc()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Freeze the record for another thread: merge args into the message
+        and render the traceback now. No full formatting on the caller.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if record.levelno >= logging.ERROR:
+            # Errors matter more than the oldest queued INFO line
+            try:
+                self.queue.get_nowait()
+                self._count_drop()
+                self.queue.put_nowait(record)
+                return
+            except (queue.Empty, queue.Full):
+                pass
+
+        self._count_drop()
+
+
+class BatchingQueueListener:
+    """
+    Background writer thread for DroppingQueueHandler.
+
+    Stream handlers (console, rotating file) get one write + flush per
+    batch; other handlers receive records one by one.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        *handlers: logging.Handler,
+        queue_handler: DroppingQueueHandler | None = None,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        drop_report_interval: float = 30.0,
+        record_sources: Iterable[Callable[[bool], list[logging.LogRecord]]] = (),
+    ):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.queue_handler = queue_handler
+        self.record_sources = tuple(record_sources)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.drop_report_interval = drop_report_interval
+        self._thread: threading.Thread | None = None
+        self._reported_drops = 0
+        self._last_drop_report = time.monotonic()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Flush everything queued so far and stop the thread."""
+        if self._thread is None:
+            return
+        # Blocking put: at shutdown the writer is draining, so this returns
+        self.queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    record = (
+                        self.queue.get(timeout=timeout)
+                        if timeout > 0
+                        else self.queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if record is self._STOP:
+                    stopping = True
+                    break
+                batch.append(record)
+
+            if batch:
+                self._write(batch)
+            self._report_drops(force=stopping)
+            self._poll_sources(force=stopping)
+
+    def _poll_sources(self, force: bool = False) -> None:
+        for source in self.record_sources:
+            try:
+                records = source(force)
+            except Exception:
+                continue
+            if records:
+                self._write(records)
+
+    def _report_drops(self, force: bool = False) -> None:
+        if self.queue_handler is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_drop_report < self.drop_report_interval:
+            return
+        self._last_drop_report = now
+
+        dropped = self.queue_handler.dropped
+        if dropped > self._reported_drops:
+            record = logging.LogRecord(
+                "logging.queue", logging.WARNING, __file__, 0,
+                "%s log records dropped (queue full); %s total",
+                (dropped - self._reported_drops, dropped), None,
+            )
+            self._reported_drops = dropped
+            self._write([record])
+
+    def _write(self, records: list[logging.LogRecord]) -> None:
+        for handler in self.handlers:
+            accepted = [
+                r for r in records
+                if r.levelno >= handler.level and handler.filter(r)
+            ]
+            if not accepted:
+                continue
+
+            if isinstance(handler, logging.StreamHandler):
+                self._write_stream(handler, accepted)
+            else:
+                for record in accepted:
+                    handler.handle(record)
+
+    @staticmethod
+    def _write_stream(handler: logging.StreamHandler, records: list[logging.LogRecord]) -> None:
+        lines = []
+        for record in records:
+            try:
+                lines.append(handler.format(record) + handler.terminator)
+            except Exception:
+                handler.handleError(record)
+        if not lines:
+            return
+        payload = "".join(lines)
+
+        handler.acquire()
+        try:
+            if isinstance(handler, BaseRotatingHandler) and handler.shouldRollover(records[0]):
+                handler.doRollover()
+            if handler.stream is None:
+                # FileHandler(delay=True) opens on first write
+                handler.stream = handler._open()
+            handler.stream.write(payload)
+            handler.flush()
+        except Exception:
+            handler.handleError(records[0])
+        finally:
+            handler.release()
@@ -0,0 +1,203 @@
+"""
+Log Sampling
+------------
+
+Cuts the volume of hot, repetitive INFO/DEBUG lines (cache HIT/MISS,
+per-request route logs) before they are queued, formatted or written.
+
+Rules are keyed by logger name (hierarchical: "cache" covers
+"cache.helpers") or by "logger:message prefix" for one template:
+
+    sample_rates = {"cache.helpers": 0.1, "cache.helpers:❌ Cache MISS": 1.0}
+    rate_limits  = {"cache.helpers": 100}      # records/s per template
+
+- The most specific rule wins (template, then closest logger name)
+- Sampling keeps a random `rate` fraction of matching records
+- Rate limits are token buckets per (rule, message template)
+- WARNING and above are never suppressed
+- Suppressed records are counted per template and reported every
+  `summary_interval` seconds as "N similar suppressed"; the report is
+  built by flush_summary(), which the log writer thread calls on every
+  tick and once more on shutdown (so it does not wait for a next record)
+"""
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+SUMMARY_LOGGER = "logging.sampling"
+
+# Bound on per-template state (f-string messages make unique templates)
+MAX_TRACKED_TEMPLATES = 10_000
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens/s, at most `burst` stored.
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+@dataclass(frozen=True)
+class SamplingRule:
+    key: str
+    sample_rate: float = 1.0
+    rate_per_sec: float | None = None
+
+
+class LogSamplingFilter(logging.Filter):
+    """
+    Handler filter applying sample rates and rate limits.
+    Attach to the root (queue) handler.
+    """
+
+    def __init__(
+        self,
+        sample_rates: dict[str, float] | None = None,
+        rate_limits: dict[str, float] | None = None,
+        burst: int = 20,
+        summary_interval: float = 60.0,
+    ):
+        super().__init__()
+        self.burst = burst
+        self.summary_interval = summary_interval
+
+        # logger name -> rule ; logger name -> [(prefix, rule)]
+        self._logger_rules: dict[str, SamplingRule] = {}
+        self._template_rules: dict[str, list[tuple[str, SamplingRule]]] = {}
+        for key in set(sample_rates or {}) | set(rate_limits or {}):
+            rule = SamplingRule(
+                key=key,
+                sample_rate=(sample_rates or {}).get(key, 1.0),
+                rate_per_sec=(rate_limits or {}).get(key),
+            )
+            name, sep, prefix = key.partition(":")
+            if sep:
+                self._template_rules.setdefault(name, []).append((prefix, rule))
+            else:
+                self._logger_rules[name] = rule
+
+        # Longest prefix first
+        for rules in self._template_rules.values():
+            rules.sort(key=lambda item: len(item[0]), reverse=True)
+
+        self._rule_cache: dict[tuple[str, str], SamplingRule | None] = {}
+        self._buckets: dict[tuple[str, str | None], TokenBucket] = {}
+        self._suppressed: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self._last_summary = time.monotonic()
+
+    @property
+    def active(self) -> bool:
+        return bool(self._logger_rules or self._template_rules)
+
+    def _resolve(self, name: str, template: str) -> SamplingRule | None:
+        cache_key = (name, template)
+        try:
+            return self._rule_cache[cache_key]
+        except KeyError:
+            pass
+
+        rule = None
+        for prefix, candidate in self._template_rules.get(name, ()):
+            if template.startswith(prefix):
+                rule = candidate
+                break
+
+        if rule is None:
+            # "cache.helpers" -> "cache" -> ""
+            parts = name.split(".")
+            while parts:
+                rule = self._logger_rules.get(".".join(parts))
+                if rule is not None:
+                    break
+                parts.pop()
+
+        if len(self._rule_cache) >= MAX_TRACKED_TEMPLATES:
+            self._rule_cache.clear()
+        self._rule_cache[cache_key] = rule
+        return rule
+
+    def _allow(self, rule: SamplingRule, template: str) -> bool:
+        if rule.sample_rate < 1.0 and random.random() >= rule.sample_rate:
+            return False
+
+        if rule.rate_per_sec is not None:
+            bucket_key = (
+                (rule.key, template)
+                if len(self._buckets) < MAX_TRACKED_TEMPLATES
+                else (rule.key, None)
+            )
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                bucket = self._buckets[bucket_key] = TokenBucket(
+                    rule.rate_per_sec, max(self.burst, 1)
+                )
+            if not bucket.take():
+                return False
+
+        return True
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or record.name == SUMMARY_LOGGER:
+            return True
+
+        template = record.msg if isinstance(record.msg, str) else str(record.msg)
+        rule = self._resolve(record.name, template)
+
+        with self._lock:
+            allowed = rule is None or self._allow(rule, template)
+            if not allowed:
+                key = (record.name, template)
+                if key in self._suppressed or len(self._suppressed) < MAX_TRACKED_TEMPLATES:
+                    self._suppressed[key] = self._suppressed.get(key, 0) + 1
+
+        return allowed
+
+    def flush_summary(self, force: bool = False) -> list[logging.LogRecord]:
+        """
+        "N similar suppressed" records once `summary_interval` has passed
+        (or now, with force). Returned, not logged: the caller is the
+        writer thread, which must not enqueue into its own queue.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not self._suppressed:
+                return []
+            if not force and now - self._last_summary < self.summary_interval:
+                return []
+            summary, self._suppressed = self._suppressed, {}
+            window = now - self._last_summary
+            self._last_summary = now
+
+        records = []
+        for (name, template), count in summary.items():
+            record = logging.LogRecord(
+                SUMMARY_LOGGER, logging.INFO, __file__, 0,
+                "%s similar suppressed in last %ss | %s: %s",
+                (count, round(window), name, template), None,
+            )
+            record.event = "log_suppressed"
+            record.suppressed = count
+            record.source_logger = name
+            record.template = template
+            records.append(record)
+        return records
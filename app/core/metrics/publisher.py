@@ -0,0 +1,185 @@
+"""
+Cross-Worker Metrics
+--------------------
+
+Each uvicorn worker is a separate process with its own registry.
+To make `/metrics` report the whole server no matter which worker
+answers the scrape:
+
+1️⃣ Every worker pushes its snapshot to one Redis hash
+   (`metrics:workers`, field = worker id) every METRICS_PUSH_INTERVAL s
+2️⃣ The scraped worker pushes its own fresh snapshot, reads the hash
+   and merges every worker plus the retired totals
+3️⃣ Workers silent for longer than METRICS_WORKER_TTL lose their gauges
+   but keep their counters/histograms (last snapshot) in the merge
+4️⃣ A worker is retired (counters and histograms folded into the
+   `__retired__` field of the same hash, entry dropped) only on a clean
+   shutdown or once its process is confirmed gone (same host, pid no
+   longer exists). A worker that is merely slow is never retired: its
+   next cumulative push would then be counted on top of the fold
+
+Counters must never go down while the server runs: a merged total that
+drops when a worker exits would look like a reset to Prometheus, and
+rate()/increase() would count the survivors' totals again. The retired
+field has no TTL, so totals also survive worker restarts.
+"""
+
+import asyncio
+import os
+import socket
+import time
+import uuid
+
+from app.core.config import get_settings
+from app.core.logging.route_logger import get_route_logger
+from app.core.metrics.registry import cumulative_only, merge_snapshots, registry, render_prometheus
+from app.core.redis.redis_config import AsyncRedisClient, redis_client
+
+logger = get_route_logger("metrics.publisher")
+
+METRICS_HASH_KEY = "metrics:workers"
+# Folded counters/histograms of exited workers (same hash: one HGETALL
+# reads a consistent view of live and retired series)
+RETIRED_FIELD = "__retired__"
+# Serializes folds so no worker is counted into the totals twice
+RETIRE_LOCK_KEY = "metrics:retire"
+RETIRE_LOCK_TTL_MS = 5_000
+
+_HOSTNAME = socket.gethostname()
+
+
+def _process_gone(worker_id: str) -> bool:
+    """
+    True only if `worker_id` ("<host>:<pid>-<suffix>") ran on this host
+    and its pid no longer exists. Other hosts can't be checked -> False.
+    """
+    host, sep, rest = worker_id.rpartition(":")
+    if not sep or host != _HOSTNAME:
+        return False
+    try:
+        pid = int(rest.split("-", 1)[0])
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except (ValueError, PermissionError, OSError):
+        # Unparsable id, or the pid exists under another user
+        return False
+    return False
+
+
+class MetricsPublisher:
+    def __init__(self, redis: AsyncRedisClient):
+        settings = get_settings()
+        self.redis = redis
+        self.push_interval = settings.METRICS_PUSH_INTERVAL
+        self.worker_ttl = settings.METRICS_WORKER_TTL
+        self.worker_id = f"{_HOSTNAME}:{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._task: asyncio.Task | None = None
+        self._retired = False
+
+    async def push(self) -> None:
+        # Once folded into the totals, pushing again would double count
+        if self._retired:
+            return
+        await self.redis.hash_set_json(
+            METRICS_HASH_KEY,
+            self.worker_id,
+            {"ts": time.time(), "metrics": registry.snapshot()},
+        )
+
+    async def _retire(self, worker_ids: list[str]) -> bool:
+        """
+        Fold the counters/histograms of `worker_ids` into the retired
+        totals and drop their entries (one MULTI, from a fresh read under
+        the lock). False if another worker is folding right now; the
+        entries are then picked up by a later scrape.
+        """
+        token = await self.redis.acquire_lock(RETIRE_LOCK_KEY, RETIRE_LOCK_TTL_MS)
+        if token is None:
+            return False
+        try:
+            entries = await self.redis.hash_get_all_json(METRICS_HASH_KEY)
+            retiring = [worker_id for worker_id in worker_ids if worker_id in entries]
+            if not retiring:
+                return True
+
+            totals = merge_snapshots([
+                entries.get(RETIRED_FIELD, {}),
+                *(cumulative_only(entries[worker_id]["metrics"]) for worker_id in retiring),
+            ])
+            async with self.redis.pipeline(transaction=True) as batch:
+                batch.hash_set_json(METRICS_HASH_KEY, RETIRED_FIELD, totals)
+                batch.hash_delete(METRICS_HASH_KEY, *retiring)
+            return True
+        finally:
+            await self.redis.release_lock(RETIRE_LOCK_KEY, token)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.push_interval)
+            try:
+                await self.push()
+            except Exception as exc:
+                # Scrapes still see this worker's last pushed snapshot
+                logger.warning("Metrics push failed: %s", exc)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        try:
+            # Final counts first; if the fold is busy, the entry stays
+            # (counted from its last snapshot) until a scrape on this host
+            # sees the pid gone and retires it
+            await self.push()
+            self._retired = await self._retire([self.worker_id])
+        except Exception as exc:
+            logger.warning("Could not retire worker metrics: %s", exc)
+
+    async def collect(self) -> str:
+        """
+        Prometheus text for all live workers plus the retired totals.
+        Falls back to this worker alone if Redis is unavailable.
+        """
+        local = registry.snapshot()
+        try:
+            await self.push()
+            workers = await self.redis.hash_get_all_json(METRICS_HASH_KEY)
+        except Exception as exc:
+            logger.warning("Metrics aggregation failed, serving local only: %s", exc)
+            return render_prometheus(local)
+
+        cutoff = time.time() - self.worker_ttl
+        snapshots, dead = [local], []
+        for worker_id, entry in workers.items():
+            if worker_id == self.worker_id:
+                continue
+            if worker_id == RETIRED_FIELD:
+                snapshots.append(entry)
+            elif entry.get("ts", 0) < cutoff:
+                # Silent: gauges dropped, counters kept until confirmed dead
+                snapshots.append(cumulative_only(entry["metrics"]))
+                if _process_gone(worker_id):
+                    dead.append(worker_id)
+            else:
+                snapshots.append(entry["metrics"])
+
+        if dead:
+            try:
+                await self._retire(dead)
+            except Exception as exc:
+                logger.warning("Could not retire dead worker metrics: %s", exc)
+
+        return render_prometheus(merge_snapshots(snapshots))
+
+
+metrics_publisher = MetricsPublisher(redis_client)
@@ -0,0 +1,231 @@
+"""
+Metrics Registry
+----------------
+
+Minimal in-process Prometheus-style metrics:
+
+✅ Counter / Gauge / Histogram with labels
+✅ snapshot(): plain dict (codec-friendly) of every series
+✅ merge_snapshots(): sum snapshots from several workers
+✅ cumulative_only(): drop gauges (what outlives an exited worker)
+✅ render_prometheus(): text exposition format (v0.0.4)
+
+Each uvicorn worker records into its own registry (one event loop per
+process, so no locks); cross-worker aggregation happens on snapshots,
+see publisher.py.
+"""
+
+from bisect import bisect_left
+
+# Label values are joined into one string key (snapshots go through the codec)
+_LABEL_SEP = "\x1f"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._series: dict[str, object] = {}
+
+    @staticmethod
+    def _key(label_values: tuple) -> str:
+        return _LABEL_SEP.join(str(value) for value in label_values)
+
+    def snapshot(self) -> dict:
+        return {
+            "type": self.type,
+            "help": self.help,
+            "labels": list(self.labels),
+            "samples": {key: self._sample(value) for key, value in self._series.items()},
+        }
+
+    def _sample(self, value):
+        return value
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, *label_values, amount: float = 1.0) -> None:
+        key = self._key(label_values)
+        self._series[key] = self._series.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def inc(self, *label_values, amount: float = 1.0) -> None:
+        key = self._key(label_values)
+        self._series[key] = self._series.get(key, 0.0) + amount
+
+    def dec(self, *label_values, amount: float = 1.0) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, *label_values, value: float) -> None:
+        self._series[self._key(label_values)] = value
+
+
+class Histogram(_Metric):
+    """
+    Series layout: [count per bucket..., count above last bucket, sum].
+    Bucket counts are stored non-cumulative and cumulated on render.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *label_values) -> None:
+        key = self._key(label_values)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def snapshot(self) -> dict:
+        return {**super().snapshot(), "buckets": list(self.buckets)}
+
+    def _sample(self, value):
+        return list(value)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def snapshot(self) -> dict:
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+
+# === Aggregation / exposition ===
+def merge_snapshots(snapshots: list[dict]) -> dict:
+    """
+    Sum series across worker snapshots (counters, histograms, and gauges
+    such as in-flight requests are all additive).
+    """
+    merged: dict = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.get(name)
+            if target is None:
+                merged[name] = {**metric, "samples": dict(metric["samples"])}
+                continue
+            samples = target["samples"]
+            for key, value in metric["samples"].items():
+                current = samples.get(key)
+                if current is None:
+                    samples[key] = value
+                elif isinstance(value, list):
+                    samples[key] = [a + b for a, b in zip(current, value)]
+                else:
+                    samples[key] = current + value
+    return merged
+
+
+def cumulative_only(snapshot: dict) -> dict:
+    """Counters and histograms of a snapshot; gauges die with their worker."""
+    return {name: metric for name, metric in snapshot.items() if metric["type"] != "gauge"}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: list[str], key: str, extra: str = "") -> str:
+    values = key.split(_LABEL_SEP) if names else []
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+_LE_INF = 'le="+Inf"'
+
+
+def render_prometheus(snapshot: dict) -> str:
+    lines = []
+    for name, metric in sorted(snapshot.items()):
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        names = metric["labels"]
+
+        for key, value in sorted(metric["samples"].items()):
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{_labels(names, key)} {_number(value)}")
+                continue
+
+            cumulative = 0
+            for bound, count in zip(metric["buckets"], value):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{name}_bucket{_labels(names, key, le)} {cumulative}")
+            cumulative += value[-2]
+            lines.append(f"{name}_bucket{_labels(names, key, _LE_INF)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, key)} {_number(value[-1])}")
+            lines.append(f"{name}_count{_labels(names, key)} {cumulative}")
+
+    return "\n".join(lines) + "\n"
+
+
+# === Application metrics ===
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until response start",
+    ("method", "route", "status"),
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    ("method",),
+)
+redis_command_duration = registry.histogram(
+    "redis_command_duration_seconds",
+    "Redis command / pipeline round-trip time",
+    ("command",),
+    buckets=FAST_BUCKETS,
+)
+cache_lookups = registry.counter(
+    "cache_lookups_total",
+    "JSON cache lookups per tier (l1 = in-process, l2 = Redis)",
+    ("tier", "result"),
+)
+log_records_dropped = registry.counter(
+    "log_records_dropped_total",
+    "Log records dropped because the log queue was full",
+)
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds",
+    "PostgreSQL statement execution time",
+    ("operation",),
+    buckets=FAST_BUCKETS,
+)
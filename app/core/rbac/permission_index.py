@@ -0,0 +1,160 @@
+"""
+RBAC Permission Index
+---------------------
+
+Compiles the roles / permissions / role_permissions tables into:
+
+✅ permission name → bit
+✅ role name → permission mask
+
+A user's effective permissions become one integer (OR of their role
+masks), so a permission check is a single AND.
+
+The compiled index is shared through Redis (`rbac:index`) and mirrored
+in each process. Its `version` is a content hash: any RBAC change yields
+a new version, which invalidates every stored user mask.
+"""
+
+import hashlib
+import json
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging.route_logger import get_route_logger
+from app.core.redis.redis_config import AsyncRedisClient
+from app.models.permissions import Permission
+from app.models.role_permissions import RolePermission
+from app.models.roles import Role
+
+logger = get_route_logger("rbac.index")
+
+RBAC_INDEX_KEY = "rbac:index"
+
+# Upper bound on how long a direct DB edit (e.g. the seeder) can go unnoticed
+RBAC_INDEX_TTL = 600
+
+# Masks are stored as lists of 32-bit words: JSON encoders such as orjson
+# reject integers wider than 64 bits (i.e. more than 64 permissions)
+_WORD_BITS = 32
+_WORD_MASK = (1 << _WORD_BITS) - 1
+
+
+def encode_mask(mask: int) -> list[int]:
+    words = []
+    while mask:
+        words.append(mask & _WORD_MASK)
+        mask >>= _WORD_BITS
+    return words
+
+
+def decode_mask(words: list[int] | int) -> int:
+    if isinstance(words, int):
+        # Written before masks were word-encoded
+        return words
+    mask = 0
+    for i, word in enumerate(words):
+        mask |= word << (i * _WORD_BITS)
+    return mask
+
+
+class PermissionIndex:
+    """
+    Immutable in-memory view of a compiled RBAC index.
+    """
+
+    def __init__(self, version: str, permissions: list[str], roles: dict[str, int]):
+        self.version = version
+        self.permissions = permissions
+        self.bits = {name: 1 << i for i, name in enumerate(permissions)}
+        self.role_masks = roles
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PermissionIndex":
+        roles = {name: decode_mask(words) for name, words in data["roles"].items()}
+        return cls(data["version"], data["permissions"], roles)
+
+    def bit(self, permission_name: str) -> int:
+        """Bit for a permission (0 when unknown → check always fails)."""
+        return self.bits.get(permission_name, 0)
+
+    def mask_for_roles(self, roles: list[str]) -> int:
+        mask = 0
+        for role in roles:
+            mask |= self.role_masks.get(role, 0)
+        return mask
+
+    def names(self, mask: int) -> list[str]:
+        return [name for name, bit in self.bits.items() if mask & bit]
+
+
+async def compile_permission_index(db: AsyncSession) -> dict:
+    """
+    Build the serializable index from PostgreSQL (two queries).
+    """
+    result = await db.execute(select(Permission.name).order_by(Permission.name))
+    permissions = list(result.scalars().all())
+    bits = {name: 1 << i for i, name in enumerate(permissions)}
+
+    result = await db.execute(
+        select(Role.name, Permission.name)
+        .select_from(Role)
+        .outerjoin(RolePermission, RolePermission.role_id == Role.id)
+        .outerjoin(Permission, Permission.id == RolePermission.permission_id)
+    )
+
+    roles: dict[str, int] = {}
+    for role_name, perm_name in result.all():
+        roles.setdefault(role_name, 0)
+        if perm_name is not None:
+            roles[role_name] |= bits[perm_name]
+
+    digest = hashlib.sha1(
+        json.dumps([permissions, sorted(roles.items())]).encode()
+    ).hexdigest()[:16]
+
+    return {
+        "version": digest,
+        "permissions": permissions,
+        "roles": {name: encode_mask(mask) for name, mask in roles.items()},
+    }
+
+
+# Process-local mirror of the shared index
+_index: PermissionIndex | None = None
+
+
+async def get_permission_index(
+    redis: AsyncRedisClient,
+    db: AsyncSession,
+) -> PermissionIndex:
+    """
+    Return the current index: Redis (usually an L1 hit) first,
+    compiling from PostgreSQL only when it is missing.
+    """
+    global _index
+
+    data = await redis.get_json(RBAC_INDEX_KEY)
+
+    if data is None:
+        data = await compile_permission_index(db)
+        await redis.set_json(RBAC_INDEX_KEY, data, ex=RBAC_INDEX_TTL)
+        logger.info("RBAC index compiled | version=%s", data["version"])
+
+    if _index is None or _index.version != data["version"]:
+        _index = PermissionIndex.from_dict(data)
+
+    return _index
+
+
+async def reload_permission_index(
+    redis: AsyncRedisClient,
+    db: AsyncSession,
+) -> PermissionIndex:
+    """
+    Recompile after an RBAC change (roles, permissions or their mapping),
+    e.g. from the RBAC seeder. The delete evicts every worker's L1 copy,
+    so all workers pick up the new version on their next check.
+    """
+    await redis.delete(RBAC_INDEX_KEY)
+    return await get_permission_index(redis, db)
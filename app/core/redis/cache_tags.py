@@ -0,0 +1,53 @@
+"""
+Cache Tags
+----------
+
+Tag-based invalidation for HMAC'd cache keys.
+
+Key names are hashed, so pattern deletes (KEYS/SCAN + match) cannot
+work. Instead every cached entry can be registered under one or more
+tags (e.g. `session:{id}:message-items`). A tag is a Redis SET holding the
+HMAC'd member keys; invalidating it deletes exactly those members,
+O(members), with no keyspace scan.
+
+Paginated collections use generation counters instead
+(`AsyncRedisClient.bump_generation`); tags suit sets of individually
+cached items.
+
+Used through:
+- `RedisBatch.tag(tags, *keys, ex=...)`
+- `AsyncRedisClient.invalidate_tags(*tags)`
+"""
+
+# Add members, and only ever extend the tag's TTL so it outlives every member.
+# KEYS[1] = tag set, ARGV[1] = ttl (seconds), ARGV[2..] = member keys
+TAG_ADD_SCRIPT = """
+redis.call("SADD", KEYS[1], unpack(ARGV, 2))
+-- TTL is -1 (no expiry yet) right after the first SADD
+if redis.call("TTL", KEYS[1]) < tonumber(ARGV[1]) then
+    redis.call("EXPIRE", KEYS[1], ARGV[1])
+end
+return 1
+"""
+
+# Delete every member of every tag, then the tags themselves.
+# Returns the deleted member keys (used for L1 invalidation).
+TAG_INVALIDATE_SCRIPT = """
+local deleted = {}
+for _, tag in ipairs(KEYS) do
+    local members = redis.call("SMEMBERS", tag)
+    for i = 1, #members, 500 do
+        redis.call("DEL", unpack(members, i, math.min(i + 499, #members)))
+    end
+    for _, member in ipairs(members) do
+        deleted[#deleted + 1] = member
+    end
+    redis.call("DEL", tag)
+end
+return deleted
+"""
+
+
+def tag_key(tag: str) -> str:
+    """Plain (pre-HMAC) key of the set backing a tag."""
+    return f"tag:{tag}"
@@ -0,0 +1,147 @@
+"""
+Cache Codec
+-----------
+
+Binary serialization for cached payloads.
+
+Wire format: 1 header byte + body.
+
+    0x01 json            0x02 msgpack
+    0x03 json + zlib     0x04 msgpack + zlib
+    0x05 json + zstd     0x06 msgpack + zstd
+
+- JSON uses orjson when installed (same bytes on the wire as stdlib json)
+- Bodies larger than the threshold are compressed (zstd when installed,
+  zlib otherwise)
+- No header byte can start a JSON document, so entries written before
+  this codec (plain JSON text) still decode
+"""
+
+import json
+import zlib
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional backend
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional backend
+    zstandard = None
+
+
+JSON = "json"
+MSGPACK = "msgpack"
+ZLIB = "zlib"
+ZSTD = "zstd"
+
+_HEADERS = {
+    (JSON, None): 0x01,
+    (MSGPACK, None): 0x02,
+    (JSON, ZLIB): 0x03,
+    (MSGPACK, ZLIB): 0x04,
+    (JSON, ZSTD): 0x05,
+    (MSGPACK, ZSTD): 0x06,
+}
+_FORMATS = {header: fmt for fmt, header in _HEADERS.items()}
+
+
+def _dumps_json(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def _loads_json(body: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+class CacheCodec:
+    """
+    Encodes values to tagged bytes and back.
+
+    Unavailable optional backends fall back silently:
+    msgpack → json, zstd → zlib.
+    """
+
+    def __init__(
+        self,
+        serializer: str = JSON,
+        compression: str = ZSTD,
+        threshold: int = 1024,
+        level: int = 3,
+    ):
+        if serializer == MSGPACK and msgpack is None:
+            serializer = JSON
+        if compression == ZSTD and zstandard is None:
+            compression = ZLIB
+
+        self.serializer = serializer
+        self.compression = compression
+        self.threshold = threshold
+        self.level = level
+
+        self._zstd_c = zstandard.ZstdCompressor(level=level) if zstandard else None
+        self._zstd_d = zstandard.ZstdDecompressor() if zstandard else None
+
+    # === Encoding ===
+    def encode(self, value: Any) -> bytes:
+        """Raises TypeError/ValueError for unserializable values."""
+        if self.serializer == MSGPACK:
+            body = msgpack.packb(value, use_bin_type=True)
+        else:
+            body = _dumps_json(value)
+
+        compression = None
+        if len(body) > self.threshold:
+            compression = self.compression
+            body = self._compress(body, compression)
+
+        return bytes((_HEADERS[(self.serializer, compression)],)) + body
+
+    def _compress(self, body: bytes, compression: str) -> bytes:
+        if compression == ZSTD:
+            return self._zstd_c.compress(body)
+        return zlib.compress(body, self.level)
+
+    # === Decoding ===
+    def decode(self, raw: bytes | str) -> Any:
+        """Raises ValueError for undecodable payloads."""
+        if isinstance(raw, str):
+            raw = raw.encode()
+
+        fmt = _FORMATS.get(raw[0]) if raw else None
+        if fmt is None:
+            # Legacy entry: plain JSON text
+            return _loads_json(raw)
+
+        serializer, compression = fmt
+        body = raw[1:]
+
+        if compression == ZSTD and self._zstd_d is None:
+            raise ValueError("zstd payload but zstandard is not installed")
+        if serializer == MSGPACK and msgpack is None:
+            raise ValueError("msgpack payload but msgpack is not installed")
+
+        try:
+            if compression == ZSTD:
+                body = self._zstd_d.decompress(body)
+            elif compression == ZLIB:
+                body = zlib.decompress(body)
+
+            if serializer == MSGPACK:
+                return msgpack.unpackb(body, raw=False)
+            return _loads_json(body)
+        except ValueError:
+            raise
+        except Exception as exc:
+            raise ValueError(f"Corrupt cache payload: {exc}") from exc
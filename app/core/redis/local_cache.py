@@ -0,0 +1,71 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+# ✅ Per-process L1 cache (sits in front of Redis)
+class LocalTTLCache:
+    """
+    Size-bounded in-process LRU cache with per-entry TTL.
+
+    - Keys are the plain (pre-HMAC) cache keys, so a hit costs no hashing
+    - Each entry also remembers its HMAC key, so invalidations broadcast
+      over Redis pub/sub (which only carry HMAC keys) can evict it
+    - Values are shared objects: callers must treat them as read-only
+    - Not thread-safe; intended for a single asyncio event loop
+    """
+
+    def __init__(self, max_items: int = 10_000, ttl: float = 5.0):
+        self.max_items = max_items
+        self.ttl = ttl
+        # key -> (expires_at, hkey, value)
+        self._entries: OrderedDict[str, tuple[float, str, Any]] = OrderedDict()
+        self._aliases: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Returns (found, value)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+
+        expires_at, hkey, value = entry
+        if expires_at <= time.monotonic():
+            self._evict(key, hkey)
+            return False, None
+
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: str, hkey: str, value: Any, ex: int | None = None) -> None:
+        ttl = self.ttl if ex is None else min(self.ttl, ex)
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, hkey, value)
+        self._entries.move_to_end(key)
+        self._aliases[hkey] = key
+
+        while len(self._entries) > self.max_items:
+            old_key, (_, old_hkey, _) = self._entries.popitem(last=False)
+            self._aliases.pop(old_hkey, None)
+
+    def invalidate(self, key: str) -> None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._evict(key, entry[1])
+
+    def invalidate_hkey(self, hkey: str) -> None:
+        key = self._aliases.get(hkey)
+        if key is not None:
+            self._evict(key, hkey)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._aliases.clear()
+
+    def _evict(self, key: str, hkey: str) -> None:
+        self._entries.pop(key, None)
+        self._aliases.pop(hkey, None)
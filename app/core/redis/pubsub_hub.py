@@ -0,0 +1,136 @@
+"""
+Pub/Sub Hub
+-----------
+
+Per-worker fan-out of Redis pub/sub events to local listeners
+(WebSocket connections).
+
+- One Redis pub/sub connection per worker, however many sockets
+- A channel is subscribed on its first local listener and
+  unsubscribed when the last one leaves
+- Each listener gets a bounded queue; a slow client drops its oldest
+  events instead of stalling the others
+
+Publishers use `redis.publish_json(channel, event)` or
+`batch.publish_json(...)` inside a pipeline.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from .redis_config import AsyncRedisClient, redis_client
+
+logger = logging.getLogger(__name__)
+
+LISTENER_QUEUE_SIZE = 100
+
+
+def session_channel(session_id) -> str:
+    """Channel carrying message events for one chat session."""
+    return f"session:{session_id}:events"
+
+
+class PubSubHub:
+    def __init__(self, redis: AsyncRedisClient, queue_size: int = LISTENER_QUEUE_SIZE):
+        self._redis = redis
+        self._queue_size = queue_size
+        self._pubsub = None
+        self._reader: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        # wire channel -> local listener queues
+        self._listeners: dict[str, set[asyncio.Queue]] = {}
+
+    @asynccontextmanager
+    async def listen(self, channel: str) -> AsyncIterator[asyncio.Queue]:
+        """
+        Subscribe for the duration of the block; events arrive on the queue.
+
+            async with hub.listen(session_channel(sid)) as queue:
+                event = await queue.get()
+        """
+        wire_channel = self._redis.channel_name(channel)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+
+        async with self._lock:
+            if self._pubsub is None:
+                self._pubsub = await self._redis.pubsub()
+
+            listeners = self._listeners.setdefault(wire_channel, set())
+            if not listeners:
+                await self._pubsub.subscribe(wire_channel)
+            listeners.add(queue)
+
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read_loop())
+
+        try:
+            yield queue
+        finally:
+            async with self._lock:
+                listeners = self._listeners.get(wire_channel)
+                if listeners is not None:
+                    listeners.discard(queue)
+                    if not listeners:
+                        del self._listeners[wire_channel]
+                        try:
+                            await self._pubsub.unsubscribe(wire_channel)
+                        except Exception:
+                            logger.warning("Pub/sub unsubscribe failed", exc_info=True)
+
+    async def _read_loop(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Pub/sub read failed; retrying")
+                await asyncio.sleep(1.0)
+                continue
+
+            if message is None or message.get("type") != "message":
+                if not self._listeners:
+                    # Idle worker: nothing subscribed
+                    await asyncio.sleep(1.0)
+                continue
+
+            channel = message["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+
+            event = self._redis.decode_event(message["data"])
+            if event is not None:
+                self._dispatch(channel, event)
+
+    def _dispatch(self, wire_channel: str, event: Any) -> None:
+        for queue in tuple(self._listeners.get(wire_channel, ())):
+            if queue.full():
+                # Slow consumer: drop its oldest event
+                queue.get_nowait()
+                logger.warning("Pub/sub listener lagging; event dropped")
+            queue.put_nowait(event)
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.close()
+            except Exception:
+                pass
+            self._pubsub = None
+
+        self._listeners.clear()
+
+
+pubsub_hub = PubSubHub(redis_client)
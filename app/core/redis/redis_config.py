@@ -1,12 +1,47 @@
 import aioredis
-import json
+import asyncio
 import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
 from app.core.config import get_settings
+from app.core.metrics.registry import cache_lookups, redis_command_duration
 from .hmac_security import hmac_key
-from typing import AsyncGenerator
+from .local_cache import LocalTTLCache
+from .cache_tags import TAG_ADD_SCRIPT, TAG_INVALIDATE_SCRIPT, tag_key
+from .codec import CacheCodec
+from typing import Any, AsyncGenerator, AsyncIterator
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Generation keys must outlive every page cached under them; a missing
+# key reads as generation 0, which is safe once older pages have expired.
+GENERATION_TTL = 86400
+
+
+def generation_key(namespace: str) -> str:
+    return f"gen:{namespace}"
+
+
+# Write only if the namespace generation is still the one the caller read
+_SET_IF_GENERATION_SCRIPT = """
+local current = redis.call("get", KEYS[2]) or "0"
+if current ~= ARGV[1] then
+    return 0
+end
+redis.call("set", KEYS[1], ARGV[2], "EX", ARGV[3])
+return 1
+"""
+
+
+# Compare-and-delete: only the lock owner may release it
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
 
 # Configuring central redis client
 class AsyncRedisClient:
@@ -17,11 +52,34 @@ class AsyncRedisClient:
     - TTL support
     - Dependency integration
     - Graceful connection/closure
+    - Optional per-process L1 cache for JSON reads, kept coherent
+      across workers via a pub/sub invalidation channel
+    - Per-tier hit/miss counts exported as cache_lookups_total (/metrics)
+    - Binary codec for cached values (see codec.py); responses are
+      bytes (decode_responses=False)
     """
 
     def __init__(self):
         self._client: aioredis.Redis | None = None
         self._url = settings.REDIS_URL
+        self._codec = CacheCodec(
+            serializer=settings.REDIS_CODEC,
+            compression=settings.REDIS_COMPRESSION,
+            threshold=settings.REDIS_COMPRESSION_THRESHOLD,
+        )
+
+        # L1 (in-process) tier
+        self._l1: LocalTTLCache | None = (
+            LocalTTLCache(
+                max_items=settings.REDIS_L1_MAX_ITEMS,
+                ttl=settings.REDIS_L1_TTL_SECONDS,
+            )
+            if settings.REDIS_L1_ENABLED
+            else None
+        )
+        self._instance_id = uuid.uuid4().hex
+        self._invalidation_channel = settings.REDIS_L1_INVALIDATION_CHANNEL
+        self._invalidation_task: asyncio.Task | None = None
 
     # === Initializing redis connection ===
     async def connect(self) -> None:
@@ -31,48 +89,159 @@ class AsyncRedisClient:
         try:
             self._client = aioredis.from_url(
                 self._url,
-                encoding="utf-8",
-                decode_responses=True,
+                decode_responses=False,
                 socket_connect_timeout=5,
                 socket_timeout=5,
                 retry_on_timeout=True,
                 health_check_interval=30,
             )
+            self._instrument()
             await self._client.ping()
             logger.info("⚡️ Redis connected successfully")
         except Exception as e:
             logger.critical(f"🚫 Failed to connect to Redis: {e}")
             raise
 
+        if self._l1 is not None:
+            self._invalidation_task = asyncio.create_task(
+                self._listen_invalidations()
+            )
+
     # === Closing redis connection ===
     async def close(self) -> None:
+        if self._invalidation_task:
+            self._invalidation_task.cancel()
+            try:
+                await self._invalidation_task
+            except asyncio.CancelledError:
+                pass
+            self._invalidation_task = None
+
+        if self._l1 is not None:
+            self._l1.clear()
+
         if self._client:
             await self._client.close()
             logger.info("Redis connection closed")
             self._client = None
 
+    def _instrument(self) -> None:
+        """
+        Time every command (redis_command_duration_seconds).
+        All non-pipelined commands, eval/publish included, go through
+        execute_command; RedisBatch times its own round-trip.
+        """
+        execute_command = self._client.execute_command
+
+        async def timed_execute_command(*args, **options):
+            start = time.perf_counter()
+            try:
+                return await execute_command(*args, **options)
+            finally:
+                redis_command_duration.observe(
+                    time.perf_counter() - start, str(args[0]).upper()
+                )
+
+        self._client.execute_command = timed_execute_command
+
     # Applying HMAC security to prevent key injection/collision
     def _hkey(self, key: str) -> str:
         return hmac_key(key)
 
-    # Retrieving value by key with HMAC
+    # === L1 invalidation (cross-worker) ===
+    async def _listen_invalidations(self) -> None:
+        """
+        Evicts L1 entries when another worker writes/deletes a key.
+        Messages carry only HMAC keys, so real key names never leave the process.
+        """
+        pubsub = self._client.pubsub()
+        await pubsub.subscribe(self._invalidation_channel)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                sender, _, hkeys = message["data"].decode().partition(":")
+                if sender != self._instance_id:
+                    for hkey in hkeys.split(","):
+                        self._l1.invalidate_hkey(hkey)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Without invalidations the L1 could serve stale data past a write
+            logger.exception("L1 invalidation listener failed; disabling L1")
+            self._l1.clear()
+            self._l1 = None
+        finally:
+            try:
+                await pubsub.unsubscribe(self._invalidation_channel)
+                await pubsub.close()
+            except Exception:
+                pass
+
+    def _invalidation_message(self, keys: list[str], hkeys: list[str]) -> str | None:
+        """
+        Evict keys locally and build the pub/sub payload for the other
+        workers ("<sender>:<hkey>,<hkey>..."). None when L1 is disabled.
+        """
+        if self._l1 is None or not keys:
+            return None
+        for key in keys:
+            self._l1.invalidate(key)
+        return f"{self._instance_id}:{','.join(hkeys)}"
+
+    async def _write_and_invalidate(self, key: str, command: str, *args, **kwargs):
+        """
+        Run a single-key write; with L1 enabled, the invalidation PUBLISH
+        rides in the same pipeline (one round-trip, not two).
+        """
+        hkey = self._hkey(key)
+        message = self._invalidation_message([key], [hkey])
+        if message is None:
+            return await getattr(self._client, command)(hkey, *args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                getattr(pipe, command)(hkey, *args, **kwargs)
+                pipe.publish(self._invalidation_channel, message)
+                result, _ = await pipe.execute()
+        finally:
+            redis_command_duration.observe(time.perf_counter() - start, "PIPELINE")
+        return result
+
+    def _decode(self, key: str, raw: bytes):
+        """Returns (ok, value); logs and reports undecodable payloads."""
+        try:
+            return True, self._codec.decode(raw)
+        except ValueError:
+            logger.exception("Failed to decode cached value for key %s", key)
+            return False, None
+
+    def _encode(self, value: Any) -> bytes:
+        try:
+            return self._codec.encode(value)
+        except (TypeError, ValueError) as exc:
+            logger.exception(
+                "Value for set_json is not serializable: %s", exc)
+            raise
+
+    # Retrieving raw value (bytes) by key with HMAC
     async def get_data(self, key: str):
         if not self._client:
             await self.connect()
         return await self._client.get(self._hkey(key))
 
     # Setting/ storing data in  key -> value with an optionl expiration
-    async def set_data(self, key: str, value: str, ex: int | None = None):
+    async def set_data(self, key: str, value: str | bytes, ex: int | None = None):
         if not self._client:
             await self.connect()
-        hkey = self._hkey(key)
-        return await self._client.set(hkey, value, ex=ex)
+        return await self._write_and_invalidate(key, "set", value, ex=ex)
 
     # Deleting key
     async def delete(self, key: str):
         if not self._client:
             await self.connect()
-        return await self._client.delete(self._hkey(key))
+        return await self._write_and_invalidate(key, "delete")
 
     # Checking of key exists
     async def exists(self, key: str) -> bool:
@@ -80,27 +249,374 @@ class AsyncRedisClient:
             await self.connect()
         return await self._client.exists(self._hkey(key)) == 1
 
-    # === Utility: JSON Helpers ===
+    # === Short-lived distributed locks ===
+    async def acquire_lock(self, key: str, ttl_ms: int) -> str | None:
+        """
+        Try to take `lock:{key}` (SET NX PX). Returns an owner token or None.
+        """
+        if not self._client:
+            await self.connect()
+        token = uuid.uuid4().hex
+        acquired = await self._client.set(
+            self._hkey(f"lock:{key}"), token, nx=True, px=ttl_ms
+        )
+        return token if acquired else None
+
+    async def release_lock(self, key: str, token: str) -> None:
+        if not self._client:
+            await self.connect()
+        await self._client.eval(
+            _RELEASE_LOCK_SCRIPT, 1, self._hkey(f"lock:{key}"), token
+        )
+
+    # === Tag-based invalidation (see cache_tags.py) ===
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        Delete every key registered under the given tags (one round-trip,
+        O(members)). Returns the number of member keys removed.
+        """
+        if not tags:
+            return 0
+        if not self._client:
+            await self.connect()
+
+        tag_hkeys = [self._hkey(tag_key(tag)) for tag in tags]
+        deleted = await self._client.eval(
+            TAG_INVALIDATE_SCRIPT, len(tag_hkeys), *tag_hkeys
+        )
+
+        deleted = [hkey.decode() for hkey in deleted or []]
+
+        if deleted and self._l1 is not None:
+            for hkey in deleted:
+                self._l1.invalidate_hkey(hkey)
+            await self._client.publish(
+                self._invalidation_channel,
+                f"{self._instance_id}:{','.join(deleted)}",
+            )
+
+        return len(deleted)
+
+    # === Generation counters (versioned namespaces) ===
+    async def get_generation(self, namespace: str) -> int:
+        """
+        Current generation of a namespace (0 if never bumped).
+        Always read from Redis (never L1): a stale generation would
+        serve pages cached before the latest write.
+        """
+        value = await self.get_data(generation_key(namespace))
+        return int(value or 0)
+
+    async def bump_generation(self, *namespaces: str) -> None:
+        """
+        Atomically advance namespaces (INCR) in one round-trip.
+        Keys built from an older generation are never read again and
+        simply age out by TTL: O(1) invalidation, no scans.
+        """
+        async with self.pipeline() as batch:
+            for namespace in namespaces:
+                batch.bump_generation(namespace)
+
+    async def set_json_if_generation(
+        self,
+        key: str,
+        value: Any,
+        *,
+        namespace: str,
+        generation: int,
+        ex: int,
+    ) -> bool:
+        """
+        Cache `value` unless `namespace` was bumped since the caller read
+        `generation` (atomic). Guards read-from-DB-then-cache against an
+        invalidation landing in between. Returns whether it was written.
+        """
+        if not self._client:
+            await self.connect()
+        written = await self._client.eval(
+            _SET_IF_GENERATION_SCRIPT,
+            2,
+            self._hkey(key),
+            self._hkey(generation_key(namespace)),
+            str(generation),
+            self._encode(value),
+            ex,
+        )
+        if written and self._l1 is not None:
+            self._l1.set(key, self._hkey(key), value, ex=ex)
+        return bool(written)
+
+    # === Lua scripts on HMAC'd keys ===
+    async def eval_script(self, script: str, keys: list[str], *args):
+        """Run a Lua script; `keys` are plain names (HMAC'd here)."""
+        if not self._client:
+            await self.connect()
+        hkeys = [self._hkey(key) for key in keys]
+        return await self._client.eval(script, len(hkeys), *hkeys, *args)
+
+    # === Pub/Sub (event fan-out, see pubsub_hub.py) ===
+    def channel_name(self, channel: str) -> str:
+        """HMAC'd channel name, so ids never appear on the wire."""
+        return self._hkey(f"channel:{channel}")
+
+    async def publish_json(self, channel: str, payload: Any) -> int:
+        """Publish a codec-encoded event. Returns the number of receivers."""
+        if not self._client:
+            await self.connect()
+        return await self._client.publish(
+            self.channel_name(channel), self._encode(payload)
+        )
+
+    def decode_event(self, raw: bytes):
+        """Decode a payload sent by publish_json (None if corrupt)."""
+        ok, value = self._decode("pubsub", raw)
+        return value if ok else None
+
+    async def pubsub(self):
+        """Dedicated pub/sub connection (caller closes it)."""
+        if not self._client:
+            await self.connect()
+        return self._client.pubsub()
+
+    # === Hashes (codec-encoded field values) ===
+    async def hash_set_json(self, key: str, field: str, value: Any, ex: int | None = None) -> None:
+        if not self._client:
+            await self.connect()
+        hkey = self._hkey(key)
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.hset(hkey, field, self._encode(value))
+            if ex is not None:
+                pipe.expire(hkey, ex)
+            await pipe.execute()
+
+    async def hash_get_all_json(self, key: str) -> dict[str, Any]:
+        """Decoded field → value map; undecodable fields are skipped."""
+        if not self._client:
+            await self.connect()
+        raw = await self._client.hgetall(self._hkey(key))
+        result = {}
+        for field, body in raw.items():
+            ok, value = self._decode(key, body)
+            if ok:
+                result[field.decode()] = value
+        return result
+
+    async def hash_delete(self, key: str, *fields: str) -> int:
+        if not fields:
+            return 0
+        if not self._client:
+            await self.connect()
+        return await self._client.hdel(self._hkey(key), *fields)
+
+    # === Batched operations (one round-trip) ===
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator["RedisBatch"]:
+        """
+        Queue several writes and send them in one round-trip on exit.
+
+            async with redis.pipeline() as batch:
+                batch.set_json("a", {...}, ex=60)
+                batch.delete("b")
+
+        `transaction=True` wraps the batch in MULTI/EXEC.
+        Nothing is sent if the block raises.
+        """
+        if not self._client:
+            await self.connect()
+
+        batch = RedisBatch(self, self._client.pipeline(transaction=transaction))
+        yield batch
+        await batch.execute()
+
+    async def mget_json(self, keys: list[str]) -> list[Any]:
+        """
+        Fetch many JSON values: L1 first, then a single MGET for the rest.
+        Missing keys come back as None (same order as `keys`).
+        """
+        results: list[Any] = [None] * len(keys)
+        pending: list[int] = []
+
+        for i, key in enumerate(keys):
+            if self._l1 is not None:
+                found, value = self._l1.get(key)
+                if found:
+                    cache_lookups.inc("l1", "hit")
+                    results[i] = value
+                    continue
+                cache_lookups.inc("l1", "miss")
+            pending.append(i)
+
+        if not pending:
+            return results
+
+        if not self._client:
+            await self.connect()
+
+        hkeys = [self._hkey(keys[i]) for i in pending]
+        raws = await self._client.mget(hkeys)
+
+        for i, hkey, raw in zip(pending, hkeys, raws):
+            if not raw:
+                cache_lookups.inc("l2", "miss")
+                continue
+            cache_lookups.inc("l2", "hit")
+            ok, value = self._decode(keys[i], raw)
+            if not ok:
+                continue
+            results[i] = value
+            if self._l1 is not None:
+                self._l1.set(keys[i], hkey, value)
+
+        return results
+
+    async def mset_json(self, mapping: dict[str, Any], ex: int | None = None):
+        """Store many JSON values (with a shared TTL) in one round-trip."""
+        async with self.pipeline() as batch:
+            for key, value in mapping.items():
+                batch.set_json(key, value, ex=ex)
+
+    # === Utility: JSON Helpers (values go through the cache codec) ===
     async def get_json(self, key: str):
-        """Retrieve value and parse JSON. Returns None if missing."""
-        raw = await self.get_data(key)
+        """
+        Retrieve and decode a value. Returns None if missing.
+        Served from the L1 cache when possible (treat result as read-only).
+        """
+        if self._l1 is not None:
+            found, value = self._l1.get(key)
+            if found:
+                cache_lookups.inc("l1", "hit")
+                return value
+            cache_lookups.inc("l1", "miss")
+
+        if not self._client:
+            await self.connect()
+        hkey = self._hkey(key)
+        raw = await self._client.get(hkey)
         if not raw:
+            cache_lookups.inc("l2", "miss")
             return None
-        try:
-            return json.loads(raw)
-        except json.JSONDecodeError:
-            logger.exception("Failed to decode JSON for key %s", key)
+        cache_lookups.inc("l2", "hit")
+        ok, value = self._decode(key, raw)
+        if not ok:
             return None
 
+        if self._l1 is not None:
+            self._l1.set(key, hkey, value)
+        return value
+
     async def set_json(self, key: str, value: dict, ex: int | None = None):
-        """Serialize value to JSON and store it."""
+        """Encode a JSON-compatible value and store it."""
+        payload = self._encode(value)
+        result = await self.set_data(key, payload, ex=ex)
+        if self._l1 is not None:
+            self._l1.set(key, self._hkey(key), value, ex=ex)
+        return result
+
+
+class RedisBatch:
+    """
+    Write batch bound to an AsyncRedisClient pipeline.
+
+    Methods only queue commands (no await); keys are HMAC'd as they are
+    queued. On execute, one invalidation message covering every touched
+    key rides in the same round-trip, and the local L1 is updated.
+    """
+
+    def __init__(self, client: AsyncRedisClient, pipe):
+        self._client = client
+        self._pipe = pipe
+        self._touched: list[tuple[str, str]] = []
+        self._l1_writes: list[tuple[str, str, Any, int | None]] = []
+
+    def set_data(self, key: str, value: str | bytes, ex: int | None = None) -> "RedisBatch":
+        hkey = self._client._hkey(key)
+        self._pipe.set(hkey, value, ex=ex)
+        self._touched.append((key, hkey))
+        return self
+
+    def set_json(self, key: str, value: Any, ex: int | None = None) -> "RedisBatch":
+        self.set_data(key, self._client._encode(value), ex=ex)
+        self._l1_writes.append((key, self._touched[-1][1], value, ex))
+        return self
+
+    def delete(self, *keys: str) -> "RedisBatch":
+        hkeys = [self._client._hkey(key) for key in keys]
+        if hkeys:
+            self._pipe.delete(*hkeys)
+            self._touched.extend(zip(keys, hkeys))
+        return self
+
+    def bump_generation(self, namespace: str) -> "RedisBatch":
+        """
+        INCR a generation counter. Generations are never held in L1
+        (see AsyncRedisClient.get_generation), so no invalidation is sent.
+        """
+        hkey = self._client._hkey(generation_key(namespace))
+        self._pipe.incr(hkey)
+        self._pipe.expire(hkey, GENERATION_TTL)
+        return self
+
+    def tag(self, tags: list[str], *keys: str, ex: int) -> "RedisBatch":
+        """
+        Register keys under tags; each tag lives at least `ex` seconds
+        (use the members' TTL).
+        """
+        hkeys = [self._client._hkey(key) for key in keys]
+        if not hkeys:
+            return self
+        for tag in tags:
+            self._pipe.eval(
+                TAG_ADD_SCRIPT, 1, self._client._hkey(tag_key(tag)), ex, *hkeys
+            )
+        return self
+
+    def eval_script(self, script: str, keys: list[str], *args) -> "RedisBatch":
+        """Queue a Lua script; `keys` are plain names (HMAC'd here)."""
+        hkeys = [self._client._hkey(key) for key in keys]
+        self._pipe.eval(script, len(hkeys), *hkeys, *args)
+        return self
+
+    def hash_set_json(self, key: str, field: str, value: Any) -> "RedisBatch":
+        """Hashes are never held in L1, so no invalidation is queued."""
+        self._pipe.hset(self._client._hkey(key), field, self._client._encode(value))
+        return self
+
+    def hash_delete(self, key: str, *fields: str) -> "RedisBatch":
+        if fields:
+            self._pipe.hdel(self._client._hkey(key), *fields)
+        return self
+
+    def publish_json(self, channel: str, payload: Any) -> "RedisBatch":
+        """Queue an event for AsyncRedisClient.publish_json subscribers."""
+        self._pipe.publish(
+            self._client.channel_name(channel), self._client._encode(payload)
+        )
+        return self
+
+    async def execute(self) -> list:
+        """Send the batch. Returns one result per queued command."""
+        message = None
+        if self._touched:
+            keys = [key for key, _ in self._touched]
+            hkeys = [hkey for _, hkey in self._touched]
+            message = self._client._invalidation_message(keys, hkeys)
+            if message is not None:
+                self._pipe.publish(self._client._invalidation_channel, message)
+
+        start = time.perf_counter()
         try:
-            payload = json.dumps(value)
-        except (TypeError, ValueError) as exc:
-            logger.exception(
-                "Value for set_json is not JSON serializable: %s", exc)
-            raise
-        return await self.set_data(key, payload, ex=ex)
+            results = await self._pipe.execute()
+        finally:
+            redis_command_duration.observe(time.perf_counter() - start, "PIPELINE")
+        if message is not None:
+            results = results[:-1]
+
+        l1 = self._client._l1
+        if l1 is not None:
+            for key, hkey, value, ex in self._l1_writes:
+                l1.set(key, hkey, value, ex=ex)
+
+        return results
 
 
 redis_client = AsyncRedisClient()
@@ -0,0 +1,74 @@
+"""
+Latency-to-first-token benchmark (offline)
+------------------------------------------
+
+Runs concurrent replies through FakeLLMProvider plus SSE framing and
+reports time-to-first-token and total stream time.
+
+    python -m app.core.scripts.bench_llm_ttft --streams 200 --first-token-ms 50 --token-ms 5
+
+No database, Redis or network is touched. Swap in another provider to
+measure real backends with the same harness.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.services.llm.pipeline import sse_event
+from app.services.llm.providers import FakeLLMProvider, LLMProvider
+
+PROMPT = [
+    {"role": "system", "content": "You are a helpful assistant."},
+    {"role": "user", "content": "How do I paginate a SQL query efficiently?"},
+]
+
+
+async def _one_stream(provider: LLMProvider) -> tuple[float, float, int]:
+    started = time.perf_counter()
+    ttft = None
+    tokens = 0
+    async for token in provider.stream(PROMPT, model="bench"):
+        # Same framing cost as the SSE endpoint
+        sse_event({"type": "token", "text": token})
+        if ttft is None:
+            ttft = time.perf_counter() - started
+        tokens += 1
+    return ttft or 0.0, time.perf_counter() - started, tokens
+
+
+def _pct(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def main(streams: int, first_token_ms: float, token_ms: float) -> None:
+    provider = FakeLLMProvider(
+        first_token_delay=first_token_ms / 1000,
+        token_delay=token_ms / 1000,
+    )
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(_one_stream(provider) for _ in range(streams)))
+    wall = time.perf_counter() - started
+
+    ttfts = [r[0] * 1000 for r in results]
+    totals = [r[1] * 1000 for r in results]
+    tokens = sum(r[2] for r in results)
+
+    print(f"streams={streams} tokens={tokens} wall={wall:.3f}s tokens/s={tokens / wall:,.0f}")
+    print(
+        f"ttft_ms  p50={statistics.median(ttfts):.2f} p95={_pct(ttfts, 0.95):.2f} "
+        f"overhead_p50={statistics.median(ttfts) - first_token_ms:.2f}"
+    )
+    print(f"total_ms p50={statistics.median(totals):.2f} p95={_pct(totals, 0.95):.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--streams", type=int, default=100)
+    parser.add_argument("--first-token-ms", type=float, default=50)
+    parser.add_argument("--token-ms", type=float, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.streams, args.first_token_ms, args.token_ms))
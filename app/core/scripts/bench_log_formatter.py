@@ -0,0 +1,100 @@
+"""
+JSON log formatter benchmark
+----------------------------
+
+Records/sec formatted by:
+
+- legacy:  the previous JSONFormatter (datetime.now + json.dumps, no extras)
+- current: app.core.logging.logging_config.JSONFormatter
+
+    python -m app.core.scripts.bench_log_formatter --records 200000
+
+The record mirrors the per-request HTTP summary line (extra fields +
+request context), i.e. the most frequent line in production.
+"""
+
+import argparse
+import json
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+
+from app.core.logging import logging_config
+from app.core.logging.logging_config import JSONFormatter
+
+
+class LegacyJSONFormatter(logging.Formatter):
+    """Previous implementation, for comparison."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        log_record = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "filename": record.filename,
+            "line": record.lineno,
+            "funcName": record.funcName,
+        }
+        if record.exc_info:
+            log_record["exception"] = self.formatException(record.exc_info)
+        return json.dumps(log_record, ensure_ascii=False)
+
+
+def make_record() -> logging.LogRecord:
+    record = logging.getLogger("http").makeRecord(
+        "http", logging.INFO, __file__, 42, "HTTP request processed", None, None,
+        func="bench",
+        extra={
+            "event": "http_request",
+            "method": "GET",
+            "path": "/api/v1/messages/session/7f9c",
+            "query_params": "limit=50",
+            "client_ip": "10.0.0.12",
+            "status_code": 200,
+            "latency_seconds": 0.0123,
+            "duration_seconds": 0.0125,
+            "user_id": str(uuid.uuid4()),
+            "user_agent": "bench/1.0",
+            "request_id": uuid.uuid4().hex,
+            "user_role": "user",
+        },
+    )
+    return record
+
+
+def run(formatter: logging.Formatter, records: int) -> float:
+    record = make_record()
+    for _ in range(1000):  # warm-up
+        formatter.format(record)
+
+    started = time.perf_counter()
+    for _ in range(records):
+        record.created = time.time()
+        formatter.format(record)
+    return records / (time.perf_counter() - started)
+
+
+def main(records: int) -> None:
+    encoder = "orjson" if logging_config.orjson is not None else "json"
+    variants = [
+        ("legacy", LegacyJSONFormatter()),
+        ("current", JSONFormatter(static_fields={"service": "chat-api", "host": "bench"})),
+    ]
+
+    results = {}
+    for name, formatter in variants:
+        results[name] = run(formatter, records)
+        print(f"{name:<8} {results[name]:>12,.0f} records/s")
+
+    print(f"encoder: {encoder}")
+    print(f"current vs legacy: {results['current'] / results['legacy']:.2f}x "
+          "(current also serializes extra + context fields)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=200_000)
+    args = parser.parse_args()
+    main(args.records)
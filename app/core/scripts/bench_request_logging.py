@@ -0,0 +1,153 @@
+"""
+Request logging middleware benchmark
+------------------------------------
+
+Compares req/s on a bare `/health` route behind:
+
+- legacy:  the previous BaseHTTPMiddleware-based logger
+- asgi:    the pure-ASGI RequestLoggingMiddleware
+
+    python -m app.core.scripts.bench_request_logging --requests 20000 --concurrency 50
+
+Requests are driven in-process straight through the ASGI interface
+(no sockets), so the numbers isolate middleware overhead. Log records
+are created in both runs and dropped unformatted by a NullHandler.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.logging.context import set_request_context
+from app.core.logging.middleware import RequestLoggingMiddleware
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """Previous implementation (minus the JWT decode), for comparison."""
+
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())
+        start_time = time.time()
+        set_request_context(request_id=request_id)
+
+        response = await call_next(request)
+
+        process_time = round(time.time() - start_time, 4)
+        response.headers["X-Request-ID"] = request_id
+
+        logging.getLogger("http").info(
+            "HTTP request processed",
+            extra={
+                "event": "http_request",
+                "method": request.method,
+                "path": request.url.path,
+                "query_params": str(request.query_params),
+                "client_ip": request.client.host if request.client else None,
+                "status_code": response.status_code,
+                "latency_seconds": process_time,
+                "user_agent": request.headers.get("user-agent"),
+            },
+        )
+        return response
+
+
+def build_app(middleware) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"message": "ok"}
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/health",
+    "raw_path": b"/health",
+    "query_string": b"",
+    "root_path": "",
+    "headers": [(b"host", b"bench"), (b"user-agent", b"bench/1.0")],
+    "client": ("127.0.0.1", 50000),
+    "server": ("bench", 80),
+}
+
+
+async def _one_request(app) -> int:
+    sent_body = False
+    status = 0
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal sent_body
+        if not sent_body:
+            sent_body = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(dict(SCOPE), receive, send)
+    disconnected.set()
+    return status
+
+
+async def run(app, requests: int, concurrency: int) -> float:
+    # Warm-up (route compilation, middleware stack build)
+    for _ in range(200):
+        await _one_request(app)
+
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            assert await _one_request(app) == 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+
+async def main(requests: int, concurrency: int) -> None:
+    http_logger = logging.getLogger("http")
+    http_logger.setLevel(logging.INFO)
+    http_logger.addHandler(logging.NullHandler())
+    http_logger.propagate = False
+
+    variants = [
+        ("none", build_app(None)),
+        ("legacy", build_app(LegacyRequestLoggingMiddleware)),
+        ("asgi", build_app(RequestLoggingMiddleware)),
+    ]
+
+    results = {}
+    for name, app in variants:
+        results[name] = await run(app, requests, concurrency)
+        print(f"{name:<7} {results[name]:>10,.0f} req/s")
+
+    print(f"asgi vs legacy: {results['asgi'] / results['legacy']:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
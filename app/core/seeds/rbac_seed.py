@@ -10,17 +10,26 @@ Flow:
 2️⃣ Insert Permissions
 3️⃣ Map Role → Permissions
 
+Each step is one CRUDHelper.upsert (INSERT ... ON CONFLICT DO NOTHING),
+all in one transaction on an AsyncSession (same pattern as the APIs
+and bootstrap_admin).
+
 Characteristics:
 ✅ Idempotent safe
 ✅ Logging enabled
 ✅ Transaction safe
 """
 
+import asyncio
 import uuid
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db.sync_database import SessionLocal
+from app.core.db.database import AsyncSessionLocal
 from app.core.logging.route_logger import get_route_logger
+from app.core.rbac.permission_index import reload_permission_index
+from app.core.redis.redis_config import AsyncRedisClient
+from app.services.helpers.crud_helper import CRUDHelper
 
 from app.models import (
     users,
@@ -47,135 +56,137 @@ from app.core.seeds.seed_map_definitions import (
 logger = get_route_logger("rbac.seed")
 
 
-def seed_rbac():
+async def _reload_rbac_index():
     """
-    Execute RBAC seeding process.
-
-    Safety:
-    - Uses sync DB session
-    - Wrapped in transaction
+    Recompile the permission index through the async client, so API
+    workers' L1 copies are evicted via the invalidation channel too
+    (a raw DEL would leave them serving the old index until L1 expiry).
     """
-
-    logger.info("🚀 Starting RBAC seed process")
-
-    db: Session = SessionLocal()
-
+    redis = AsyncRedisClient()
     try:
-        # ==================================================
-        # 1️⃣ INSERT ROLES
-        # ==================================================
-        logger.info("Seeding roles...")
-
-        role_map = {}
-
-        for role_data in ROLES:
-            existing_role = db.query(Role).filter_by(name=role_data["name"]).first()
-
-            if existing_role:
-                logger.debug("Role already exists → %s", role_data["name"])
-                role_map[existing_role.name] = existing_role
-                continue
-
-            new_role = Role(
-                id=uuid.uuid4(),
-                name=role_data["name"],
-                description=role_data["description"],
-            )
-
-            db.add(new_role)
-            db.flush()  # Get PK without commit
-
-            logger.info("Role created → %s", new_role.name)
-
-            role_map[new_role.name] = new_role
-
-        # ==================================================
-        # 2️⃣ INSERT PERMISSIONS
-        # ==================================================
-        logger.info("Seeding permissions...")
-
-        perm_map = {}
-
-        for perm_data in PERMISSIONS:
-            existing_perm = db.query(Permission).filter_by(name=perm_data["name"]).first()
-
-            if existing_perm:
-                logger.debug("Permission already exists → %s", perm_data["name"])
-                perm_map[existing_perm.name] = existing_perm
-                continue
-
-            new_perm = Permission(
-                id=uuid.uuid4(),
-                name=perm_data["name"],
-                description=perm_data.get("description"),
-            )
-
-            db.add(new_perm)
-            db.flush()
-
-            logger.info("Permission created → %s", new_perm.name)
-
-            perm_map[new_perm.name] = new_perm
-
-        # ==================================================
-        # 3️⃣ MAP ROLE → PERMISSIONS
-        # ==================================================
-        logger.info("Mapping role → permissions...")
-
-        for role_name, perm_list in ROLE_PERMISSIONS.items():
-            role = role_map.get(role_name)
-
-            if not role:
-                logger.error("Role missing during mapping → %s", role_name)
+        async with AsyncSessionLocal() as db:
+            index = await reload_permission_index(redis, db)
+        logger.info("RBAC index reloaded | version=%s", index.version)
+    except Exception as exc:
+        # Workers still pick up the change within RBAC_INDEX_TTL
+        logger.warning("Could not reload RBAC index: %s", exc)
+    finally:
+        await redis.close()
+
+
+async def _seed(db: AsyncSession):
+    # ==================================================
+    # 1️⃣ INSERT ROLES (existing names skipped)
+    # ==================================================
+    logger.info("Seeding roles...")
+
+    created = await CRUDHelper.upsert(
+        db,
+        Role,
+        [
+            {
+                "id": uuid.uuid4(),
+                "name": role_data["name"],
+                "description": role_data["description"],
+            }
+            for role_data in ROLES
+        ],
+        conflict_columns=["name"],
+        commit=False,
+    )
+    logger.info("Roles created → %s", created)
+
+    role_ids = dict((await db.execute(select(Role.name, Role.id))).all())
+
+    # ==================================================
+    # 2️⃣ INSERT PERMISSIONS
+    # ==================================================
+    logger.info("Seeding permissions...")
+
+    created = await CRUDHelper.upsert(
+        db,
+        Permission,
+        [
+            {
+                "id": uuid.uuid4(),
+                "name": perm_data["name"],
+                "description": perm_data.get("description"),
+            }
+            for perm_data in PERMISSIONS
+        ],
+        conflict_columns=["name"],
+        commit=False,
+    )
+    logger.info("Permissions created → %s", created)
+
+    perm_ids = dict((await db.execute(select(Permission.name, Permission.id))).all())
+
+    # ==================================================
+    # 3️⃣ MAP ROLE → PERMISSIONS
+    # ==================================================
+    logger.info("Mapping role → permissions...")
+
+    mappings = []
+
+    for role_name, perm_list in ROLE_PERMISSIONS.items():
+        role_id = role_ids.get(role_name)
+
+        if not role_id:
+            logger.error("Role missing during mapping → %s", role_name)
+            continue
+
+        for perm_name in perm_list:
+            perm_id = perm_ids.get(perm_name)
+
+            if not perm_id:
+                logger.error("Permission missing → %s", perm_name)
                 continue
 
-            for perm_name in perm_list:
-                perm = perm_map.get(perm_name)
-
-                if not perm:
-                    logger.error("Permission missing → %s", perm_name)
-                    continue
+            mappings.append({"role_id": role_id, "permission_id": perm_id})
 
-                exists = db.query(RolePermission).filter_by(
-                    role_id=role.id,
-                    permission_id=perm.id,
-                ).first()
+    if mappings:
+        created = await CRUDHelper.upsert(
+            db,
+            RolePermission,
+            mappings,
+            conflict_columns=["role_id", "permission_id"],
+            commit=False,
+        )
+        logger.info("Role → permission mappings created → %s", created)
 
-                if exists:
-                    logger.debug(
-                        "Mapping exists → role=%s perm=%s",
-                        role_name,
-                        perm_name,
-                    )
-                    continue
+    # ==================================================
+    # ✅ COMMIT TRANSACTION
+    # ==================================================
+    await db.commit()
 
-                db.add(RolePermission(
-                    role_id=role.id,
-                    permission_id=perm.id,
-                ))
 
-                logger.info(
-                    "Mapped → role=%s permission=%s",
-                    role_name,
-                    perm_name,
-                )
+async def _seed_rbac():
+    async with AsyncSessionLocal() as db:
+        try:
+            await _seed(db)
+        except Exception as e:
+            await db.rollback()
+            logger.exception("❌ RBAC seeding failed: %s", str(e))
+            return
+        finally:
+            logger.info("🔒 RBAC seed DB session closed")
 
-        # ==================================================
-        # ✅ COMMIT TRANSACTION
-        # ==================================================
-        db.commit()
+    logger.info("✅ RBAC seeding completed successfully")
 
-        logger.info("✅ RBAC seeding completed successfully")
+    await _reload_rbac_index()
 
-    except Exception as e:
-        db.rollback()
 
-        logger.exception("❌ RBAC seeding failed: %s", str(e))
+def seed_rbac():
+    """
+    Execute RBAC seeding process.
 
-    finally:
-        db.close()
+    Safety:
+    - Uses an AsyncSession (CRUDHelper.upsert per step)
+    - Wrapped in one transaction
+    """
 
-        logger.info("🔒 RBAC seed DB session closed")
+    logger.info("🚀 Starting RBAC seed process")
+    asyncio.run(_seed_rbac())
 
 
 if __name__ == "__main__":
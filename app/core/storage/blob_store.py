@@ -0,0 +1,163 @@
+"""
+Blob Storage
+------------
+
+Content-addressed storage for large binary payloads (message audio).
+
+- Blobs are identified by the SHA-256 of their bytes
+- Identical uploads are stored once (dedupe for free)
+- Uploads and downloads stream in chunks; a blob is never held in memory
+
+`BlobStore` is the interface; `LocalBlobStore` keeps files on disk.
+An S3-compatible backend only needs to implement the same methods.
+"""
+
+import asyncio
+import hashlib
+import os
+import uuid
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import AsyncIterable, AsyncIterator
+
+from app.core.config import get_settings
+from app.core.logging.route_logger import get_route_logger
+
+logger = get_route_logger("storage.blobs")
+
+
+class BlobTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured maximum size."""
+
+
+class BlobStore(ABC):
+    """
+    Interface for content-addressed blob backends.
+    """
+
+    @abstractmethod
+    async def put_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        max_bytes: int | None = None,
+    ) -> tuple[str, int]:
+        """Store a stream. Returns (sha256 hex digest, size in bytes)."""
+
+    async def put_bytes(self, data: bytes) -> tuple[str, int]:
+        async def one_chunk():
+            yield data
+
+        return await self.put_stream(one_chunk())
+
+    @abstractmethod
+    def open_stream(self, digest: str) -> AsyncIterator[bytes]:
+        """Yield a blob's bytes in chunks. Raises FileNotFoundError."""
+
+    @abstractmethod
+    async def exists(self, digest: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def delete(self, digest: str) -> None:
+        ...
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Filesystem backend: `<root>/<aa>/<bb>/<digest>`.
+
+    Writes go to a temp file while hashing, then are atomically renamed
+    into place, so readers never observe partial blobs.
+    Blocking file I/O runs in worker threads, off the event loop.
+    """
+
+    def __init__(self, root: str, chunk_size: int = 64 * 1024):
+        self.root = root
+        self.chunk_size = chunk_size
+        os.makedirs(os.path.join(root, "tmp"), exist_ok=True)
+
+    def _path(self, digest: str) -> str:
+        if len(digest) != 64 or not all(c in "0123456789abcdef" for c in digest):
+            raise ValueError("Invalid blob digest")
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    async def put_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        max_bytes: int | None = None,
+    ) -> tuple[str, int]:
+        tmp_path = os.path.join(self.root, "tmp", uuid.uuid4().hex)
+        hasher = hashlib.sha256()
+        size = 0
+
+        handle = await asyncio.to_thread(open, tmp_path, "wb")
+        try:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise BlobTooLargeError(f"Blob exceeds {max_bytes} bytes")
+                hasher.update(chunk)
+                await asyncio.to_thread(handle.write, chunk)
+        except BaseException:
+            await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(_remove_quietly, tmp_path)
+            raise
+
+        await asyncio.to_thread(handle.close)
+
+        digest = hasher.hexdigest()
+        final_path = self._path(digest)
+        await asyncio.to_thread(_commit_file, tmp_path, final_path)
+
+        logger.info("Blob stored | sha256=%s size=%s", digest, size)
+        return digest, size
+
+    async def open_stream(self, digest: str) -> AsyncIterator[bytes]:
+        path = self._path(digest)
+        handle = await asyncio.to_thread(open, path, "rb")
+        try:
+            while True:
+                chunk = await asyncio.to_thread(handle.read, self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            await asyncio.to_thread(handle.close)
+
+    async def exists(self, digest: str) -> bool:
+        return await asyncio.to_thread(os.path.exists, self._path(digest))
+
+    async def delete(self, digest: str) -> None:
+        await asyncio.to_thread(_remove_quietly, self._path(digest))
+
+
+def _commit_file(tmp_path: str, final_path: str) -> None:
+    if os.path.exists(final_path):
+        # Same content already stored
+        os.remove(tmp_path)
+        return
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    os.replace(tmp_path, final_path)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+# === FastAPI Dependancy ===
+@lru_cache
+def get_blob_store() -> BlobStore:
+    """
+    Built on first use, so merely importing this module (Celery, scripts)
+    does not create the storage directory.
+    """
+    settings = get_settings()
+    return LocalBlobStore(
+        settings.BLOB_STORAGE_DIR,
+        chunk_size=settings.BLOB_CHUNK_SIZE,
+    )
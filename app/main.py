@@ -1,11 +1,14 @@
 from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 import logging
 
-from app.core.logging.logging_config import setup_logging
+from app.core.logging.logging_config import setup_logging, stop_logging
 from app.core.logging.middleware import RequestLoggingMiddleware
 from app.core.redis.redis_config import redis_client
-from app.api.v1 import (auth, admin, messages, users, sessions)
+from app.core.redis.pubsub_hub import pubsub_hub
+from app.core.metrics.publisher import metrics_publisher
+from app.api.v1 import (auth, admin, messages, users, sessions, chat_ws)
 
 # ✅ Initializing logging
 setup_logging()
@@ -16,10 +19,14 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await redis_client.connect()
+    metrics_publisher.start()
     logger.info("✅ Application startup completed.")
     yield
+    await metrics_publisher.stop()
+    await pubsub_hub.close()
     await redis_client.close()
     logger.info("🛑 Application shutdown initiated.")
+    stop_logging()
 
 app = FastAPI(
     lifespan=lifespan,
@@ -32,6 +39,7 @@ app.include_router(admin.router)
 app.include_router(users.router)
 app.include_router(sessions.router)
 app.include_router(messages.router)
+app.include_router(chat_ws.router)
 
 
 # ✅ Registering the middleware
@@ -57,3 +65,12 @@ async def get_health_check():
 async def root_status():
     logger.info(f"{BOLD}{CYAN}</>{RESET} Root endpoint accessed")
     return {"message": "Welcome to the AI-Chat Agent API! Redis Configured"}
+
+
+# ✅ Prometheus metrics (all workers, see app/core/metrics/publisher.py)
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(
+        await metrics_publisher.collect(),
+        media_type="text/plain; version=0.0.4",
+    )
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime, Index, func
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, query_expression
 import uuid
 from app.core.db.database import Base
 
@@ -8,6 +8,16 @@ from app.core.db.database import Base
 # ✅ === CHAT_MESSAGES TABLE ===
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    # Columns list endpoints may sort by
+    __sortable__ = ("created_at", "role", "source")
+    __table_args__ = (
+        # Per-user scans past a high-water mark (memory summarization)
+        Index("ix_chat_messages_user_created", "user_id", "created_at", "id"),
+        # Keyset pages of a session's messages (default sort)
+        Index("ix_chat_messages_session_created", "session_id", "created_at", "id"),
+        # Users active in a time range (memory summarization candidates)
+        Index("ix_chat_messages_created", "created_at", "user_id"),
+    )
 
     id = Column(
         UUID(as_uuid=True),
@@ -32,11 +42,18 @@ class ChatMessage(Base):
     content = Column(Text, nullable=False)
     source = Column(String(32), default="text")  # text/audio/system
 
-    # Later: Replace with S3 URL
-    # BASE64-encoded audio (for MVP only)
+    # Legacy: BASE64-encoded audio stored inline (MVP rows only)
     audio_data = Column(Text, nullable=True)
+
+    # Audio lives in the blob store (content-addressed by SHA-256)
+    audio_blob_hash = Column(String(64), nullable=True, index=True)
+    audio_size = Column(Integer, nullable=True)
+    audio_content_type = Column(String(100), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Truncated content, computed in SQL only when requested (with_expression)
+    content_preview = query_expression()
+
     # Relationships
     user = relationship("User", back_populates="messages")
     session = relationship("ConversationSession", back_populates="messages")
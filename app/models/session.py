@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime, func, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime, Index, func, JSON
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.db.database import Base
@@ -8,6 +8,14 @@ from app.core.db.database import Base
 # ✅ === SESSIONS TABLE ===
 class ConversationSession(Base):
     __tablename__ = "sessions"
+    # Columns list endpoints may sort by
+    __sortable__ = (
+        "started_at", "ended_at", "title", "language", "model_used", "platform",
+    )
+    __table_args__ = (
+        # Keyset pages of a user's sessions (default sort)
+        Index("ix_sessions_user_started", "user_id", "started_at", "id"),
+    )
 
     id = Column(
         UUID(as_uuid=True),
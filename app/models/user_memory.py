@@ -20,5 +20,9 @@ class UserMemory(Base):
     updated_at = Column(DateTime(timezone=True),
                         server_default=func.now(), onupdate=func.now())
 
+    # High-water mark: last (created_at, id) message folded into the summary
+    summarized_until_at = Column(DateTime(timezone=True), nullable=True)
+    summarized_until_id = Column(UUID(as_uuid=True), nullable=True)
+
     # Back_reference relationship
     user = relationship("User", back_populates="memory", uselist=False)
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Boolean, DateTime, func
+from sqlalchemy import Column, String, Boolean, DateTime, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.db.database import Base
@@ -8,6 +8,15 @@ from app.core.db.database import Base
 # ✅ === USERS TABLE ===
 class User(Base):
     __tablename__ = "users"
+    # Columns list endpoints may sort by (never credentials)
+    __sortable__ = (
+        "created_at", "updated_at", "last_login", "username",
+        "email", "first_name", "last_name", "is_active",
+    )
+    __table_args__ = (
+        # Keyset pages of the user lists (default sort)
+        Index("ix_users_created", "created_at", "id"),
+    )
 
     id = Column(
         UUID(as_uuid=True),
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from uuid import UUID
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -23,11 +23,6 @@ class ChatMessageBase(BaseModel):
         max_length=32,
         description="Source of message: 'text' or 'audio'."
     )
-    # MVP audio: store base64-encoded audio
-    audio_data: Optional[str] = Field(
-        None,
-        description="Base64-encoded audio data (temporary MVP storage)."
-    )
 
 
 # ✅ === Schema for Creating a ChatMessage ===
@@ -39,9 +34,47 @@ class ChatMessageCreate(ChatMessageBase):
         The session this message belongs to.
         Provided by client in HTTP workflow,
         OR derived automatically in WebSocket session.
+
+    audio_data:
+        Optional base64 audio. Decoded into the blob store on create;
+        only the reference is kept on the row. Large recordings should
+        use the streaming `POST /message/{id}/audio` endpoint instead.
     """
     user_id: UUID
     session_id: UUID
+    audio_data: Optional[str] = Field(
+        None,
+        description="Base64-encoded audio data (moved to blob storage on create)."
+    )
+    audio_content_type: Optional[str] = Field(
+        None,
+        max_length=100,
+        description="MIME type of audio_data, e.g. 'audio/webm'."
+    )
+
+
+# ✅ === Schema for Bulk Ingestion (POST /message/bulk) ===
+class ChatMessageBulkCreate(BaseModel):
+    """
+    Many messages for one session, inserted in order in one transaction.
+
+    Text only; attach audio afterwards via POST /message/{id}/audio.
+    """
+    session_id: UUID
+    messages: List[ChatMessageBase] = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="Messages in conversation order."
+    )
+
+
+# ✅ === Assistant Reply Request (POST /message/session/{id}/reply) ===
+class ChatReplyRequest(BaseModel):
+    content: Optional[str] = Field(
+        None,
+        description="User turn to store before generating. Omit to reply to the existing history."
+    )
 
 
 # ✅ ===Lightweight ChatResponse Schema (embedded inside SessionRead)
@@ -55,10 +88,37 @@ class ChatMessageResponse(ChatMessageBase):
     session_id: UUID
     created_at: datetime
 
+    # Audio reference only; bytes are served by GET /message/{id}/audio
+    audio_blob_hash: Optional[str] = None
+    audio_size: Optional[int] = None
+    audio_content_type: Optional[str] = None
+
     class Config:
         from_attributes = True
 
 
+# ✅ === Projected message (GET /message/session/{id}?fields=...)
+class ChatMessagePreview(BaseModel):
+    """
+    Sparse message for sidebars / previews.
+
+    Only the requested fields are set; serialize with exclude_unset=True.
+    `content_preview` is the first MESSAGE_PREVIEW_CHARS characters of
+    `content`, truncated by the database.
+    """
+    id: UUID
+    user_id: Optional[UUID] = None
+    session_id: Optional[UUID] = None
+    role: Optional[str] = None
+    source: Optional[str] = None
+    content: Optional[str] = None
+    content_preview: Optional[str] = None
+    created_at: Optional[datetime] = None
+    audio_blob_hash: Optional[str] = None
+    audio_size: Optional[int] = None
+    audio_content_type: Optional[str] = None
+
+
 # ✅ === Expanded chat message including user + session
 # Get /message{id}
 class ChatMessageRead(ChatMessageResponse):
@@ -73,3 +133,9 @@ class ChatMessageRead(ChatMessageResponse):
 
     class Config:
         from_attributes = True
+
+
+# ✅ === Bulk Ingestion Response ===
+class ChatMessageBulkResponse(BaseModel):
+    items: List[ChatMessageResponse]
+    count: int
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from datetime import datetime
 from uuid import UUID
-from typing import Optional
+from typing import Optional, List
 
 
 # ✅ == User's Base ===
@@ -70,3 +70,8 @@ class UserRead(UserResponse):
 
     class Config:
         from_attributes = True
+
+
+# ✅ === Admin mass actions ===
+class UserBulkAction(BaseModel):
+    user_ids: List[UUID] = Field(..., min_length=1, max_length=1000)
@@ -1,11 +1,38 @@
-from typing import Type, Any
+from typing import Type, Any, Iterable
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, delete, values, column, bindparam, any_
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 
 from app.models.roles import Role
 from app.models.user_roles import UserRole
+from app.services.helpers.projection import load_only_columns
+
+
+# PostgreSQL wire protocol allows 32767 bind parameters per statement
+MAX_BIND_PARAMS = 32_000
+
+
+def _chunks(rows: list, params_per_row: int, chunk_size: int | None = None):
+    """
+    Split rows so each statement stays under MAX_BIND_PARAMS.
+    """
+    size = max(1, MAX_BIND_PARAMS // max(1, params_per_row))
+    if chunk_size:
+        size = min(size, chunk_size)
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _row_keys(rows: list[dict]) -> list[str]:
+    """
+    Column names shared by every row (set-based statements need one shape).
+    """
+    keys = list(rows[0])
+    if any(set(row) != set(keys) for row in rows):
+        raise ValueError("All rows must have the same keys")
+    return keys
 
 
 class CRUDHelper:
@@ -16,6 +43,8 @@ class CRUDHelper:
     - DB access only
     - No business logic
     - Safe commit + rollback
+    - One round-trip per write: server defaults return via RETURNING
+      (Base eager_defaults), no refresh after commit
     """
 
     # 1️⃣ Fetch by ID
@@ -39,9 +68,17 @@ class CRUDHelper:
         offset: int = 0,
         limit: int = 20,
         order_by=None,
+        fields: list[str] | None = None,
     ):
+        """
+        `fields` restricts loaded columns (load_only); other
+        attributes must not be accessed on the returned objects.
+        """
         query = select(model)
 
+        if fields:
+            query = query.options(load_only_columns(model, fields))
+
         if filters:
             for condition in filters:
                 query = query.where(condition)
@@ -65,7 +102,6 @@ class CRUDHelper:
             obj = model(**data)
             db.add(obj)
             await db.commit()
-            await db.refresh(obj)
             return obj
         except Exception:
             await db.rollback()
@@ -83,7 +119,6 @@ class CRUDHelper:
                 setattr(obj, field, value)
 
             await db.commit()
-            await db.refresh(obj)
             return obj
         except Exception:
             await db.rollback()
@@ -102,56 +137,221 @@ class CRUDHelper:
             await db.rollback()
             raise
 
-    # 6️⃣ Assign Role to User (RBAC)
+    # 6️⃣ Bulk Create (INSERT ... RETURNING, one commit)
     @staticmethod
-    async def assign_role(
+    async def bulk_create(
         db: AsyncSession,
-        user_id: UUID,
-        role_name: str,
-    ):
+        model: Type,
+        rows: list[dict],
+        chunk_size: int | None = None,
+    ) -> list:
         """
-        Assign a role to a user.
+        Insert many rows; returns ORM objects in input order.
+        """
+        if not rows:
+            return []
 
-        Responsibilities:
-        - Fetch role by name
-        - Prevent duplicate role assignment
-        - Persist mapping
+        try:
+            objects = []
+            for chunk in _chunks(rows, len(_row_keys(rows)), chunk_size):
+                result = await db.scalars(
+                    insert(model).returning(model, sort_by_parameter_order=True),
+                    chunk,
+                )
+                objects.extend(result.all())
 
-        Notes:
-        - No permission logic here
-        - Pure DB operation
+            await db.commit()
+            return objects
+        except Exception:
+            await db.rollback()
+            raise
+
+    # 7️⃣ Upsert (INSERT ... ON CONFLICT)
+    @staticmethod
+    async def upsert(
+        db: AsyncSession,
+        model: Type,
+        rows: list[dict],
+        conflict_columns: list[str],
+        update_columns: list[str] | None = None,
+        chunk_size: int | None = None,
+        commit: bool = True,
+    ) -> int:
+        """
+        Insert rows, resolving conflicts on `conflict_columns`.
+
+        - update_columns=None → ON CONFLICT DO NOTHING
+        - otherwise → DO UPDATE SET col = EXCLUDED.col
+        - commit=False leaves the transaction open (multi-step writes)
+
+        Returns the number of rows inserted or updated.
         """
+        if not rows:
+            return 0
 
         try:
-            # ✅ Fetch role
-            result = await db.execute(
-                select(Role).where(Role.name == role_name)
-            )
-            role = result.scalar_one_or_none()
+            affected = 0
+            for chunk in _chunks(rows, len(_row_keys(rows)), chunk_size):
+                stmt = pg_insert(model.__table__).values(chunk)
+
+                if update_columns:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=conflict_columns,
+                        set_={name: stmt.excluded[name] for name in update_columns},
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+
+                result = await db.execute(stmt)
+                affected += result.rowcount
+
+            if commit:
+                await db.commit()
+            return affected
+        except Exception:
+            await db.rollback()
+            raise
+
+    # 8️⃣ Bulk Update (UPDATE ... FROM (VALUES ...))
+    @staticmethod
+    async def bulk_update(
+        db: AsyncSession,
+        model: Type,
+        rows: list[dict],
+        key: str = "id",
+        chunk_size: int | None = None,
+    ) -> int:
+        """
+        Per-row updates in one statement per chunk.
+
+        Every row must carry `key` plus the same set of columns to change.
+        Returns the number of rows updated.
+        """
+        if not rows:
+            return 0
 
-            if not role:
-                raise ValueError(f"Role '{role_name}' does not exist")
+        table = model.__table__
+        keys = _row_keys(rows)
+        if key not in keys:
+            raise ValueError(f"Every row needs '{key}'")
+        fields = [name for name in keys if name != key]
 
-            # ✅ Prevent duplicate assignment
-            existing = await db.execute(
-                select(UserRole).where(
-                    UserRole.user_id == user_id,
-                    UserRole.role_id == role.id,
+        try:
+            affected = 0
+            for chunk in _chunks(rows, len(keys), chunk_size):
+                data = values(
+                    *(column(name, table.c[name].type) for name in keys),
+                    name="data",
+                ).data([tuple(row[name] for name in keys) for row in chunk])
+
+                stmt = (
+                    update(table)
+                    .where(table.c[key] == data.c[key])
+                    .values({name: data.c[name] for name in fields})
                 )
-            )
+                result = await db.execute(stmt)
+                affected += result.rowcount
 
-            if existing.scalar_one_or_none():
-                return  # Idempotent safe
+            await db.commit()
+            return affected
+        except Exception:
+            await db.rollback()
+            raise
 
-            # ✅ Create mapping
-            user_role = UserRole(
-                user_id=user_id,
-                role_id=role.id,
-            )
+    # 9️⃣ Update many by ID (UPDATE ... WHERE id = ANY(:ids))
+    @staticmethod
+    async def update_many(
+        db: AsyncSession,
+        model: Type,
+        ids: Iterable,
+        data: dict,
+    ) -> int:
+        """
+        Set the same values on every row in `ids`, one statement.
+        The ids travel as one array parameter, so the statement text
+        (and its prepared plan) never changes with the batch size.
 
-            db.add(user_role)
+        Returns the number of rows updated.
+        """
+        ids = list(ids)
+        if not ids:
+            return 0
+
+        id_column = model.__table__.c.id
+
+        try:
+            result = await db.execute(
+                update(model.__table__)
+                .where(id_column == any_(bindparam("ids", ids, type_=ARRAY(id_column.type))))
+                .values(**data)
+            )
             await db.commit()
+            return result.rowcount
+        except Exception:
+            await db.rollback()
+            raise
+
+    # 🔟 Bulk Delete (DELETE ... WHERE id = ANY(:ids))
+    @staticmethod
+    async def bulk_delete(
+        db: AsyncSession,
+        model: Type,
+        ids: Iterable,
+        chunk_size: int | None = None,
+    ) -> int:
+        """
+        Delete by primary key. One array parameter per statement,
+        so the statement text (and its prepared plan) never changes.
+        """
+        ids = list(ids)
+        if not ids:
+            return 0
 
+        id_column = model.__table__.c.id
+
+        try:
+            affected = 0
+            # Array bind is a single parameter; chunk only to bound statement size
+            for chunk in _chunks(ids, 1, chunk_size):
+                stmt = delete(model.__table__).where(
+                    id_column == any_(bindparam("ids", chunk, type_=ARRAY(id_column.type)))
+                )
+                result = await db.execute(stmt)
+                affected += result.rowcount
+
+            await db.commit()
+            return affected
         except Exception:
             await db.rollback()
             raise
+
+    # 1️⃣1️⃣ Assign Role to User (RBAC)
+    @staticmethod
+    async def assign_role(
+        db: AsyncSession,
+        user_id: UUID,
+        role_name: str,
+    ):
+        """
+        Assign a role to a user.
+
+        Responsibilities:
+        - Resolve role by name, then insert the mapping through upsert
+          (ON CONFLICT DO NOTHING)
+        - Idempotent: an existing assignment is left untouched
+
+        Notes:
+        - No permission logic here
+        - Pure DB operation
+        """
+
+        role_id = await db.scalar(select(Role.id).where(Role.name == role_name))
+        if not role_id:
+            raise ValueError(f"Role '{role_name}' does not exist")
+
+        await CRUDHelper.upsert(
+            db,
+            UserRole,
+            [{"user_id": user_id, "role_id": role_id}],
+            conflict_columns=["user_id", "role_id"],
+        )
@@ -0,0 +1,50 @@
+from uuid import UUID
+
+from app.core.redis.redis_config import RedisBatch
+from app.core.redis.pubsub_hub import session_channel
+from app.services.llm.context_cache import queue_context_append
+
+# Single-message cache entries (message:{id}, message:{user}:{id})
+MESSAGE_CACHE_TTL = 60 * 5
+
+
+def queue_messages_created(
+    batch: RedisBatch,
+    *,
+    user_id: str,
+    session_id: UUID | str,
+    items: list[dict],
+) -> RedisBatch:
+    """
+    Queue everything that follows persisting new messages:
+
+    - write-through of each message (tagged per session)
+    - O(1) invalidation of the session's paginated lists
+    - append to the session's LLM context window
+    - `message.created` events for WebSocket subscribers
+
+    `items` are ChatMessageResponse JSON dicts, in conversation order.
+    """
+    item_keys = []
+    for item in items:
+        keys = [f"message:{item['id']}", f"message:{user_id}:{item['id']}"]
+        for key in keys:
+            batch.set_json(key, item, ex=MESSAGE_CACHE_TTL)
+        item_keys.extend(keys)
+
+    batch.tag(
+        [f"session:{session_id}:message-items"],
+        *item_keys,
+        ex=MESSAGE_CACHE_TTL,
+    )
+    batch.bump_generation(f"session:{session_id}:messages")
+
+    queue_context_append(batch, session_id, items)
+
+    for item in items:
+        batch.publish_json(
+            session_channel(session_id),
+            {"type": "message.created", "message": item},
+        )
+
+    return batch
@@ -1,27 +1,178 @@
-from sqlalchemy import select, func
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, func, and_, or_, tuple_, asc, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
-async def paginate_query(
+
+# ✅ === Keyset (cursor) pagination ===
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, UUID):
+        return ["uuid", str(value)]
+    return ["raw", value]
+
+
+def _decode_value(tagged):
+    kind, value = tagged
+    if value is None:
+        return None
+    if kind == "dt":
+        return datetime.fromisoformat(value)
+    if kind == "uuid":
+        return UUID(value)
+    return value
+
+
+def encode_cursor(*, sort_by: str, order: str, value, obj_id) -> str:
+    """
+    Build an opaque cursor pointing just after (value, obj_id).
+    """
+    payload = {
+        "s": sort_by,
+        "o": order,
+        "v": _encode_value(value),
+        "id": str(obj_id),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *, sort_by: str, order: str) -> tuple:
+    """
+    Decode a cursor into (value, obj_id).
+
+    Raises 400 when the cursor is malformed or was issued
+    for a different sort column / direction.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = _decode_value(payload["v"])
+        obj_id = UUID(payload["id"])
+        cursor_sort, cursor_order = payload["s"], payload["o"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+
+    if cursor_sort != sort_by or cursor_order != order:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not match sort_by/order",
+        )
+
+    return value, obj_id
+
+
+def resolve_sort_column(model, sort_by: str, default: str):
+    """
+    Safe sort column lookup: only columns in the model's `__sortable__`
+    allow-list (anything else falls back to `default`).
+    """
+    columns = model.__table__.c
+    if sort_by in getattr(model, "__sortable__", ()):
+        return sort_by, columns[sort_by]
+    return default, columns[default]
+
+
+def _after_cursor(column, id_column, value, obj_id, descending: bool):
+    """
+    WHERE clause selecting rows strictly after the cursor.
+
+    Uses a row-value comparison so PostgreSQL can seek on a
+    ([filter,] sort_column, id) index where one exists (default sorts,
+    see ix_*_created / ix_sessions_user_started). NULL sort keys follow
+    PostgreSQL's defaults: NULLS LAST for ASC, NULLS FIRST for DESC.
+    """
+    if value is None:
+        if descending:
+            return or_(
+                and_(column.is_(None), id_column < obj_id),
+                column.is_not(None),
+            )
+        return and_(column.is_(None), id_column > obj_id)
+
+    if descending:
+        return tuple_(column, id_column) < tuple_(value, obj_id)
+
+    condition = tuple_(column, id_column) > tuple_(value, obj_id)
+    if column.nullable:
+        condition = or_(condition, column.is_(None))
+    return condition
+
+
+async def paginate_keyset(
     *,
     session: AsyncSession,
     query,
-    page: int=1,
-    limit:int=20,
+    model,
+    sort_by: str,
+    order: str,
+    default_sort: str = "created_at",
+    page: int = 1,
+    limit: int = 20,
+    cursor: str | None = None,
+    with_total: bool | None = None,
 ):
     """
-    Generic pagination helper.
+    Cursor-based pagination helper.
+
+    - Orders by (sort column, id) so every row has a stable position
+    - With a cursor: seeks past it; with a matching index (the default
+      sorts) the cost is independent of depth, other sort columns still
+      scan and top-N sort the filtered rows
+    - Without a cursor: falls back to OFFSET for `page` (backwards compatible)
+    - Counting is optional; by default only offset pages are counted
 
     Returns:
     - items
-    - total_count
+    - total_count (None when skipped)
+    - next_cursor (None on the last page)
     """
-    offset = (page-1)*limit
+    sort_by, column = resolve_sort_column(model, sort_by, default_sort)
+    descending = order.lower() == "desc"
+    order = "desc" if descending else "asc"
+    id_column = model.__table__.c.id
+
+    if with_total is None:
+        with_total = cursor is None
+
+    total = None
+    if with_total:
+        count_query = select(func.count()).select_from(query.subquery())
+        total = await session.scalar(count_query)
+
+    direction = desc if descending else asc
+    paged = query.order_by(direction(column), direction(id_column))
+
+    if cursor:
+        value, obj_id = decode_cursor(cursor, sort_by=sort_by, order=order)
+        paged = paged.where(
+            _after_cursor(column, id_column, value, obj_id, descending)
+        )
+    elif page > 1:
+        paged = paged.offset((page - 1) * limit)
 
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await session.scalar(count_query)
+    # Fetching one extra row tells us whether a next page exists
+    result = await session.execute(paged.limit(limit + 1))
+    items = result.scalars().all()
 
-    result = await session.execute(
-        query.limit(limit).offset(offset)
-    )
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(
+            sort_by=sort_by,
+            order=order,
+            value=getattr(last, sort_by),
+            obj_id=last.id,
+        )
 
-    return result.scalars().all(), total
\ No newline at end of file
+    return items, total, next_cursor
@@ -0,0 +1,37 @@
+from fastapi import HTTPException, status
+from sqlalchemy.orm import load_only
+
+
+def parse_fields(fields: str | None, allowed: set[str]) -> list[str] | None:
+    """
+    Parse a `fields=a,b,c` query parameter.
+
+    Returns the requested names (de-duplicated, sorted so equivalent
+    requests share a cache key), or None when no projection was asked for.
+    Raises 400 for names outside `allowed`.
+    """
+    if not fields:
+        return None
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - allowed
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+
+    return sorted(requested) or None
+
+
+def load_only_columns(model, fields: list[str]):
+    """
+    `load_only` option for real table columns in `fields`.
+
+    Names that are not columns (e.g. query expressions) are skipped;
+    the primary key is always loaded by SQLAlchemy.
+    """
+    columns = model.__table__.c
+    return load_only(
+        *(getattr(model, name) for name in fields if name in columns)
+    )
@@ -1,11 +1,192 @@
 
+import asyncio
+import math
+import random
+import time
 from typing import Callable, Any, Awaitable
 
+from app.core.db.database import AsyncSessionLocal
 from app.core.logging.route_logger import get_route_logger
 from app.core.redis.redis_config import AsyncRedisClient
+from app.services.helpers.single_flight import single_flight
 
 logger = get_route_logger("cache.helpers")
 
+# Background stale-while-revalidate refreshes (strong refs + per-key dedupe)
+_refresh_tasks: dict[str, asyncio.Task] = {}
+
+# Polling interval while another worker holds the rebuild lock
+LOCK_POLL_INTERVAL = 0.05
+
+# Lock held by the worker refreshing a stale entry
+REFRESH_LOCK_TTL = 10
+
+# XFetch aggressiveness (1.0 = paper default; >1 refreshes earlier)
+XFETCH_BETA = 1.0
+
+# Marker for cache envelopes carrying soft-expiry metadata
+SWR_META_KEY = "_swr"
+
+
+async def _load_and_cache(
+    *,
+    redis: AsyncRedisClient,
+    redis_key: str,
+    db_fetch_callable: Callable[[], Awaitable[Any]],
+    ttl: int,
+    lock_ttl: float | None,
+    stale_ttl: int = 0,
+):
+    """
+    Run the DB fetch and cache its result.
+
+    With `lock_ttl`, a short Redis lock elects one worker to rebuild;
+    the others poll the cache until it is filled or the lock expires,
+    then fall back to the DB themselves.
+    """
+    token = None
+    if lock_ttl:
+        token = await redis.acquire_lock(redis_key, int(lock_ttl * 1000))
+
+        if token is None:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + lock_ttl
+            while loop.time() < deadline:
+                await asyncio.sleep(LOCK_POLL_INTERVAL)
+                cached = await redis.get_json(redis_key)
+                if cached is not None:
+                    logger.info("⚡ Cache FILLED by peer | %s", redis_key)
+                    if isinstance(cached, dict) and SWR_META_KEY in cached:
+                        cached = cached["data"]
+                    return cached, "Redis Cache"
+
+            logger.warning("Rebuild lock expired, loading anyway | %s", redis_key)
+
+    try:
+        started = time.monotonic()
+        data = await db_fetch_callable()
+
+        if data is not None:
+            await _store(
+                redis=redis,
+                redis_key=redis_key,
+                data=data,
+                ttl=ttl,
+                stale_ttl=stale_ttl,
+                delta=time.monotonic() - started,
+            )
+
+        return data, "PostgreSQL DB"
+    finally:
+        if token is not None:
+            await redis.release_lock(redis_key, token)
+
+
+async def _store(
+    *,
+    redis: AsyncRedisClient,
+    redis_key: str,
+    data: Any,
+    ttl: int,
+    stale_ttl: int,
+    delta: float,
+):
+    """
+    Cache `data`. With `stale_ttl`, wrap it in an envelope holding the
+    soft expiry and the recompute time (delta) used by XFetch; the Redis
+    key itself lives for ttl + stale_ttl.
+    """
+    expires = ttl
+    value = data
+
+    if stale_ttl > 0:
+        expires = ttl + stale_ttl
+        value = {
+            SWR_META_KEY: {"exp": time.time() + ttl, "delta": round(delta, 4)},
+            "data": data,
+        }
+
+    await redis.set_json(redis_key, value, ex=expires)
+
+    logger.info(
+        "📦 Cached | %s (ttl=%ss stale=%ss)", redis_key, ttl, stale_ttl
+    )
+
+
+def _should_refresh(meta: dict) -> bool:
+    """
+    XFetch (probabilistic early expiration): refresh once
+    now - delta * beta * ln(rand) >= expiry. Slow-to-compute entries
+    refresh earlier, and refreshes of many keys spread out over time.
+    """
+    delta = meta.get("delta") or 0.0
+    gap = -delta * XFETCH_BETA * math.log(1.0 - random.random())
+    return time.time() + gap >= meta["exp"]
+
+
+async def _refresh_in_background(
+    *,
+    redis: AsyncRedisClient,
+    redis_key: str,
+    db_fetch_callable: Callable[..., Awaitable[Any]],
+    ttl: int,
+    stale_ttl: int,
+):
+    """
+    Rebuild a stale entry off the request path.
+    Runs on its own DB session: the request's session may be closed
+    (or still in use) by the time this executes.
+    """
+    token = await redis.acquire_lock(redis_key, REFRESH_LOCK_TTL * 1000)
+    if token is None:
+        return  # another worker is already refreshing
+
+    try:
+        started = time.monotonic()
+        async with AsyncSessionLocal() as session:
+            data = await db_fetch_callable(session)
+
+        if data is not None:
+            await _store(
+                redis=redis,
+                redis_key=redis_key,
+                data=data,
+                ttl=ttl,
+                stale_ttl=stale_ttl,
+                delta=time.monotonic() - started,
+            )
+            logger.info("🔄 Refreshed in background | %s", redis_key)
+    except Exception:
+        logger.exception("Background refresh failed | %s", redis_key)
+    finally:
+        await redis.release_lock(redis_key, token)
+
+
+def _schedule_refresh(redis_key: str, **kwargs) -> None:
+    if redis_key in _refresh_tasks:
+        return
+
+    task = asyncio.create_task(
+        _refresh_in_background(redis_key=redis_key, **kwargs)
+    )
+    _refresh_tasks[redis_key] = task
+    task.add_done_callback(lambda _: _refresh_tasks.pop(redis_key, None))
+
+
+async def versioned_key(
+    redis: AsyncRedisClient,
+    namespace: str,
+    suffix: str,
+) -> str:
+    """
+    Fold the namespace's generation into a cache key:
+    `{namespace}:g{generation}:{suffix}`.
+    Writers call `redis.bump_generation(namespace)` to invalidate
+    every page of the collection at once.
+    """
+    generation = await redis.get_generation(namespace)
+    return f"{namespace}:g{generation}:{suffix}"
+
 
 async def fetch_from_cache_or_db(
     *,
@@ -13,10 +194,23 @@ async def fetch_from_cache_or_db(
     redis_key: str,
     db_fetch_callable: Callable[[], Awaitable[Any]],
     ttl: int = 300,
+    lock_ttl: float | None = None,
+    stale_ttl: int = 0,
 ):
     """
     Redis-first read-through cache.
 
+    Concurrent misses for the same key within this process share a
+    single DB query (single-flight). Pass `lock_ttl` (seconds) to also
+    coalesce across workers with a short Redis lock.
+
+    Stale-while-revalidate (`stale_ttl` > 0):
+    - `ttl` becomes a soft expiry; the entry is kept for another `stale_ttl`
+    - stale (or XFetch early-expired) entries are served immediately while
+      one background task refreshes them
+    - `db_fetch_callable` must then accept an optional AsyncSession,
+      used for the background refresh
+
     Returns:
     - (data, source)
       source ∈ {"Redis Cache", "PostgreSQL DB"}
@@ -24,15 +218,33 @@ async def fetch_from_cache_or_db(
 
     cached = await redis.get_json(redis_key)
     if cached is not None:
+        if isinstance(cached, dict) and SWR_META_KEY in cached:
+            if _should_refresh(cached[SWR_META_KEY]):
+                logger.info("♻️ Cache STALE | %s → refreshing", redis_key)
+                _schedule_refresh(
+                    redis_key,
+                    redis=redis,
+                    db_fetch_callable=db_fetch_callable,
+                    ttl=ttl,
+                    stale_ttl=stale_ttl,
+                )
+            else:
+                logger.info("⚡ Cache HIT | %s", redis_key)
+            return cached["data"], "Redis Cache"
+
         logger.info("⚡ Cache HIT | %s", redis_key)
         return cached, "Redis Cache"
 
     logger.info("❌ Cache MISS | %s → PostgreSQL", redis_key)
 
-    data = await db_fetch_callable()
-
-    if data is not None:
-        await redis.set_json(redis_key, data, ex=ttl)
-        logger.info("📦 Cached | %s (ttl=%ss)", redis_key, ttl)
-
-    return data, "PostgreSQL DB"
+    return await single_flight(
+        redis_key,
+        lambda: _load_and_cache(
+            redis=redis,
+            redis_key=redis_key,
+            db_fetch_callable=db_fetch_callable,
+            ttl=ttl,
+            lock_ttl=lock_ttl,
+            stale_ttl=stale_ttl,
+        ),
+    )
@@ -0,0 +1,52 @@
+"""
+Single-Flight
+-------------
+
+Coalesces concurrent loads of the same key (per process) into one
+`loader()` run; followers await the leader's result or exception.
+
+If the leader is cancelled (e.g. its client disconnected), followers
+are NOT failed with it: they wake up, one of them becomes the new
+leader and runs the loader, the rest follow it.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+# In-flight loads per key (this process only)
+_inflight: dict[str, asyncio.Future] = {}
+
+# Result handed to followers when the leader was cancelled
+_RETRY = object()
+
+
+async def single_flight(key: str, loader: Callable[[], Awaitable[Any]]):
+    while True:
+        future = _inflight.get(key)
+        if future is None:
+            break
+        # shield: a cancelled follower must not cancel the shared load
+        result = await asyncio.shield(future)
+        if result is not _RETRY:
+            return result
+
+    future = asyncio.get_running_loop().create_future()
+    # Mark exceptions as retrieved even when nobody is waiting
+    future.add_done_callback(lambda f: f.exception())
+    _inflight[key] = future
+
+    try:
+        result = await loader()
+    except asyncio.CancelledError:
+        # Hand the load over instead of failing every follower
+        future.set_result(_RETRY)
+        raise
+    except Exception as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        if _inflight.get(key) is future:
+            del _inflight[key]
@@ -0,0 +1,199 @@
+"""
+Context-Window Cache
+--------------------
+
+Per-session Redis list holding the recent message window used for LLM
+prompts, kept within a token budget.
+
+- New messages are appended in the same pipeline that persists them
+  (queue_messages_created); the head is trimmed in Lua once the window
+  exceeds LLM_CONTEXT_TOKEN_BUDGET tokens or LLM_CONTEXT_MESSAGES entries
+- A running token total is stored alongside, so reading the window is
+  one round-trip with no re-query or re-serialization
+- Entries are "<tokens>|<message id>|<json>" so Lua can trim and
+  dedupe without decoding JSON
+- Appends only touch an initialized window; a cold window is rebuilt
+  from PostgreSQL, and the rebuild is discarded if the session's
+  message generation moved meanwhile (a concurrent write)
+- A rebuild can run between a message's commit and its append (the
+  generation is bumped after the commit), so appends skip ids already
+  in the window
+"""
+
+import json
+import math
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.redis.redis_config import AsyncRedisClient, RedisBatch, generation_key
+from app.models.message import ChatMessage
+
+settings = get_settings()
+
+CONTEXT_TTL = 3600
+
+# Per-message framing overhead (role, separators) in the estimate
+MESSAGE_TOKEN_OVERHEAD = 4
+
+# KEYS[1] = window list, KEYS[2] = token total
+# ARGV[1] = token budget, ARGV[2] = max entries, ARGV[3] = ttl, ARGV[4..] = entries
+_APPEND_SCRIPT = """
+if redis.call("EXISTS", KEYS[2]) == 0 then
+    return -1
+end
+local total = tonumber(redis.call("GET", KEYS[2]))
+local present = {}
+for _, entry in ipairs(redis.call("LRANGE", KEYS[1], 0, -1)) do
+    local id = string.match(entry, "^%d+|([^|]*)|")
+    if id then
+        present[id] = true
+    end
+end
+for i = 4, #ARGV do
+    local id = string.match(ARGV[i], "^%d+|([^|]*)|")
+    if not present[id] then
+        present[id] = true
+        redis.call("RPUSH", KEYS[1], ARGV[i])
+        total = total + tonumber(string.match(ARGV[i], "^(%d+)|"))
+    end
+end
+local budget, max_entries = tonumber(ARGV[1]), tonumber(ARGV[2])
+local length = redis.call("LLEN", KEYS[1])
+while length > 1 and (total > budget or length > max_entries) do
+    local head = redis.call("LPOP", KEYS[1])
+    total = total - tonumber(string.match(head, "^(%d+)|"))
+    length = length - 1
+end
+redis.call("SET", KEYS[2], total, "EX", ARGV[3])
+redis.call("EXPIRE", KEYS[1], ARGV[3])
+return total
+"""
+
+# KEYS[1] = window list, KEYS[2] = token total, KEYS[3] = generation
+# ARGV[1] = generation seen before the DB read, ARGV[2] = ttl,
+# ARGV[3] = token total, ARGV[4..] = entries (oldest first)
+_FILL_SCRIPT = """
+if (redis.call("GET", KEYS[3]) or "0") ~= ARGV[1] then
+    return 0
+end
+redis.call("DEL", KEYS[1])
+if #ARGV > 3 then
+    redis.call("RPUSH", KEYS[1], unpack(ARGV, 4))
+    redis.call("EXPIRE", KEYS[1], ARGV[2])
+end
+redis.call("SET", KEYS[2], ARGV[3], "EX", ARGV[2])
+return 1
+"""
+
+# KEYS[1] = window list, KEYS[2] = token total, KEYS[3] = generation
+# Returns {total, entries} when warm, {-1, generation} when cold
+_READ_SCRIPT = """
+local total = redis.call("GET", KEYS[2])
+if not total then
+    return {-1, redis.call("GET", KEYS[3]) or "0"}
+end
+return {total, redis.call("LRANGE", KEYS[1], 0, -1)}
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token)."""
+    return math.ceil(len(text) / 4) + MESSAGE_TOKEN_OVERHEAD
+
+
+def _keys(session_id: UUID | str) -> list[str]:
+    return [f"session:{session_id}:context", f"session:{session_id}:context:tokens"]
+
+
+def _entry(message_id: UUID | str, role: str, content: str) -> str:
+    body = json.dumps({"role": role, "content": content}, separators=(",", ":"))
+    return f"{estimate_tokens(content)}|{message_id}|{body}"
+
+
+def _parse(entry: bytes | str) -> dict:
+    if isinstance(entry, bytes):
+        entry = entry.decode()
+    # JSON body starts at the first "|{" (also matches pre-id "<tokens>|<json>")
+    return json.loads(entry[entry.index("|{") + 1:])
+
+
+def queue_context_append(batch: RedisBatch, session_id: UUID | str, items: list[dict]) -> RedisBatch:
+    """Append persisted messages (ChatMessageResponse dicts) to the window."""
+    entries = [_entry(item["id"], item["role"], item["content"]) for item in items]
+    if entries:
+        batch.eval_script(
+            _APPEND_SCRIPT,
+            _keys(session_id),
+            settings.LLM_CONTEXT_TOKEN_BUDGET,
+            settings.LLM_CONTEXT_MESSAGES,
+            CONTEXT_TTL,
+            *entries,
+        )
+    return batch
+
+
+def queue_context_invalidate(batch: RedisBatch, session_id: UUID | str) -> RedisBatch:
+    """Drop the window (e.g. after a delete); rebuilt on next read."""
+    return batch.delete(*_keys(session_id))
+
+
+def _generation_key(session_id: UUID | str) -> str:
+    return generation_key(f"session:{session_id}:messages")
+
+
+async def _rebuild(
+    redis: AsyncRedisClient,
+    db: AsyncSession,
+    session_id: UUID | str,
+    generation: bytes | str,
+) -> tuple[list[dict], int]:
+    result = await db.execute(
+        select(ChatMessage.id, ChatMessage.role, ChatMessage.content)
+        .where(ChatMessage.session_id == session_id)
+        .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+        .limit(settings.LLM_CONTEXT_MESSAGES)
+    )
+
+    # Newest first until the budget is spent (always keep the latest one)
+    entries, total = [], 0
+    for message_id, role, content in result.all():
+        entry = _entry(message_id, role, content)
+        tokens = int(entry.split("|", 1)[0])
+        if entries and total + tokens > settings.LLM_CONTEXT_TOKEN_BUDGET:
+            break
+        entries.append(entry)
+        total += tokens
+    entries.reverse()
+
+    await redis.eval_script(
+        _FILL_SCRIPT,
+        [*_keys(session_id), _generation_key(session_id)],
+        generation,
+        CONTEXT_TTL,
+        total,
+        *entries,
+    )
+
+    return [_parse(entry) for entry in entries], total
+
+
+async def load_context(
+    redis: AsyncRedisClient,
+    db: AsyncSession,
+    session_id: UUID | str,
+) -> tuple[list[dict], int]:
+    """
+    Recent messages ({"role", "content"}, oldest first) and their
+    estimated token count. One Redis round-trip when warm.
+    """
+    total, payload = await redis.eval_script(
+        _READ_SCRIPT, [*_keys(session_id), _generation_key(session_id)]
+    )
+    if int(total) >= 0:
+        return [_parse(entry) for entry in payload], int(total)
+
+    # Cold: payload is the generation seen before the DB read
+    return await _rebuild(redis, db, session_id, payload)
@@ -0,0 +1,180 @@
+"""
+Reply Generation Pipeline
+-------------------------
+
+1️⃣ build_prompt: system prompt + user memory + recent message window
+   (window served from the context cache, see context_cache.py)
+2️⃣ stream_reply: relay provider tokens as they arrive
+3️⃣ persist the assistant ChatMessage once, after the last token
+   (write-through cache, list invalidation and WebSocket fan-out in
+   one Redis round-trip); an empty reply is reported as an error and
+   never persisted
+
+Events yielded by stream_reply:
+
+    {"type": "token", "text": "..."}
+    {"type": "done", "message": {...}, "ttft_ms": float, "total_ms": float}
+    {"type": "error", "detail": "..."}
+"""
+
+import json
+import time
+from typing import AsyncIterator
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.db.database import AsyncSessionLocal
+from app.core.logging.route_logger import get_route_logger
+from app.core.redis.redis_config import AsyncRedisClient
+from app.models.message import ChatMessage
+from app.models.session import ConversationSession
+from app.models.user_memory import UserMemory
+from app.schemas.message import ChatMessageResponse
+from app.services.helpers.crud_helper import CRUDHelper
+from app.services.helpers.message_events import queue_messages_created
+from app.services.helpers.redis_helpers import fetch_from_cache_or_db
+from app.services.llm.context_cache import estimate_tokens, load_context
+from app.services.llm.providers import LLMProvider
+
+settings = get_settings()
+logger = get_route_logger("llm.pipeline")
+
+MEMORY_CACHE_TTL = 600
+
+
+def memory_cache_key(user_id) -> str:
+    return f"memory:{user_id}"
+
+
+async def get_memory_summary(
+    redis: AsyncRedisClient,
+    db: AsyncSession,
+    user_id: str,
+) -> str:
+    """UserMemory summary, cached (dropped by the summarization job)."""
+
+    async def fetch():
+        summary = await db.scalar(
+            select(UserMemory.memory_summary).where(UserMemory.user_id == user_id)
+        )
+        return {"summary": summary or ""}
+
+    data, _ = await fetch_from_cache_or_db(
+        redis=redis,
+        redis_key=memory_cache_key(user_id),
+        db_fetch_callable=fetch,
+        ttl=MEMORY_CACHE_TTL,
+    )
+    return data["summary"] if data else ""
+
+
+async def build_prompt(
+    db: AsyncSession,
+    redis: AsyncRedisClient,
+    session: ConversationSession,
+    user_id: str,
+) -> tuple[list[dict], int]:
+    """
+    Chat prompt for the next assistant turn (oldest message first)
+    and its estimated token count.
+
+    Warm path: two Redis reads (memory + context window), no SQL.
+    """
+    prompt, tokens = [], 0
+
+    if session.system_prompt:
+        prompt.append({"role": "system", "content": session.system_prompt})
+        tokens += estimate_tokens(session.system_prompt)
+
+    memory = await get_memory_summary(redis, db, user_id)
+    if memory:
+        content = f"What you know about the user: {memory}"
+        prompt.append({"role": "system", "content": content})
+        tokens += estimate_tokens(content)
+
+    history, history_tokens = await load_context(redis, db, session.id)
+    prompt.extend(history)
+
+    return prompt, tokens + history_tokens
+
+
+async def stream_reply(
+    *,
+    provider: LLMProvider,
+    prompt: list[dict],
+    model: str,
+    user_id: str,
+    session_id: UUID,
+    redis: AsyncRedisClient,
+) -> AsyncIterator[dict]:
+    """
+    Relay tokens, then persist the full reply once.
+
+    Runs inside the response body, so it uses its own DB session.
+    If the client disconnects mid-stream nothing is persisted.
+    """
+    started = time.perf_counter()
+    ttft = None
+    parts = []
+
+    try:
+        async for token in provider.stream(prompt, model=model):
+            if ttft is None:
+                ttft = time.perf_counter() - started
+            parts.append(token)
+            yield {"type": "token", "text": token}
+    except Exception:
+        logger.exception("LLM stream failed | provider=%s session=%s", provider.name, session_id)
+        yield {"type": "error", "detail": "Generation failed"}
+        return
+
+    content = "".join(parts)
+    if not content.strip():
+        # Nothing to save: an empty assistant turn would also enter the context window
+        logger.warning("LLM returned an empty reply | provider=%s session=%s", provider.name, session_id)
+        yield {"type": "error", "detail": "Empty reply"}
+        return
+
+    async with AsyncSessionLocal() as db:
+        message = await CRUDHelper.create(
+            db,
+            ChatMessage,
+            {
+                "user_id": user_id,
+                "session_id": session_id,
+                "role": "assistant",
+                "content": content,
+                "source": "text",
+            },
+        )
+
+    message_json = ChatMessageResponse.model_validate(message).model_dump(mode="json")
+
+    async with redis.pipeline() as batch:
+        queue_messages_created(
+            batch,
+            user_id=user_id,
+            session_id=session_id,
+            items=[message_json],
+        )
+
+    total = time.perf_counter() - started
+    logger.info(
+        "Reply generated | provider=%s model=%s session=%s tokens=%s ttft_ms=%.1f total_ms=%.1f",
+        provider.name, model, session_id, len(parts), (ttft or 0) * 1000, total * 1000,
+    )
+
+    yield {
+        "type": "done",
+        "message": message_json,
+        "ttft_ms": round((ttft or 0) * 1000, 2),
+        "total_ms": round(total * 1000, 2),
+    }
+
+
+def sse_event(event: dict) -> bytes:
+    """Server-Sent Events frame: `event: <type>` + JSON data."""
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode()
@@ -0,0 +1,114 @@
+"""
+LLM Providers
+-------------
+
+A provider turns a chat prompt into a stream of text tokens.
+
+    prompt = [{"role": "system", "content": "..."}, {"role": "user", ...}]
+    async for token in provider.stream(prompt, model="gpt-5"):
+        ...
+
+`FakeLLMProvider` is deterministic and needs no network: the same prompt
+always yields the same tokens with the same (configurable) delays, so
+latency-to-first-token can be benchmarked offline.
+
+Real backends register a factory with `register_provider(name, factory)`
+and are selected with `settings.LLM_PROVIDER`.
+"""
+
+import asyncio
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable
+
+from app.core.config import get_settings
+
+_TOKEN_RE = re.compile(r"\S+\s*")
+
+_FAKE_SENTENCES = [
+    "Here is a short answer.",
+    "Let me break that down step by step.",
+    "The key idea is to keep things simple.",
+    "You can try this locally first.",
+    "Tell me if you want more detail.",
+]
+
+
+class LLMProvider(ABC):
+    """
+    Interface for token-streaming chat backends.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def stream(self, prompt: list[dict], *, model: str) -> AsyncIterator[str]:
+        """Yield text tokens; concatenated they form the full reply."""
+
+
+class FakeLLMProvider(LLMProvider):
+    """
+    Offline provider: echoes the last user message plus a few canned
+    sentences picked from a hash of the prompt.
+    """
+
+    name = "fake"
+
+    def __init__(self, first_token_delay: float = 0.05, token_delay: float = 0.01):
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+
+    def _reply_for(self, prompt: list[dict], model: str) -> str:
+        last_user = next(
+            (m["content"] for m in reversed(prompt) if m["role"] == "user"),
+            "",
+        )
+        digest = hashlib.sha256(
+            "\x1f".join(m["content"] for m in prompt).encode()
+        ).digest()
+        extra = [_FAKE_SENTENCES[b % len(_FAKE_SENTENCES)] for b in digest[:2]]
+        return f"[{model}] You said: {last_user.strip()[:200]} " + " ".join(extra)
+
+    async def stream(self, prompt: list[dict], *, model: str) -> AsyncIterator[str]:
+        tokens = _TOKEN_RE.findall(self._reply_for(prompt, model))
+
+        await asyncio.sleep(self.first_token_delay)
+        for i, token in enumerate(tokens):
+            if i and self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            yield token
+
+
+# === Registry ===
+def _fake_from_settings() -> FakeLLMProvider:
+    settings = get_settings()
+    return FakeLLMProvider(
+        first_token_delay=settings.LLM_FAKE_FIRST_TOKEN_MS / 1000,
+        token_delay=settings.LLM_FAKE_TOKEN_MS / 1000,
+    )
+
+
+_PROVIDERS: dict[str, Callable[[], LLMProvider]] = {
+    "fake": _fake_from_settings,
+}
+_instances: dict[str, LLMProvider] = {}
+
+
+def register_provider(name: str, factory: Callable[[], LLMProvider]) -> None:
+    _PROVIDERS[name] = factory
+    _instances.pop(name, None)
+
+
+def get_provider(name: str) -> LLMProvider:
+    """Shared provider instance; raises ValueError for unknown names."""
+    if name not in _instances:
+        if name not in _PROVIDERS:
+            raise ValueError(f"Unknown LLM provider '{name}'")
+        _instances[name] = _PROVIDERS[name]()
+    return _instances[name]
+
+
+# === FastAPI Dependancy ===
+def get_llm_provider() -> LLMProvider:
+    return get_provider(get_settings().LLM_PROVIDER)
@@ -0,0 +1,83 @@
+"""
+Memory Summarizers
+------------------
+
+Fold new conversation messages into a user's running memory summary.
+
+    summary = summarizer.summarize(previous_summary, messages)
+
+Synchronous on purpose: called from Celery workers.
+`StubSummarizer` is deterministic and offline; real backends register a
+factory with `register_summarizer(name, factory)` and are selected with
+`settings.MEMORY_SUMMARIZER`.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from typing import Callable
+
+from app.core.config import get_settings
+
+MAX_SUMMARY_CHARS = 2000
+
+_SENTENCE_RE = re.compile(r"[^.!?\n]+[.!?]?")
+
+
+class Summarizer(ABC):
+    """
+    Interface for memory summarizers.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def summarize(self, previous: str, messages: list[dict]) -> str:
+        """`messages` are {"role", "content"} dicts, oldest first."""
+
+
+class StubSummarizer(Summarizer):
+    """
+    Offline summarizer: keeps the first sentence of each new user
+    message as a "fact", newest facts win when the summary is full.
+    """
+
+    name = "stub"
+
+    def __init__(self, max_chars: int = MAX_SUMMARY_CHARS):
+        self.max_chars = max_chars
+
+    def summarize(self, previous: str, messages: list[dict]) -> str:
+        facts = [line for line in previous.splitlines() if line.strip()]
+
+        for message in messages:
+            if message["role"] != "user":
+                continue
+            match = _SENTENCE_RE.search(message["content"].strip())
+            if match:
+                fact = f"- {match.group(0).strip()[:200]}"
+                if fact not in facts:
+                    facts.append(fact)
+
+        # Drop oldest facts until the summary fits
+        while facts and len("\n".join(facts)) > self.max_chars:
+            facts.pop(0)
+
+        return "\n".join(facts)
+
+
+# === Registry ===
+_SUMMARIZERS: dict[str, Callable[[], Summarizer]] = {
+    "stub": StubSummarizer,
+}
+
+
+def register_summarizer(name: str, factory: Callable[[], Summarizer]) -> None:
+    _SUMMARIZERS[name] = factory
+
+
+def get_summarizer(name: str | None = None) -> Summarizer:
+    """Raises ValueError for unknown names."""
+    name = name or get_settings().MEMORY_SUMMARIZER
+    if name not in _SUMMARIZERS:
+        raise ValueError(f"Unknown summarizer '{name}'")
+    return _SUMMARIZERS[name]()
@@ -0,0 +1,236 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import redis
+from sqlalchemy import select, func, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.celery.celery_app import celery
+from app.core.config import get_settings
+from app.core.db.sync_database import SessionLocal
+from app.core.logging.route_logger import get_route_logger
+from app.core.redis.hmac_security import hmac_key
+from app.models.message import ChatMessage
+from app.models.user_memory import UserMemory
+from app.services.llm.summarizer import get_summarizer
+
+settings = get_settings()
+logger = get_route_logger("tasks.memory")
+
+# Overlapping beat runs would summarize the same messages twice
+SUMMARIZE_LOCK_KEY = "lock:memory-summarize"
+SUMMARIZE_LOCK_TTL = 15 * 60
+
+# Settled horizon of the last complete run; the next run only looks for
+# users with messages after it (no TTL)
+SCAN_FROM_KEY = "memory:summarize:scan-from"
+
+# Compare-and-delete (same as AsyncRedisClient.release_lock): a run that
+# outlived the TTL must not drop the lock a newer run now holds
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def _after_watermark():
+    """Messages newer than the user's high-water mark (or all, if none)."""
+    return or_(
+        UserMemory.summarized_until_at.is_(None),
+        tuple_(ChatMessage.created_at, ChatMessage.id)
+        > tuple_(UserMemory.summarized_until_at, UserMemory.summarized_until_id),
+    )
+
+
+def _load_scan_from(client: redis.Redis) -> datetime | None:
+    try:
+        raw = client.get(hmac_key(SCAN_FROM_KEY))
+    except redis.RedisError as exc:
+        logger.warning("Could not read memory scan cursor: %s", exc)
+        return None
+    return datetime.fromisoformat(raw.decode()) if raw else None
+
+
+def _save_scan_from(client: redis.Redis, value: datetime) -> None:
+    try:
+        client.set(hmac_key(SCAN_FROM_KEY), value.isoformat())
+    except redis.RedisError as exc:
+        # Next run then rescans from the older cursor
+        logger.warning("Could not store memory scan cursor: %s", exc)
+
+
+def _invalidate_memory_cache(client: redis.Redis, user_ids: list) -> None:
+    """
+    Drop cached summaries (memory:{user_id}) in Redis and in every API
+    worker's L1 cache (same invalidation channel AsyncRedisClient uses).
+    """
+    if not user_ids:
+        return
+    hkeys = [hmac_key(f"memory:{user_id}") for user_id in user_ids]
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.delete(*hkeys)
+        pipe.publish(
+            settings.REDIS_L1_INVALIDATION_CHANNEL,
+            f"celery-{uuid.uuid4().hex}:{','.join(hkeys)}",
+        )
+        pipe.execute()
+    except redis.RedisError as exc:
+        # Cached summaries then expire by TTL
+        logger.warning("Could not invalidate memory cache: %s", exc)
+
+
+@celery.task
+def summarize_user_memories():
+    """
+    Background task:
+    Folds new messages into each user's UserMemory summary.
+
+    Runs:
+    - Every 15 minutes via Celery Beat
+
+    Logic:
+    - Only messages after the stored high-water mark (created_at, id)
+      and older than MEMORY_SETTLE_SECONDS: rows committed late with an
+      earlier created_at (long transactions, bulk ingest stamped with
+      the app clock) are settled before the mark can pass them
+    - Candidates are users with messages since the previous complete
+      run's horizon (minus the settle margin), found on
+      ix_chat_messages_created; the per-user count then runs on
+      ix_chat_messages_user_created
+    - Only users with >= MEMORY_MIN_NEW_MESSAGES new messages
+    - At most MEMORY_USERS_PER_RUN users, MEMORY_MAX_MESSAGES_PER_USER
+      messages each; a truncated run keeps the old horizon so the rest
+      is picked up next run
+    - Commits every MEMORY_COMMIT_EVERY users
+
+    Cost is proportional to new activity, not to full history (the very
+    first run, with no stored horizon, scans everything once).
+    """
+    client = redis.Redis.from_url(settings.REDIS_URL)
+    lock = hmac_key(SUMMARIZE_LOCK_KEY)
+    token = uuid.uuid4().hex
+
+    if not client.set(lock, token, nx=True, ex=SUMMARIZE_LOCK_TTL):
+        client.close()
+        return "Skipped: previous run still in progress"
+
+    db = SessionLocal()
+    processed = 0
+    pending_invalidation = []
+
+    settle = timedelta(seconds=settings.MEMORY_SETTLE_SECONDS)
+    horizon = datetime.now(timezone.utc) - settle
+    scan_from = _load_scan_from(client)
+    truncated = False
+
+    try:
+        summarizer = get_summarizer()
+
+        # 1️⃣ Users with enough new activity (one aggregate query)
+        candidate_query = (
+            select(ChatMessage.user_id, func.count().label("new_count"))
+            .outerjoin(UserMemory, UserMemory.user_id == ChatMessage.user_id)
+            .where(_after_watermark(), ChatMessage.created_at < horizon)
+        )
+        if scan_from is not None:
+            active_users = (
+                select(ChatMessage.user_id)
+                .where(
+                    ChatMessage.created_at >= scan_from - settle,
+                    ChatMessage.created_at < horizon,
+                )
+                .distinct()
+            )
+            candidate_query = candidate_query.where(ChatMessage.user_id.in_(active_users))
+
+        candidates = db.execute(
+            candidate_query
+            .group_by(ChatMessage.user_id)
+            .having(func.count() >= settings.MEMORY_MIN_NEW_MESSAGES)
+            .order_by(func.count().desc())
+            .limit(settings.MEMORY_USERS_PER_RUN)
+        ).all()
+        truncated = len(candidates) >= settings.MEMORY_USERS_PER_RUN
+
+        logger.info("Memory summarization | candidates=%s", len(candidates))
+
+        for user_id, _new_count in candidates:
+            memory = db.get(UserMemory, user_id)
+
+            # 2️⃣ Only the new messages, oldest first
+            query = select(
+                ChatMessage.id,
+                ChatMessage.created_at,
+                ChatMessage.role,
+                ChatMessage.content,
+            ).where(ChatMessage.user_id == user_id, ChatMessage.created_at < horizon)
+
+            if memory and memory.summarized_until_at is not None:
+                query = query.where(
+                    tuple_(ChatMessage.created_at, ChatMessage.id)
+                    > tuple_(memory.summarized_until_at, memory.summarized_until_id)
+                )
+
+            rows = db.execute(
+                query.order_by(ChatMessage.created_at, ChatMessage.id)
+                .limit(settings.MEMORY_MAX_MESSAGES_PER_USER)
+            ).all()
+
+            if not rows:
+                continue
+            if len(rows) >= settings.MEMORY_MAX_MESSAGES_PER_USER:
+                truncated = True
+
+            summary = summarizer.summarize(
+                memory.memory_summary if memory else "",
+                [{"role": row.role, "content": row.content} for row in rows],
+            )
+
+            # 3️⃣ Upsert summary + advance the high-water mark
+            last = rows[-1]
+            values = {
+                "memory_summary": summary,
+                "summarized_until_at": last.created_at,
+                "summarized_until_id": last.id,
+            }
+            db.execute(
+                pg_insert(UserMemory.__table__)
+                .values(user_id=user_id, **values)
+                .on_conflict_do_update(
+                    index_elements=["user_id"],
+                    set_={**values, "updated_at": func.now()},
+                )
+            )
+
+            processed += 1
+            pending_invalidation.append(user_id)
+
+            # 4️⃣ Commit in chunks
+            if len(pending_invalidation) >= settings.MEMORY_COMMIT_EVERY:
+                db.commit()
+                db.expunge_all()  # keep the identity map bounded
+                _invalidate_memory_cache(client, pending_invalidation)
+                pending_invalidation = []
+
+        db.commit()
+        _invalidate_memory_cache(client, pending_invalidation)
+
+        # 5️⃣ Advance the horizon only when nothing was left behind
+        if not truncated:
+            _save_scan_from(client, horizon)
+
+        logger.info("Memory summarization done | users=%s", processed)
+        return f"Summarized memory for {processed} users"
+
+    except Exception:
+        db.rollback()
+        logger.exception("Memory summarization failed after %s users", processed)
+        raise
+
+    finally:
+        db.close()
+        client.eval(_RELEASE_LOCK_SCRIPT, 1, lock, token)
+        client.close()
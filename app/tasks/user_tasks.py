@@ -1,9 +1,54 @@
+import uuid
 from datetime import datetime, timedelta, timezone
+
+import redis
 from sqlalchemy import update
+from app.api.dependencies.current_user import principal_cache_key, principal_namespace
 from app.core.celery.celery_app import celery
+from app.core.config import get_settings
 from app.core.db.sync_database import SessionLocal
+from app.core.logging.route_logger import get_route_logger
+from app.core.redis.hmac_security import hmac_key
+from app.core.redis.redis_config import GENERATION_TTL, generation_key
 from app.models.users import User
 
+settings = get_settings()
+logger = get_route_logger("tasks.users")
+
+# Users per invalidation round-trip
+INVALIDATE_CHUNK = 500
+
+
+def _invalidate_principals(user_ids: list) -> None:
+    """
+    Same as queue_principal_invalidation, on the sync client: drop each
+    cached principal (Redis + every API worker's L1) and bump its
+    generation, so a deactivated user stops authenticating right away.
+    """
+    if not user_ids:
+        return
+    client = redis.Redis.from_url(settings.REDIS_URL)
+    try:
+        for start in range(0, len(user_ids), INVALIDATE_CHUNK):
+            chunk = user_ids[start:start + INVALIDATE_CHUNK]
+            hkeys = [hmac_key(principal_cache_key(user_id)) for user_id in chunk]
+
+            pipe = client.pipeline(transaction=False)
+            pipe.delete(*hkeys)
+            for user_id in chunk:
+                gen_hkey = hmac_key(generation_key(principal_namespace(user_id)))
+                pipe.incr(gen_hkey)
+                pipe.expire(gen_hkey, GENERATION_TTL)
+            pipe.publish(
+                settings.REDIS_L1_INVALIDATION_CHANNEL,
+                f"celery-{uuid.uuid4().hex}:{','.join(hkeys)}",
+            )
+            pipe.execute()
+    except redis.RedisError as exc:
+        # Cached principals then expire within PRINCIPAL_TTL
+        logger.warning("Could not invalidate principals: %s", exc)
+    finally:
+        client.close()
 
 
 @celery.task
@@ -18,23 +63,27 @@ def deactivate_stale_users():
     Logic:
     - last_login older than threshold
     - Only active users
+    - Cached principals of deactivated users are invalidated
     """
 
     db = SessionLocal()
 
     try:
-        threshold = timezone.now() - timedelta(days=90)
+        threshold = datetime.now(timezone.utc) - timedelta(days=90)
 
-        result = db.execute(
+        user_ids = db.scalars(
             update(User)
             .where(User.last_login < threshold)
             .where(User.is_active == True)
             .values(is_active=False)
-        )
+            .returning(User.id)
+        ).all()
 
         db.commit()
 
-        return f"Deactivated {result.rowcount} stale users"
+        _invalidate_principals(user_ids)
+
+        return f"Deactivated {len(user_ids)} stale users"
 
     finally:
         db.close()
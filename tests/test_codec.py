@@ -0,0 +1,45 @@
+import json
+import zlib
+
+import pytest
+
+from app.core.redis.codec import JSON, ZLIB, CacheCodec
+
+
+PAYLOAD = {"id": "42", "items": [1, 2.5, None, True], "text": "héllo"}
+
+
+def test_small_payload_round_trips_uncompressed():
+    codec = CacheCodec(serializer=JSON, compression=ZLIB, threshold=1024)
+
+    raw = codec.encode(PAYLOAD)
+
+    assert raw[0] == 0x01
+    assert codec.decode(raw) == PAYLOAD
+
+
+def test_large_payload_is_compressed_and_round_trips():
+    codec = CacheCodec(serializer=JSON, compression=ZLIB, threshold=64)
+    value = {"rows": ["x" * 50] * 20}
+
+    raw = codec.encode(value)
+
+    assert raw[0] == 0x03
+    assert len(raw) < len(json.dumps(value))
+    assert codec.decode(raw) == value
+
+
+def test_legacy_plain_json_still_decodes():
+    codec = CacheCodec()
+
+    assert codec.decode(json.dumps(PAYLOAD)) == PAYLOAD
+    assert codec.decode(json.dumps(PAYLOAD).encode()) == PAYLOAD
+
+
+def test_corrupt_payload_raises_value_error():
+    codec = CacheCodec()
+
+    with pytest.raises(ValueError):
+        codec.decode(bytes((0x03,)) + b"not zlib")
+    with pytest.raises(ValueError):
+        codec.decode(bytes((0x03,)) + zlib.compress(b"{broken"))
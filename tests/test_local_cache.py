@@ -0,0 +1,53 @@
+import pytest
+
+from app.core.redis import local_cache
+from app.core.redis.local_cache import LocalTTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(local_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = LocalTTLCache(max_items=10, ttl=5.0)
+    cache.set("a", "h:a", 1)
+
+    clock[0] += 4.9
+    assert cache.get("a") == (True, 1)
+
+    clock[0] += 0.2
+    assert cache.get("a") == (False, None)
+    assert len(cache) == 0
+
+
+def test_redis_ttl_shorter_than_l1_ttl_wins(clock):
+    cache = LocalTTLCache(max_items=10, ttl=5.0)
+    cache.set("a", "h:a", 1, ex=2)
+
+    clock[0] += 2.1
+    assert cache.get("a") == (False, None)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LocalTTLCache(max_items=2, ttl=60.0)
+    cache.set("a", "h:a", 1)
+    cache.set("b", "h:b", 2)
+    cache.get("a")  # "b" is now least recently used
+
+    cache.set("c", "h:c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+
+
+def test_invalidate_by_hmac_key():
+    cache = LocalTTLCache(max_items=10, ttl=60.0)
+    cache.set("a", "h:a", 1)
+
+    cache.invalidate_hkey("h:a")
+
+    assert cache.get("a") == (False, None)
@@ -0,0 +1,75 @@
+import logging
+
+import pytest
+
+from app.core.logging import sampling
+from app.core.logging.sampling import SUMMARY_LOGGER, LogSamplingFilter, TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(sampling.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _record(name: str, msg: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 0, msg, None, None)
+
+
+def test_token_bucket_allows_burst_then_refills(clock):
+    bucket = TokenBucket(rate=2.0, burst=3)
+
+    assert [bucket.take() for _ in range(4)] == [True, True, True, False]
+
+    clock[0] += 0.5  # one token at 2/s
+    assert bucket.take() is True
+    assert bucket.take() is False
+
+    clock[0] += 10  # capped at burst
+    assert [bucket.take() for _ in range(4)] == [True, True, True, False]
+
+
+def test_rate_limit_is_per_template(clock):
+    f = LogSamplingFilter(rate_limits={"cache": 1}, burst=2)
+
+    hits = [f.filter(_record("cache.helpers", "HIT %s")) for _ in range(3)]
+    misses = [f.filter(_record("cache.helpers", "MISS %s")) for _ in range(3)]
+
+    assert hits == [True, True, False]
+    assert misses == [True, True, False]
+
+
+def test_most_specific_rule_wins():
+    f = LogSamplingFilter(
+        sample_rates={"cache.helpers": 0.0, "cache.helpers:❌ Cache MISS": 1.0}
+    )
+
+    assert f.filter(_record("cache.helpers", "⚡ Cache HIT | %s")) is False
+    assert f.filter(_record("cache.helpers", "❌ Cache MISS | %s")) is True
+    assert f.filter(_record("other", "anything")) is True
+
+
+def test_warnings_are_never_suppressed():
+    f = LogSamplingFilter(sample_rates={"cache": 0.0})
+
+    assert f.filter(_record("cache", "boom", logging.WARNING)) is True
+
+
+def test_summary_waits_for_interval_unless_forced(clock):
+    f = LogSamplingFilter(sample_rates={"cache": 0.0}, summary_interval=60)
+    for _ in range(5):
+        f.filter(_record("cache", "HIT %s"))
+
+    assert f.flush_summary() == []
+
+    clock[0] += 61
+    (record,) = f.flush_summary()
+    assert record.name == SUMMARY_LOGGER
+    assert record.suppressed == 5
+    assert record.template == "HIT %s"
+    assert f.flush_summary(force=True) == []
+
+    f.filter(_record("cache", "HIT %s"))
+    (record,) = f.flush_summary(force=True)
+    assert record.suppressed == 1
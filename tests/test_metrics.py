@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+from app.core.metrics.registry import MetricsRegistry, cumulative_only, merge_snapshots, render_prometheus
+
+
+def _registry(requests: int, in_flight: int, latency: float) -> MetricsRegistry:
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", ("route",))
+    gauge = registry.gauge("in_flight", "In flight")
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    counter.inc("/a", amount=requests)
+    gauge.set(value=in_flight)
+    histogram.observe(latency)
+    return registry
+
+
+def test_merge_sums_counters_gauges_and_histograms():
+    merged = merge_snapshots([
+        _registry(2, 1, 0.05).snapshot(),
+        _registry(3, 4, 0.5).snapshot(),
+    ])
+
+    assert merged["requests_total"]["samples"] == {"/a": 5}
+    assert merged["in_flight"]["samples"] == {"": 5}
+    assert merged["latency_seconds"]["samples"][""] == [1, 1, 0, 0.55]
+
+
+def test_cumulative_only_drops_gauges():
+    snapshot = cumulative_only(_registry(1, 1, 0.05).snapshot())
+
+    assert set(snapshot) == {"requests_total", "latency_seconds"}
+
+
+def test_render_prometheus_cumulates_buckets():
+    text = render_prometheus(_registry(2, 1, 0.5).snapshot())
+
+    assert '# TYPE requests_total counter' in text
+    assert 'requests_total{route="/a"} 2' in text
+    assert 'in_flight 1' in text
+    assert 'latency_seconds_bucket{le="0.1"} 0' in text
+    assert 'latency_seconds_bucket{le="1"} 1' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 1' in text
+    assert 'latency_seconds_count 1' in text
+    assert 'latency_seconds_sum 0.5' in text
+
+
+def test_retired_totals_keep_counters_after_a_worker_exits():
+    live = _registry(2, 1, 0.05).snapshot()
+    exited = _registry(3, 4, 0.5).snapshot()
+    before = merge_snapshots([live, exited])
+
+    retired = merge_snapshots([{}, cumulative_only(exited)])
+    after = merge_snapshots([live, retired])
+
+    assert after["requests_total"]["samples"] == before["requests_total"]["samples"]
+    assert after["latency_seconds"]["samples"] == before["latency_seconds"]["samples"]
+    assert after["in_flight"]["samples"] == {"": 1}
+
+
+class _FakeRedis:
+    """In-memory stand-in for the AsyncRedisClient hash/lock calls."""
+
+    def __init__(self, entries: dict):
+        self.entries = entries
+
+    async def hash_set_json(self, key, field, value, ex=None):
+        self.entries[field] = value
+
+    async def hash_get_all_json(self, key):
+        return dict(self.entries)
+
+    async def acquire_lock(self, key, ttl_ms):
+        return "token"
+
+    async def release_lock(self, key, token):
+        pass
+
+
+def test_collect_merges_retired_field_and_keeps_slow_workers_counters():
+    from app.core.metrics.publisher import RETIRED_FIELD, MetricsPublisher
+
+    retired = cumulative_only(_registry(10, 0, 0.5).snapshot())
+    slow = {"ts": time.time() - 3600, "metrics": _registry(3, 7, 0.05).snapshot()}
+    redis = _FakeRedis({RETIRED_FIELD: retired, "otherhost:1-abcd": slow})
+    publisher = MetricsPublisher(redis)
+
+    text = asyncio.run(publisher.collect())
+
+    # Slow worker on another host: counters kept, gauges dropped, not retired
+    assert "otherhost:1-abcd" in redis.entries
+    assert 'requests_total{route="/a"} 13' in text
+    assert "in_flight 7" not in text
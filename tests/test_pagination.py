@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, DateTime, MetaData, String, Table
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.services.helpers.pagination import _after_cursor, decode_cursor, encode_cursor
+
+
+items = Table(
+    "items",
+    MetaData(),
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+    Column("ended_at", DateTime(timezone=True), nullable=True),
+    Column("title", String, nullable=True),
+)
+
+
+def _sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect())).replace("\n", " ")
+
+
+def test_cursor_round_trip_keeps_types():
+    obj_id = uuid4()
+    value = datetime(2026, 10, 17, 12, 30, tzinfo=timezone.utc)
+
+    cursor = encode_cursor(sort_by="created_at", order="desc", value=value, obj_id=obj_id)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, sort_by="created_at", order="desc") == (value, obj_id)
+
+
+def test_cursor_round_trip_with_null_value():
+    obj_id = uuid4()
+    cursor = encode_cursor(sort_by="title", order="asc", value=None, obj_id=obj_id)
+
+    assert decode_cursor(cursor, sort_by="title", order="asc") == (None, obj_id)
+
+
+@pytest.mark.parametrize("sort_by, order", [("title", "desc"), ("created_at", "asc")])
+def test_cursor_for_other_sort_is_rejected(sort_by, order):
+    cursor = encode_cursor(sort_by="created_at", order="desc", value=None, obj_id=uuid4())
+
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, sort_by=sort_by, order=order)
+    assert exc.value.status_code == 400
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor", sort_by="created_at", order="desc")
+    assert exc.value.status_code == 400
+
+
+def test_after_cursor_uses_row_value_comparison():
+    sql = _sql(_after_cursor(items.c.created_at, items.c.id, datetime.now(timezone.utc), uuid4(), True))
+
+    assert sql.startswith("(items.created_at, items.id) < (")
+    assert "IS NULL" not in sql
+
+
+def test_after_cursor_asc_on_nullable_column_includes_trailing_nulls():
+    # ASC puts NULLs last: rows after a non-NULL cursor include every NULL
+    sql = _sql(_after_cursor(items.c.ended_at, items.c.id, datetime.now(timezone.utc), uuid4(), False))
+
+    assert "(items.ended_at, items.id) > " in sql
+    assert "OR items.ended_at IS NULL" in sql
+
+
+def test_after_cursor_on_null_value():
+    # ASC: only the remaining NULLs; DESC (NULLs first): remaining NULLs, then every non-NULL
+    asc = _sql(_after_cursor(items.c.ended_at, items.c.id, None, uuid4(), False))
+    desc = _sql(_after_cursor(items.c.ended_at, items.c.id, None, uuid4(), True))
+
+    assert asc.startswith("items.ended_at IS NULL AND items.id > ")
+    assert "OR" not in asc
+    assert desc.startswith("items.ended_at IS NULL AND items.id < ")
+    assert desc.endswith(" OR items.ended_at IS NOT NULL")
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from app.services.helpers.single_flight import single_flight
+
+
+def test_concurrent_misses_run_loader_once():
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    async def main():
+        return await asyncio.gather(*(single_flight("k", loader) for _ in range(50)))
+
+    results = asyncio.run(main())
+
+    assert calls == 1
+    assert results == [{"value": 42}] * 50
+
+
+def test_loader_error_reaches_every_caller():
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("db down")
+
+    async def main():
+        return await asyncio.gather(
+            *(single_flight("k", loader) for _ in range(5)), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+
+    assert calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_cancelled_leader_hands_load_to_a_follower():
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    async def main():
+        leader = asyncio.create_task(single_flight("k", loader))
+        await asyncio.sleep(0)  # leader registers the in-flight load
+        followers = [asyncio.create_task(single_flight("k", loader)) for _ in range(5)]
+        await asyncio.sleep(0.01)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    results = asyncio.run(main())
+
+    # One aborted load + exactly one takeover, shared by all followers
+    assert calls == 2
+    assert results == [2] * 5